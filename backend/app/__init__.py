@@ -6,9 +6,13 @@ from flask_cors import CORS
 from flask_limiter.errors import RateLimitExceeded
 from flask_smorest import Api
 
-from app.extensions import db, limiter, migrate
+from app.extensions import db, limiter, migrate, read_limiter
 from app.api import register_blueprints
+from app.commands import register_commands
 from app.service_errors import format_error_response
+from app.utils.rate_counter import group_creation_counter
+from app.utils.share_link_utils import share_link_cache
+from app.utils.sql_profiler import sql_profiler
 
 
 def create_app(config_name=None, config_override=None):
@@ -23,6 +27,9 @@ def create_app(config_name=None, config_override=None):
             SQLALCHEMY_DATABASE_URI="sqlite:///:memory:",
             SQLALCHEMY_TRACK_MODIFICATIONS=False,
             RATELIMIT_ENABLED=False,
+            # テストではプロセス内ストレージを Redis の代わりに使う
+            RATELIMIT_STORAGE_URI="memory://",
+            GROUP_CREATION_COUNTER_STORAGE_URI="memory://",
         )
 
     if config_override:
@@ -32,9 +39,12 @@ def create_app(config_name=None, config_override=None):
         app,
         supports_credentials=app.config.get("CORS_SUPPORTS_CREDENTIALS", True),
         origins=app.config.get("CORS_ORIGINS", []),
+        # 管理画面の一覧は次ページのカーソルをヘッダーで受け取る
+        expose_headers=["X-Next-Cursor"],
     )
 
     limiter.init_app(app)
+    read_limiter.init_app(app)
 
     # --- RateLimitExceeded エラーハンドラ（アプリ全体） ---
     @app.errorhandler(RateLimitExceeded)
@@ -51,6 +61,10 @@ def create_app(config_name=None, config_override=None):
 
     db.init_app(app)
     migrate.init_app(app, db)
+    share_link_cache.init_app(app)
+    group_creation_counter.init_app(app)
+    sql_profiler.init_app(app)
+    register_commands(app)
 
     api = Api(app)
 
@@ -1,12 +1,22 @@
 from flask import jsonify
 from flask_smorest import Blueprint
 
-from app.api.schemas.admin_schemas import AdminGroupSchema
+from app.api.schemas.admin_schemas import (
+    AdminGroupListQuerySchema,
+    AdminGroupSchema,
+    ShareLinkCacheStatsSchema,
+)
 from app.api.schemas.contact_schemas import (
+    ContactListItemSchema,
+    ContactListQuerySchema,
     ContactSchema,
     ContactUpdateSchema,
 )
-from app.api.services.admin_service import delete_group_service, get_all_groups_service
+from app.api.services.admin_service import (
+    delete_group_service,
+    get_all_groups_service,
+    get_share_link_cache_stats_service,
+)
 from app.api.services.contact_service import ContactService
 from app.decorators import with_common_error_responses
 from app.service_errors import ServiceError, format_error_response
@@ -21,15 +31,27 @@ def handle_service_error(e: ServiceError):
 
 
 # -------------------------------------------------
-# 1. すべてのグループを取得
+# 1. グループ一覧（カーソルページング）
 # -------------------------------------------------
 @admin_group_bp.get("/groups")
 @require_admin_user
-@admin_group_bp.response(200, AdminGroupSchema(many=True))
+@admin_group_bp.arguments(AdminGroupListQuerySchema, location="query")
+@admin_group_bp.response(
+    200,
+    AdminGroupSchema(many=True),
+    headers={
+        "X-Next-Cursor": {
+            "description": "次ページ取得用のカーソル（最終ページでは付与しない）",
+            "schema": {"type": "string"},
+        }
+    },
+)
 @with_common_error_responses(admin_group_bp)
-def get_all_groups():
-    """すべてのグループを取得"""
-    return get_all_groups_service()
+def get_all_groups(args):
+    """グループを最終更新日時の新しい順に取得（X-Next-Cursor で続きを取得）"""
+    groups, next_cursor = get_all_groups_service(args)
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else {}
+    return groups, 200, headers
 
 
 # -------------------------------------------------
@@ -43,15 +65,39 @@ def delete_group(group_key):
     return delete_group_service(group_key)
 
 
+# -------------------------------------------------
+# 3. 共有リンクキャッシュ統計
+# -------------------------------------------------
+@admin_group_bp.get("/cache/share-links")
+@require_admin_user
+@admin_group_bp.response(200, ShareLinkCacheStatsSchema)
+@with_common_error_responses(admin_group_bp)
+def get_share_link_cache_stats():
+    """共有リンク解決キャッシュのヒット/ミス統計を取得"""
+    return get_share_link_cache_stats_service()
+
+
 # --------------------------
 # LIST: GET /contacts
 # --------------------------
 @admin_group_bp.route("/contacts", methods=["GET"])
 @require_admin_user
-@admin_group_bp.response(200, ContactSchema(many=True))
+@admin_group_bp.arguments(ContactListQuerySchema, location="query")
+@admin_group_bp.response(
+    200,
+    ContactListItemSchema(many=True),
+    headers={
+        "X-Next-Cursor": {
+            "description": "次ページ取得用のカーソル（最終ページでは付与しない）",
+            "schema": {"type": "string"},
+        }
+    },
+)
 @with_common_error_responses(admin_group_bp)
-def list_contacts():
-    return ContactService.list_contacts()
+def list_contacts(args):
+    contacts, next_cursor = ContactService.list_contacts(args)
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else {}
+    return contacts, 200, headers
 
 
 # --------------------------
@@ -1,19 +1,28 @@
-from flask import jsonify
+from flask import Response, jsonify, send_file, stream_with_context
 from flask.views import MethodView
 from flask_smorest import Blueprint
 
 from app.api.schemas.export_schema import (
+    ExportJobCreateSchema,
+    ExportJobSchema,
+    GameHistoryExportQuerySchema,
     GroupPlayerStatsQuerySchema,
     GroupPlayerStatsSchema,
     GroupSummarySchema,
     TournamentExportSchema,
     TournamentScoreMapSchema,
 )
+from app.api.services.export_job_service import (
+    create_export_job,
+    get_export_artifact,
+    get_export_job,
+)
 from app.api.services.export_service import (
     get_group_player_stats,
     get_group_summary,
     get_tournament_export,
     get_tournament_score_map,
+    stream_group_game_history,
 )
 from app.decorators import with_common_error_responses
 from app.service_errors import ServiceError, format_error_response
@@ -90,3 +99,69 @@ class GroupPlayerStatsResource(MethodView):
         start_date = args.get("start_date")
         end_date = args.get("end_date")
         return get_group_player_stats(group_key, start_date, end_date)
+
+
+# =========================================================
+# グループの全対局履歴（ストリーミング出力）
+# =========================================================
+@export_bp.route("/groups/<string:group_key>/games/export")
+class GroupGameHistoryExportResource(MethodView):
+    """GET: グループの全対局・スコアを1行ずつストリーミング出力"""
+
+    @export_bp.arguments(GameHistoryExportQuerySchema, location="query")
+    @export_bp.response(
+        200, description="対局履歴（NDJSON / CSV）", content_type="application/x-ndjson"
+    )
+    @with_common_error_responses(export_bp)
+    def get(self, args, group_key):
+        """game_id 順に出力する。since_game_id で前回以降の差分のみ取得"""
+        lines, mimetype = stream_group_game_history(
+            group_key, args["format"], args.get("since_game_id")
+        )
+        return Response(stream_with_context(lines), mimetype=mimetype)
+
+
+# =========================================================
+# 非同期エクスポートジョブ（CSV / NDJSON ファイル）
+# =========================================================
+@export_bp.route("/exports")
+class ExportJobCreateResource(MethodView):
+    """POST: エクスポートジョブを作成"""
+
+    @export_bp.arguments(ExportJobCreateSchema)
+    @export_bp.response(202, ExportJobSchema)
+    @with_common_error_responses(export_bp)
+    def post(self, data):
+        """ファイル生成をバックグラウンドで開始し、ジョブキーを返す"""
+        return create_export_job(data)
+
+
+@export_bp.route("/exports/<string:job_key>")
+class ExportJobResource(MethodView):
+    """GET: エクスポートジョブの状態を取得"""
+
+    @export_bp.response(200, ExportJobSchema)
+    @with_common_error_responses(export_bp)
+    def get(self, job_key):
+        """ジョブキーから状態をポーリング"""
+        return get_export_job(job_key)
+
+
+@export_bp.route("/exports/<string:job_key>/download")
+class ExportJobDownloadResource(MethodView):
+    """GET: 完了したエクスポートファイルをダウンロード"""
+
+    @export_bp.response(
+        200, description="エクスポートファイル", content_type="application/octet-stream"
+    )
+    @with_common_error_responses(export_bp)
+    def get(self, job_key):
+        """完了前は 409、有効期限切れは 410"""
+        path, mimetype, download_name = get_export_artifact(job_key)
+        return send_file(
+            path,
+            mimetype=mimetype,
+            as_attachment=True,
+            download_name=download_name,
+            conditional=False,
+        )
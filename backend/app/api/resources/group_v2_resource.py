@@ -21,7 +21,7 @@ from app.api.services.v2_service import (
     create_tournament_with_tables,
     group_dashboard,
 )
-from app.decorators import with_v2_error_responses
+from app.decorators import with_v2_error_responses, with_v2_etag
 
 group_v2_bp = Blueprint(
     "groups_v2", __name__, url_prefix="/api/v2", description="V2 group API"
@@ -71,6 +71,7 @@ def batch_get_groups_v2(payload):
     summary="グループ画面用データを一括取得",
     description="グループ本体、配下の大会一覧、所属プレイヤー一覧を画面初期表示用の一貫したレスポンスとして返します。",
 )
+@with_v2_etag(group_v2_bp, "group")
 @with_v2_error_responses(group_v2_bp)
 def group_dashboard_v2(group_key):
     return group_dashboard(group_key)
@@ -5,12 +5,19 @@ from flask_smorest import Blueprint
 
 from app import db
 from app.api.schemas.v2_schema import (
+    GameBatchCreateResponseSchema,
+    GameBatchCreateSchema,
     IdempotencyHeaderSchema,
     TableDashboardResponseSchema,
     TableDeleteResponseSchema,
 )
-from app.api.services.v2_service import V2Error, cascade_delete_table, table_dashboard
-from app.decorators import with_v2_error_responses
+from app.api.services.v2_service import (
+    V2Error,
+    batch_create_games,
+    cascade_delete_table,
+    table_dashboard,
+)
+from app.decorators import with_v2_error_responses, with_v2_etag
 
 table_v2_bp = Blueprint(
     "tables_v2", __name__, url_prefix="/api/v2/tables", description="V2 table API"
@@ -45,6 +52,23 @@ def delete_table_v2(headers, table_key):
     summary="卓画面用データを一括取得",
     description="卓、卓参加者、卓へ未登録の大会参加者、ゲームとスコアを画面初期表示用の一貫したレスポンスとして返します。",
 )
+@with_v2_etag(table_v2_bp, "table")
 @with_v2_error_responses(table_v2_bp)
 def table_dashboard_v2(table_key):
     return table_dashboard(table_key)
+
+
+@table_v2_bp.route("/<string:table_key>/games:batch-create", methods=["POST"])
+@table_v2_bp.arguments(GameBatchCreateSchema)
+@table_v2_bp.doc(
+    summary="ゲームとスコアを一括作成",
+    description="複数ゲームをすべて検証してから、連続したgame_indexを割り当てて同じDBトランザクションで作成します。1件でも不正なゲームがあれば何も作成せず、不正なゲームをdetailsで返します。game_indexは卓ごとの採番カウンターから払い出し、採番できない場合は409 Conflictを返します。",
+)
+@table_v2_bp.arguments(IdempotencyHeaderSchema, location="headers", required=False)
+@table_v2_bp.response(201, GameBatchCreateResponseSchema)
+@with_v2_error_responses(table_v2_bp)
+def batch_create_games_v2(payload, headers, table_key):
+    body, status = batch_create_games(
+        table_key, payload, headers.get("idempotency_key")
+    )
+    return body, status
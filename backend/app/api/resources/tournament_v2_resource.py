@@ -17,7 +17,7 @@ from app.api.services.v2_service import (
     delete_participant,
     tournament_dashboard,
 )
-from app.decorators import with_v2_error_responses
+from app.decorators import with_v2_error_responses, with_v2_etag
 
 tournament_v2_bp = Blueprint(
     "tournaments_v2",
@@ -95,6 +95,7 @@ def delete_participant_v2(headers, tournament_key, player_id):
     summary="大会画面用データを一括取得",
     description="大会、参加者、未参加のグループプレイヤー、卓一覧、スコアマップを画面初期表示用の一貫したレスポンスとして返します。",
 )
+@with_v2_etag(tournament_v2_bp, "tournament")
 @with_v2_error_responses(tournament_v2_bp)
 def tournament_dashboard_v2(tournament_key):
     return tournament_dashboard(tournament_key)
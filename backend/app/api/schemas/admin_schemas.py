@@ -1,4 +1,4 @@
-from marshmallow import Schema, fields
+from marshmallow import Schema, fields, validate
 
 from app.api.schemas.common_schemas import ShareLinkSchema, UTCDateTime
 
@@ -25,3 +25,37 @@ class AdminGroupSchema(Schema):
         dump_only=True,
         description="グループに紐づく共有リンク一覧",
     )
+    tournament_count = fields.Int(dump_only=True, description="大会数")
+    game_count = fields.Int(dump_only=True, description="対局数")
+    player_count = fields.Int(dump_only=True, description="プレイヤー数")
+
+
+class AdminGroupListQuerySchema(Schema):
+    """Admin用グループ一覧の絞り込み・ページング条件"""
+
+    limit = fields.Int(
+        validate=validate.Range(min=1, max=500),
+        description="1ページの件数（省略時は ADMIN_GROUP_PAGE_SIZE）",
+    )
+    cursor = fields.Str(
+        description="前ページのレスポンスヘッダー X-Next-Cursor の値",
+    )
+    email = fields.Str(description="メールアドレス（完全一致）")
+    name_prefix = fields.Str(description="グループ名の前方一致")
+    active_since = UTCDateTime(description="最終更新日時がこの日時以降")
+    active_until = UTCDateTime(description="最終更新日時がこの日時より前")
+
+
+# -------------------------------------------------
+# 共有リンクキャッシュ統計スキーマ
+# -------------------------------------------------
+class ShareLinkCacheStatsSchema(Schema):
+    """共有リンク解決キャッシュの統計（ワーカープロセス単位）"""
+
+    hits = fields.Int(dump_only=True, description="キャッシュヒット数")
+    misses = fields.Int(dump_only=True, description="キャッシュミス数")
+    evictions = fields.Int(dump_only=True, description="LRUによる追い出し数")
+    hit_rate = fields.Float(dump_only=True, description="ヒット率（0〜1）")
+    size = fields.Int(dump_only=True, description="現在のエントリ数")
+    maxsize = fields.Int(dump_only=True, description="最大エントリ数")
+    ttl = fields.Float(dump_only=True, description="エントリの有効秒数")
@@ -1,4 +1,4 @@
-from marshmallow import Schema, fields
+from marshmallow import Schema, fields, validate
 
 from app.api.schemas.common_schemas import UTCDateTime
 from app.models import ContactStatus
@@ -39,3 +39,31 @@ class ContactSchema(Schema):
     user_agent = fields.String(dump_only=True, description="ユーザーエージェント")
     created_at = UTCDateTime(dump_only=True, description="作成日時")
     updated_at = UTCDateTime(dump_only=True, description="更新日時")
+
+
+class ContactListItemSchema(Schema):
+    """一覧用（本文・ユーザーエージェントを含まない）"""
+
+    id = fields.Integer(required=True, dump_only=True, description="お問い合わせID")
+    name = fields.String(required=True, dump_only=True, description="名前")
+    email = fields.Email(required=True, dump_only=True, description="メールアドレス")
+    subject = fields.String(required=True, dump_only=True, description="件名")
+    message_preview = fields.String(
+        dump_only=True, description="メッセージ内容の先頭（最大100文字）"
+    )
+    status = fields.String(required=True, dump_only=True, description="ステータス")
+    ip_address = fields.String(dump_only=True, description="IPアドレス")
+    created_at = UTCDateTime(dump_only=True, description="作成日時")
+    updated_at = UTCDateTime(dump_only=True, description="更新日時")
+
+
+class ContactListQuerySchema(Schema):
+    limit = fields.Integer(
+        validate=validate.Range(min=1, max=200),
+        description="1ページの件数（省略時は CONTACT_PAGE_SIZE）",
+    )
+    cursor = fields.String(
+        description="前ページのレスポンスヘッダー X-Next-Cursor の値"
+    )
+    status = fields.Enum(ContactStatus, by_value=True, description="ステータス")
+    q = fields.String(description="件名・本文の検索語（空白区切りはすべて含むもの）")
@@ -1,6 +1,6 @@
-from marshmallow import Schema, fields
+from marshmallow import Schema, fields, validate
 
-from app.models import TableTypeEnum
+from app.models import ExportFormat, ExportKind, TableTypeEnum
 
 
 # =========================================================
@@ -132,3 +132,70 @@ class GroupPlayerStatsQuerySchema(BaseSchema):
         description="集計終了日（Tournament.started_at基準、省略時は全期間）",
         example="2025-12-31",
     )
+
+
+# =========================================================
+# グループの対局履歴（ストリーミング出力）
+# =========================================================
+class GameHistoryExportQuerySchema(BaseSchema):
+    """対局履歴ストリーミングのクエリパラメータ"""
+
+    format = fields.Enum(
+        ExportFormat,
+        by_value=True,
+        load_default=ExportFormat.NDJSON,
+        description="出力形式（ndjson / csv）",
+    )
+    since_game_id = fields.Int(
+        required=False,
+        allow_none=True,
+        validate=validate.Range(min=0),
+        description="差分取得用。このIDより後の対局だけを返す（前回取得分の最大 game_id）",
+        example=0,
+    )
+
+
+# =========================================================
+# 非同期エクスポートジョブ
+# =========================================================
+class ExportJobCreateSchema(BaseSchema):
+    """エクスポートジョブの作成リクエスト"""
+
+    kind = fields.Enum(
+        ExportKind,
+        by_value=True,
+        required=True,
+        description=(
+            "出力内容（tournament_scores: 大会成績 / group_summary: グループ内"
+            "全大会の成績 / game_history: グループの全対局履歴）"
+        ),
+    )
+    key = fields.Str(
+        required=True,
+        description="共有キー（tournament_scores は大会キー、それ以外はグループキー）",
+    )
+    format = fields.Enum(
+        ExportFormat,
+        by_value=True,
+        load_default=ExportFormat.CSV,
+        description="出力形式（csv / ndjson）",
+    )
+
+
+class ExportJobSchema(BaseSchema):
+    """エクスポートジョブの状態"""
+
+    job_key = fields.Str(required=True, description="ジョブキー")
+    kind = fields.Str(required=True, description="出力内容")
+    format = fields.Str(required=True, description="出力形式")
+    status = fields.Str(
+        required=True, description="状態（pending / running / succeeded / failed）"
+    )
+    row_count = fields.Int(allow_none=True, description="出力行数（完了時）")
+    error = fields.Str(allow_none=True, description="失敗時のエラー内容")
+    created_at = fields.DateTime(description="作成日時")
+    started_at = fields.DateTime(allow_none=True, description="生成開始日時")
+    finished_at = fields.DateTime(allow_none=True, description="完了日時")
+    expires_at = fields.DateTime(
+        description="有効期限（以降はダウンロード不可・ファイル削除）"
+    )
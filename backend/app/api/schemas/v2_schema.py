@@ -254,6 +254,34 @@ class GameV2Schema(Schema):
     scores = fields.List(fields.Nested(GameScoreV2Schema), required=True)
 
 
+class GameBatchItemSchema(Schema):
+    client_id = fields.Str(required=True)
+    memo = fields.Str(allow_none=True, load_default=None)
+    scores = fields.List(
+        fields.Nested(GameScoreV2Schema),
+        required=True,
+        validate=validate.Length(min=1),
+    )
+
+
+class GameBatchCreateSchema(Schema):
+    games = fields.List(
+        fields.Nested(GameBatchItemSchema),
+        required=True,
+        validate=validate.Length(min=1, max=100),
+    )
+
+
+class CreatedGameSchema(Schema):
+    client_id = fields.Str(required=True)
+    game = fields.Nested(GameV2Schema, required=True)
+
+
+class GameBatchCreateResponseSchema(Schema):
+    table_id = fields.Int(required=True, validate=validate.Range(min=1))
+    created_games = fields.List(fields.Nested(CreatedGameSchema), required=True)
+
+
 class TableDashboardParentSchema(Schema):
     tournament = fields.Nested(ParentResourceV2Schema, required=True)
     group = fields.Nested(ParentResourceV2Schema, required=True)
@@ -444,6 +472,22 @@ _FIELD_DESCRIPTIONS = {
         "played_at": "対局日時です。",
         "scores": "ゲームに登録されたプレイヤー別得点です。",
     },
+    "GameBatchItemSchema": {
+        "client_id": "クライアントが入力ゲームと作成結果を対応付けるための一時IDです。",
+        "memo": "ゲームに記録する任意メモです。",
+        "scores": "卓参加者ごとの得点です。NORMAL卓では合計0である必要があります。",
+    },
+    "GameBatchCreateSchema": {
+        "games": "記録順に並べた一括作成するゲームの一覧です。最大100件です。",
+    },
+    "CreatedGameSchema": {
+        "client_id": "リクエストで指定された対応付け用IDです。",
+        "game": "作成されたゲームです。",
+    },
+    "GameBatchCreateResponseSchema": {
+        "table_id": "ゲームを作成した卓IDです。",
+        "created_games": "リクエスト順の作成結果です。",
+    },
     "TableDashboardParentSchema": {
         "tournament": "卓が所属する大会です。",
         "group": "大会が所属するグループです。",
@@ -1,90 +1,252 @@
+from flask import current_app
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.orm import selectinload
+
 from app.extensions import db
 from app.models import (
     AccessLevel,
     Game,
     Group,
-    ShareLink,
+    GroupCreationToken,
+    Player,
+    PlayerStatsRollup,
+    Score,
     Table,
+    TablePlayer,
     Tournament,
+    TournamentPlayer,
+)
+from app.utils.pagination import paginate_keyset
+from app.utils.share_link_utils import (
+    delete_share_links,
+    require_resource,
+    share_link_cache,
 )
-from app.service_errors import ServiceNotFoundError, ServicePermissionError
-from app.utils.share_link_utils import get_share_link_by_key
-
-# =========================================================
-# 内部ユーティリティ
-# =========================================================
-_ACCESS_PRIORITY = {
-    AccessLevel.VIEW: 1,
-    AccessLevel.EDIT: 2,
-    AccessLevel.OWNER: 3,
-}
-
-
-def _require_group(short_key: str):
-    """共有リンクからGroupを特定"""
-    link = get_share_link_by_key(short_key)
-    if not link:
-        raise ServiceNotFoundError("共有リンクが無効です。")
-    if link.resource_type != "group":
-        raise ServicePermissionError("共有リンクの対象が一致しません。")
-
-    group = Group.query.get(link.resource_id)
-    if not group:
-        raise ServiceNotFoundError("グループが見つかりません。")
-    return link, group
-
-
-def _ensure_access(link, group, required: AccessLevel, message: str):
-    """アクセスレベルチェック"""
-    if link.resource_id != group.id:
-        raise ServicePermissionError("共有リンクの対象が一致しません。")
-    if _ACCESS_PRIORITY[link.access_level] < _ACCESS_PRIORITY[required]:
-        raise ServicePermissionError(message)
 
 
 # -------------------------------------------------
-# すべてのグループ取得
+# グループ一覧（カーソルページング）
 # -------------------------------------------------
-def get_all_groups_service():
-    """すべてのグループデータを取得"""
-    groups = Group.query.all()
-
-    return groups
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
 
 
-# -------------------------------------------------
-# グループ削除
-# -------------------------------------------------
-def delete_group_service(group_key: str):
-    """共有リンクキーからGroupを特定して更新"""
-    link, group = _require_group(group_key)
-    _ensure_access(
-        link, group, AccessLevel.OWNER, "グループの更新にはOWNER権限が必要です。"
+def _group_counts(group_ids: list[int]) -> dict[int, tuple[int, int, int]]:
+    """グループごとの (大会数, 対局数, プレイヤー数) を1クエリで集計"""
+    tournaments = (
+        select(Tournament.group_id, func.count(Tournament.id).label("n"))
+        .where(Tournament.group_id.in_(group_ids))
+        .group_by(Tournament.group_id)
+        .subquery()
+    )
+    games = (
+        select(Tournament.group_id, func.count(Game.id).label("n"))
+        .join(Table, Table.tournament_id == Tournament.id)
+        .join(Game, Game.table_id == Table.id)
+        .where(Tournament.group_id.in_(group_ids))
+        .group_by(Tournament.group_id)
+        .subquery()
+    )
+    players = (
+        select(Player.group_id, func.count(Player.id).label("n"))
+        .where(Player.group_id.in_(group_ids))
+        .group_by(Player.group_id)
+        .subquery()
+    )
+    rows = db.session.execute(
+        select(
+            Group.id,
+            func.coalesce(tournaments.c.n, 0),
+            func.coalesce(games.c.n, 0),
+            func.coalesce(players.c.n, 0),
+        )
+        .outerjoin(tournaments, tournaments.c.group_id == Group.id)
+        .outerjoin(games, games.c.group_id == Group.id)
+        .outerjoin(players, players.c.group_id == Group.id)
+        .where(Group.id.in_(group_ids))
+    )
+    return {group_id: counts for group_id, *counts in rows}
+
+
+def get_all_groups_service(args: dict | None = None):
+    """
+    グループを最終更新日時の新しい順に limit 件ずつ取得する。
+
+    (last_updated_at, id) のキーセットで続きを取得するため、ページが深くなっても
+    OFFSET のように読み飛ばし行が増えない。
+    戻り値: (グループ一覧, 次ページのカーソル or None)
+    """
+    args = args or {}
+    limit = args.get("limit") or current_app.config["ADMIN_GROUP_PAGE_SIZE"]
+
+    query = Group.query.options(selectinload(Group.group_links))
+    if args.get("email"):
+        query = query.filter(Group.email == args["email"])
+    if args.get("name_prefix"):
+        query = query.filter(
+            Group.name.like(f"{_escape_like(args['name_prefix'])}%", escape="\\")
+        )
+    if args.get("active_since"):
+        query = query.filter(Group.last_updated_at >= args["active_since"])
+    if args.get("active_until"):
+        query = query.filter(Group.last_updated_at < args["active_until"])
+    groups, next_cursor = paginate_keyset(
+        query, Group.last_updated_at, Group.id, limit, args.get("cursor")
     )
 
-    # --- 関連データ削除（順序に注意） ---
-    # --- Tournament階層 ---
-    tournaments = Tournament.query.filter_by(group_id=group.id).all()
-    for tournament in tournaments:
-        tables = Table.query.filter_by(tournament_id=tournament.id).all()
-        for table in tables:
-            # --- Game階層 ---
-            games = Game.query.filter_by(table_id=table.id).all()
-            for game in games:
-                db.session.delete(game)  # Scoreはcascadeで削除される
+    counts = _group_counts([g.id for g in groups]) if groups else {}
+    items = []
+    for group in groups:
+        tournament_count, game_count, player_count = counts.get(group.id, (0, 0, 0))
+        items.append(
+            {
+                "id": group.id,
+                "name": group.name,
+                "description": group.description,
+                "created_by": group.created_by,
+                "created_at": group.created_at,
+                "last_updated_at": group.last_updated_at,
+                "email": group.email,
+                "group_links": group.group_links,
+                "tournament_count": tournament_count,
+                "game_count": game_count,
+                "player_count": player_count,
+            }
+        )
+    return items, next_cursor
 
-            db.session.delete(table)  # TablePlayerはcascadeで削除される
 
-        db.session.delete(tournament)  # TournamentPlayerはcascadeで削除される
+# -------------------------------------------------
+# グループ削除
+# -------------------------------------------------
+def _delete_in_chunks(model, criteria, chunk_size: int, before_delete=None) -> int:
+    """
+    条件に一致する行を id 順に chunk_size 件ずつ DELETE ... WHERE id IN (...) し、
+    チャンクごとに commit してロック時間を短く保つ。
+    before_delete(ids) で同じチャンクの従属データ（共有リンクなど）を先に消す。
+    戻り値: 削除件数
+    """
+    deleted = 0
+    while True:
+        ids = db.session.scalars(
+            select(model.id).where(criteria).order_by(model.id).limit(chunk_size)
+        ).all()
+        if not ids:
+            return deleted
+        if before_delete:
+            before_delete(ids)
+        deleted += db.session.execute(
+            delete(model).where(model.id.in_(ids)),
+            execution_options={"synchronize_session": False},
+        ).rowcount
+        db.session.commit()
 
-    # --- Player削除（cascadeで自動） ---
 
-    # --- ShareLink削除（論理参照） ---
-    ShareLink.query.filter_by(resource_type="group", resource_id=group.id).delete(
-        synchronize_session=False
+def delete_group_service(group_key: str):
+    """
+    共有リンクキーからGroupを特定し、配下のデータを依存順に一括削除する。
+
+    ORM オブジェクトを読み込まず、テーブルごとに集合ベースの DELETE を
+    チャンク単位で発行する。途中で失敗しても Group 本体と OWNER リンクは
+    最後に消すため、同じキーで再実行すれば残りを削除できる。
+    """
+    _, group = require_resource(
+        group_key,
+        "group",
+        Group,
+        AccessLevel.OWNER,
+        forbidden_message="グループの削除にはOWNER権限が必要です。",
     )
+    group_id, group_name = group.id, group.name
+    chunk_size = current_app.config["ADMIN_DELETE_CHUNK_SIZE"]
+
+    tournament_ids = select(Tournament.id).where(Tournament.group_id == group_id)
+    table_ids = select(Table.id).where(Table.tournament_id.in_(tournament_ids))
+    game_ids = select(Game.id).where(Game.table_id.in_(table_ids))
+
+    score_count = share_link_count = 0
+
+    def _share_links(resource_type):
+        def _delete(ids):
+            nonlocal share_link_count
+            share_link_count += delete_share_links(resource_type, ids)
+
+        return _delete
+
+    def _delete_game_children(ids):
+        # スコアは対局のチャンク単位で game_id のインデックスから消す
+        nonlocal score_count
+        score_count += db.session.execute(
+            delete(Score).where(Score.game_id.in_(ids)),
+            execution_options={"synchronize_session": False},
+        ).rowcount
+        _share_links("game")(ids)
+
+    try:
+        # --- 末端（対局・スコア）から親へ向かって削除 ---
+        game_count = _delete_in_chunks(
+            Game, Game.id.in_(game_ids), chunk_size, _delete_game_children
+        )
+        participant_count = _delete_in_chunks(
+            TablePlayer, TablePlayer.table_id.in_(table_ids), chunk_size
+        )
+        table_count = _delete_in_chunks(
+            Table, Table.id.in_(table_ids), chunk_size, _share_links("table")
+        )
+        tournament_participant_count = _delete_in_chunks(
+            TournamentPlayer,
+            TournamentPlayer.tournament_id.in_(tournament_ids),
+            chunk_size,
+        )
+        _delete_in_chunks(
+            PlayerStatsRollup, PlayerStatsRollup.group_id == group_id, chunk_size
+        )
+        tournament_count = _delete_in_chunks(
+            Tournament,
+            Tournament.group_id == group_id,
+            chunk_size,
+            _share_links("tournament"),
+        )
+        player_count = _delete_in_chunks(
+            Player, Player.group_id == group_id, chunk_size
+        )
+
+        # --- Group 本体（作成トークンの参照は外して残す） ---
+        db.session.execute(
+            update(GroupCreationToken)
+            .where(GroupCreationToken.group_id == group_id)
+            .values(group_id=None),
+            execution_options={"synchronize_session": False},
+        )
+        _share_links("group")([group_id])
+        db.session.execute(
+            delete(Group).where(Group.id == group_id),
+            execution_options={"synchronize_session": False},
+        )
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    return {
+        "message": f"グループ '{group_name}' を削除しました。",
+        "deleted": {
+            "group_id": group_id,
+            "tournament_count": tournament_count,
+            "table_count": table_count,
+            "game_count": game_count,
+            "score_count": score_count,
+            "participant_count": participant_count,
+            "tournament_participant_count": tournament_participant_count,
+            "player_count": player_count,
+            "share_link_count": share_link_count,
+        },
+    }
 
-    db.session.delete(group)
-    db.session.commit()
 
-    return {"message": f"グループ '{group.name}' を削除しました。"}
+# -------------------------------------------------
+# 共有リンクキャッシュ統計
+# -------------------------------------------------
+def get_share_link_cache_stats_service():
+    """このワーカープロセスの共有リンクキャッシュ統計を取得"""
+    return share_link_cache.stats()
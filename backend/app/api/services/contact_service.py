@@ -1,12 +1,19 @@
 # app/services/contact_service.py
 
+from flask import current_app
+from sqlalchemy import func
 from sqlalchemy.exc import SQLAlchemyError
 
 from app import db
 from app.models import Contact, ContactStatus
 from app.service_errors import ServiceNotFoundError, ServicePermissionError
+from app.utils.contact_search import index_contact, matching_contact_ids
+from app.utils.pagination import paginate_keyset
 from app.utils.recaptcha import verify_recaptcha
 
+# 一覧で返す本文の先頭文字数
+MESSAGE_PREVIEW_LENGTH = 100
+
 
 class ContactService:
     """Contact（問い合わせ）に関するビジネスロジック"""
@@ -34,6 +41,8 @@ class ContactService:
                 user_agent=user_agent,
             )
             db.session.add(contact)
+            db.session.flush()
+            index_contact(contact)
             db.session.commit()
             return contact
         except SQLAlchemyError:
@@ -51,11 +60,62 @@ class ContactService:
         return contact
 
     @staticmethod
-    def list_contacts():
+    def list_contacts(args=None):
         """
-        全件取得（GET /contact）
+        一覧取得（GET /contact）
+        - 新しい順に limit 件ずつ（(created_at, id) のキーセットページング）
+        - status で絞り込み、q で件名・本文を全文検索
+        - 一覧に必要な列だけを読み込み、本文は先頭のみ返す
+        戻り値: (一覧, 次ページのカーソル or None)
         """
-        return Contact.query.order_by(Contact.created_at.desc()).all()
+        args = args or {}
+        limit = args.get("limit") or current_app.config["CONTACT_PAGE_SIZE"]
+
+        query = db.session.query(
+            Contact.id,
+            Contact.name,
+            Contact.email,
+            Contact.subject,
+            func.substr(Contact.message, 1, MESSAGE_PREVIEW_LENGTH).label(
+                "message_preview"
+            ),
+            Contact.status,
+            Contact.ip_address,
+            Contact.created_at,
+            Contact.updated_at,
+        )
+        if args.get("status"):
+            query = query.filter(Contact.status == args["status"])
+        if args.get("q"):
+            contact_ids = matching_contact_ids(args["q"])
+            if contact_ids is None:
+                return [], None
+            query = query.filter(Contact.id.in_(contact_ids))
+
+        rows, next_cursor = paginate_keyset(
+            query, Contact.created_at, Contact.id, limit, args.get("cursor")
+        )
+        return [row._asdict() for row in rows], next_cursor
+
+    @staticmethod
+    def reindex_all(batch_size=500):
+        """既存のお問い合わせの転置インデックスを作り直す。戻り値: 件数"""
+        count = 0
+        last_id = 0
+        while True:
+            contacts = (
+                Contact.query.filter(Contact.id > last_id)
+                .order_by(Contact.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not contacts:
+                return count
+            for contact in contacts:
+                index_contact(contact)
+            db.session.commit()
+            count += len(contacts)
+            last_id = contacts[-1].id
 
     @staticmethod
     def update_contact(contact_id, data):
@@ -77,6 +137,10 @@ class ContactService:
             if "status" in data and data["status"] is not None:
                 contact.status = data["status"]
 
+            # 件名・本文が変わったときだけ検索インデックスを更新
+            if any(data.get(field) is not None for field in ("subject", "message")):
+                index_contact(contact)
+
             db.session.commit()
             return contact
 
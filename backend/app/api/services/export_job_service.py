@@ -0,0 +1,243 @@
+import os
+import secrets
+from datetime import datetime, timedelta, timezone
+
+from flask import current_app
+
+from app import db
+from app.api.services.export_service import (
+    GAME_HISTORY_COLUMNS,
+    SCORE_EXPORT_COLUMNS,
+    _require_group,
+    _require_tournament,
+    iter_group_game_history,
+    iter_score_export_rows,
+)
+from app.models import (
+    ExportFormat,
+    ExportJob,
+    ExportJobStatus,
+    ExportKind,
+    Tournament,
+)
+from app.service_errors import (
+    ServiceConflictError,
+    ServiceGoneError,
+    ServiceNotFoundError,
+    ServiceUnavailableError,
+)
+from app.tasks.export_tasks import run_export_job_task
+from app.utils.export_format import MIMETYPES, format_lines
+
+
+# =========================================================
+# 内部ユーティリティ
+# =========================================================
+def _utcnow():
+    return datetime.now(timezone.utc)
+
+
+def _as_aware(value: datetime) -> datetime:
+    """SQLite はタイムゾーンを保持しないため UTC とみなす"""
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _expires_at(base: datetime) -> datetime:
+    return base + timedelta(hours=current_app.config["EXPORT_JOB_TTL_HOURS"])
+
+
+def _export_dir() -> str:
+    export_dir = current_app.config["EXPORT_DIR"]
+    os.makedirs(export_dir, exist_ok=True)
+    return export_dir
+
+
+def _require_job(job_key: str) -> ExportJob:
+    job = ExportJob.query.filter_by(job_key=job_key).first()
+    if not job:
+        raise ServiceNotFoundError("エクスポートジョブが見つかりません。")
+    return job
+
+
+def _export_source(job: ExportJob):
+    """ジョブ種別に応じた (列名, 行ジェネレーター)"""
+    if job.kind == ExportKind.TOURNAMENT_SCORES:
+        return SCORE_EXPORT_COLUMNS, iter_score_export_rows(
+            Tournament.id == job.resource_id
+        )
+    if job.kind == ExportKind.GROUP_SUMMARY:
+        return SCORE_EXPORT_COLUMNS, iter_score_export_rows(
+            Tournament.group_id == job.resource_id
+        )
+    return GAME_HISTORY_COLUMNS, iter_group_game_history(job.resource_id)
+
+
+def _artifact_path(job: ExportJob) -> str:
+    return os.path.join(_export_dir(), f"{job.job_key}.{job.format}")
+
+
+def _tmp_path(job: ExportJob) -> str:
+    """生成途中のファイル（完成後に _artifact_path へ置き換える）"""
+    return f"{_artifact_path(job)}.tmp"
+
+
+def _remove_file(path: str | None) -> None:
+    if path and os.path.exists(path):
+        os.remove(path)
+
+
+# =========================================================
+# ジョブ作成・参照
+# =========================================================
+def create_export_job(data: dict) -> ExportJob:
+    """共有キーを検証してジョブを登録し、Celery に生成を依頼する"""
+    kind = ExportKind(data["kind"])
+    if kind == ExportKind.TOURNAMENT_SCORES:
+        resource_type, resource = "tournament", _require_tournament(data["key"])
+    else:
+        resource_type, resource = "group", _require_group(data["key"])
+
+    now = _utcnow()
+    job = ExportJob(
+        job_key=secrets.token_urlsafe(24),
+        kind=kind,
+        format=ExportFormat(data.get("format") or ExportFormat.CSV),
+        resource_type=resource_type,
+        resource_id=resource.id,
+        status=ExportJobStatus.PENDING,
+        created_at=now,
+        expires_at=_expires_at(now),
+    )
+    db.session.add(job)
+    db.session.commit()
+
+    # ワーカーから参照できるよう commit 後に投入する
+    try:
+        run_export_job_task.delay(job.job_key)
+    except Exception as e:
+        # ブローカーに投入できなかったジョブは PENDING のまま残さず失敗にする
+        current_app.logger.exception(
+            "[Export] Failed to enqueue export %s", job.job_key
+        )
+        job.status = ExportJobStatus.FAILED
+        job.error = str(e)
+        job.finished_at = _utcnow()
+        db.session.commit()
+        raise ServiceUnavailableError(
+            "エクスポートを開始できませんでした。しばらくしてから再度お試しください。"
+        ) from e
+    return job
+
+
+def get_export_job(job_key: str) -> ExportJob:
+    """ジョブの状態を取得"""
+    return _require_job(job_key)
+
+
+def get_export_artifact(job_key: str) -> tuple[str, str, str]:
+    """
+    ダウンロード対象の (ファイルパス, MIME タイプ, ダウンロード名) を返す。
+    未完了なら 409、期限切れ・ファイル消失なら 410。
+    """
+    job = _require_job(job_key)
+    if job.status != ExportJobStatus.SUCCEEDED:
+        raise ServiceConflictError("エクスポートはまだ完了していません。")
+    if _as_aware(job.expires_at) <= _utcnow() or not (
+        job.file_path and os.path.exists(job.file_path)
+    ):
+        raise ServiceGoneError("エクスポートの有効期限が切れています。")
+
+    fmt = ExportFormat(job.format)
+    download_name = f"{job.kind}-{job.resource_type}-{job.resource_id}.{fmt.value}"
+    return job.file_path, MIMETYPES[fmt], download_name
+
+
+# =========================================================
+# ファイル生成（Celery ワーカーから呼ばれる）
+# =========================================================
+def run_export_job(job_key: str) -> dict:
+    """
+    PENDING のジョブを RUNNING に切り替えてからファイルを生成する。
+    同じジョブが二重に配送されても、切り替えに成功した1回だけが処理する。
+    """
+    claimed = ExportJob.query.filter_by(
+        job_key=job_key, status=ExportJobStatus.PENDING
+    ).update(
+        {"status": ExportJobStatus.RUNNING, "started_at": _utcnow()},
+        synchronize_session=False,
+    )
+    db.session.commit()
+    if not claimed:
+        return {"job_key": job_key, "status": "skipped"}
+
+    job = _require_job(job_key)
+    db.session.refresh(job)
+    path, tmp_path = _artifact_path(job), _tmp_path(job)
+    try:
+        columns, rows = _export_source(job)
+        row_count = 0
+
+        def _counted(source):
+            nonlocal row_count
+            for row in source:
+                row_count += 1
+                yield row
+
+        with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+            f.writelines(
+                format_lines(ExportFormat(job.format), _counted(rows), columns)
+            )
+        # 書き込み途中のファイルをダウンロードさせないよう完成後に置き換える
+        os.replace(tmp_path, path)
+    except Exception as e:
+        db.session.rollback()
+        _remove_file(tmp_path)
+        job.status = ExportJobStatus.FAILED
+        job.error = str(e)
+        job.finished_at = _utcnow()
+        db.session.commit()
+        current_app.logger.exception("[Export] Failed to build export %s", job_key)
+        return {"job_key": job_key, "status": job.status}
+
+    now = _utcnow()
+    job.status = ExportJobStatus.SUCCEEDED
+    job.file_path = path
+    job.row_count = row_count
+    job.finished_at = now
+    job.expires_at = _expires_at(now)
+    db.session.commit()
+    return {"job_key": job_key, "status": job.status, "row_count": row_count}
+
+
+# =========================================================
+# 期限切れジョブの削除（メンテナンスタスクから呼ばれる）
+# =========================================================
+def fail_stale_export_jobs() -> int:
+    """
+    EXPORT_JOB_STALE_MINUTES を過ぎても RUNNING のジョブを FAILED にする。
+    ワーカーが生成途中で停止すると RUNNING のまま残り、.tmp も消えないため。
+    """
+    now = _utcnow()
+    threshold = now - timedelta(minutes=current_app.config["EXPORT_JOB_STALE_MINUTES"])
+    stale = ExportJob.query.filter(
+        ExportJob.status == ExportJobStatus.RUNNING,
+        ExportJob.started_at <= threshold,
+    ).all()
+    for job in stale:
+        _remove_file(_tmp_path(job))
+        job.status = ExportJobStatus.FAILED
+        job.error = "エクスポートの生成が時間内に完了しませんでした。"
+        job.finished_at = now
+    db.session.commit()
+    return len(stale)
+
+
+def purge_expired_export_jobs() -> int:
+    """有効期限を過ぎたジョブとファイル（生成途中の .tmp を含む）を削除し、削除件数を返す"""
+    expired = ExportJob.query.filter(ExportJob.expires_at <= _utcnow()).all()
+    for job in expired:
+        _remove_file(job.file_path)
+        _remove_file(_tmp_path(job))
+        db.session.delete(job)
+    db.session.commit()
+    return len(expired)
@@ -1,83 +1,218 @@
 from datetime import date, datetime
 
-from sqlalchemy import and_, case, func
+from sqlalchemy import Integer, and_, case, cast, func
 from sqlalchemy.orm import joinedload
 
 from app import db
 from app.models import (
+    ExportFormat,
     Game,
     Group,
     Player,
+    PlayerStatsRollup,
     Score,
     Table,
-    TableTypeEnum,
     Tournament,
     TournamentPlayer,
 )
 from app.service_errors import ServiceNotFoundError
-from app.utils.share_link_utils import get_share_link_by_key
+from app.utils.export_format import MIMETYPES, format_lines
+from app.utils.share_link_utils import get_share_link_by_key, resolve_share_link
 
 
 # =========================================================
 # 内部ユーティリティ
 # =========================================================
 def _require_tournament(short_key: str):
-    link = get_share_link_by_key(short_key)
+    link, tournament = resolve_share_link(short_key, "tournament", Tournament)
     if not link or link.resource_type != "tournament":
         raise ServiceNotFoundError("大会が見つかりません。")
-    tournament = Tournament.query.get(link.resource_id)
     if not tournament:
         raise ServiceNotFoundError("大会が存在しません。")
     return tournament
 
 
 def _require_group(short_key: str):
-    link = get_share_link_by_key(short_key)
+    link, group = resolve_share_link(short_key, "group", Group)
     if not link or link.resource_type != "group":
         raise ServiceNotFoundError("グループが見つかりません。")
-    group = Group.query.get(link.resource_id)
     if not group:
         raise ServiceNotFoundError("グループが存在しません。")
     return group
 
 
-# =========================================================
-# 大会単位の成績出力
-# =========================================================
-def get_tournament_export(tournament_key: str):
-    """大会キーからスコア集計を取得"""
-    tournament = _require_tournament(tournament_key)
+def _tournament_exports(*criteria):
+    """
+    条件に一致する大会ごとの参加者成績（対局数・合計点）を1クエリで集計する。
 
-    players = (
-        db.session.query(Player)
-        .join(TournamentPlayer, Player.id == TournamentPlayer.player_id)
-        .filter(TournamentPlayer.tournament_id == tournament.id)
+    大会 → 参加者 → 集計済みスコアを外部結合するため、参加者のいない大会や
+    対局のない参加者も欠けずに返る。
+    """
+    score_totals = (
+        db.session.query(
+            Table.tournament_id.label("tournament_id"),
+            Score.player_id.label("player_id"),
+            func.count(Score.id).label("games_played"),
+            # MySQL の SUM は Decimal を返すため整数に揃える
+            cast(func.sum(Score.score), Integer).label("total_score"),
+        )
+        .join(Game, Score.game_id == Game.id)
+        .join(Table, Game.table_id == Table.id)
+        .join(Tournament, Table.tournament_id == Tournament.id)
+        .filter(*criteria)
+        .group_by(Table.tournament_id, Score.player_id)
+        .subquery()
+    )
+    rows = (
+        db.session.query(
+            Tournament.id,
+            Tournament.name,
+            Player.id.label("player_id"),
+            Player.name.label("player_name"),
+            score_totals.c.games_played,
+            score_totals.c.total_score,
+        )
+        .outerjoin(TournamentPlayer, TournamentPlayer.tournament_id == Tournament.id)
+        .outerjoin(Player, Player.id == TournamentPlayer.player_id)
+        .outerjoin(
+            score_totals,
+            and_(
+                score_totals.c.tournament_id == Tournament.id,
+                score_totals.c.player_id == Player.id,
+            ),
+        )
+        .filter(*criteria)
+        .order_by(Tournament.id, TournamentPlayer.id)
         .all()
     )
 
-    player_results = []
-    for p in players:
-        scores = (
-            db.session.query(Score)
-            .join(Game, Score.game_id == Game.id)
-            .join(Table, Game.table_id == Table.id)
-            .filter(Table.tournament_id == tournament.id, Score.player_id == p.id)
-            .all()
+    exports = {}
+    for r in rows:
+        t_data = exports.setdefault(
+            r.id, {"tournament": {"id": r.id, "name": r.name}, "players": []}
         )
-        total_score = sum([s.score for s in scores])
-        player_results.append(
+        if r.player_id is None:
+            continue
+        t_data["players"].append(
             {
-                "id": p.id,
-                "name": p.name,
-                "games_played": len(scores),
-                "total_score": total_score,
+                "id": r.player_id,
+                "name": r.player_name,
+                "games_played": r.games_played or 0,
+                "total_score": r.total_score or 0,
             }
         )
+    return list(exports.values())
 
-    return {
-        "tournament": {"id": tournament.id, "name": tournament.name},
-        "players": player_results,
-    }
+
+# =========================================================
+# ファイル出力用の行ジェネレーター（CSV / NDJSON）
+# =========================================================
+SCORE_EXPORT_COLUMNS = [
+    "tournament_id",
+    "tournament_name",
+    "player_id",
+    "player_name",
+    "games_played",
+    "total_score",
+]
+
+GAME_HISTORY_COLUMNS = [
+    "game_id",
+    "tournament_id",
+    "tournament_name",
+    "table_id",
+    "table_name",
+    "table_type",
+    "game_index",
+    "played_at",
+    "player_id",
+    "player_name",
+    "score",
+    "rank",
+    "total_score",
+]
+
+GAME_HISTORY_YIELD_PER = 1000
+
+
+def iter_score_export_rows(*criteria):
+    """_tournament_exports の結果を大会×参加者の1行ずつに展開する"""
+    for export in _tournament_exports(*criteria):
+        tournament = export["tournament"]
+        for player in export["players"]:
+            yield {
+                "tournament_id": tournament["id"],
+                "tournament_name": tournament["name"],
+                "player_id": player["id"],
+                "player_name": player["name"],
+                "games_played": player["games_played"],
+                "total_score": player["total_score"],
+            }
+
+
+def iter_group_game_history(group_id: int, since_game_id: int | None = None):
+    """
+    グループ内の全対局のスコアを (game_id, score_id) 順に1行ずつ返す。
+
+    stream_results を指定すると、MySQL（pymysql）ではバッファなしの SSCursor で
+    結果をサーバーから逐次受け取り、yield_per で一定件数ずつ ORM へ渡すため、
+    履歴の件数によらずメモリ使用量は一定に保たれる。
+    SSCursor で読み切るまでは同じ接続で別のクエリを発行できないため、
+    呼び出し側は反復中に DB へアクセスしないこと。
+    since_game_id を指定すると、それより後（id が大きい）の対局だけを返す。
+    """
+    stmt = (
+        db.select(
+            Game.id.label("game_id"),
+            Tournament.id.label("tournament_id"),
+            Tournament.name.label("tournament_name"),
+            Table.id.label("table_id"),
+            Table.name.label("table_name"),
+            Table.type.label("table_type"),
+            Game.game_index,
+            Game.played_at,
+            Player.id.label("player_id"),
+            Player.name.label("player_name"),
+            Score.score,
+            Score.rank,
+            Score.total_score,
+        )
+        .join(Score, Score.game_id == Game.id)
+        .join(Player, Player.id == Score.player_id)
+        .join(Table, Table.id == Game.table_id)
+        .join(Tournament, Tournament.id == Table.tournament_id)
+        .where(Tournament.group_id == group_id)
+        .order_by(Game.id, Score.id)
+        .execution_options(stream_results=True, yield_per=GAME_HISTORY_YIELD_PER)
+    )
+    if since_game_id:
+        stmt = stmt.where(Game.id > since_game_id)
+    for row in db.session.execute(stmt):
+        yield row._mapping
+
+
+# =========================================================
+# グループの対局履歴のストリーミング出力
+# =========================================================
+def stream_group_game_history(
+    group_key: str, fmt: ExportFormat, since_game_id: int | None = None
+):
+    """
+    グループキーを検証し、対局履歴を1行ずつ整形するジェネレーターと
+    MIME タイプを返す。レスポンスへ渡すまで SQL は実行されない。
+    """
+    group = _require_group(group_key)
+    rows = iter_group_game_history(group.id, since_game_id)
+    return format_lines(fmt, rows, GAME_HISTORY_COLUMNS), MIMETYPES[fmt]
+
+
+# =========================================================
+# 大会単位の成績出力
+# =========================================================
+def get_tournament_export(tournament_key: str):
+    """大会キーからスコア集計を取得"""
+    tournament = _require_tournament(tournament_key)
+    return _tournament_exports(Tournament.id == tournament.id)[0]
 
 
 # =========================================================
@@ -86,28 +221,11 @@ def get_tournament_export(tournament_key: str):
 def get_group_summary(group_key: str):
     """グループキーから大会・スコアサマリーを取得"""
     group = _require_group(group_key)
-    tournaments = Tournament.query.filter_by(group_id=group.id).all()
-
-    result = {
+    return {
         "group": {"id": group.id, "name": group.name},
-        "tournaments": [],
+        "tournaments": _tournament_exports(Tournament.group_id == group.id),
     }
 
-    for t in tournaments:
-        t_data = get_tournament_export(
-            next(
-                (
-                    link.short_key
-                    for link in t.tournament_links
-                    if link.access_level.value == "VIEW"
-                ),
-                None,
-            )
-        )
-        result["tournaments"].append(t_data)
-
-    return result
-
 
 def get_tournament_score_map(tournament_key: str):
     """大会単位のスコアマップを生成"""
@@ -184,29 +302,36 @@ def get_group_player_stats(
         else None
     )
 
-    # --- ベースクエリ ---
+    # --- ベースクエリ（大会単位のロールアップを期間内で合算）---
+    ranked_count = func.sum(PlayerStatsRollup.ranked_count)
     query = (
         db.session.query(
             Player.id.label("player_id"),
             Player.name.label("player_name"),
-            func.count(func.distinct(TournamentPlayer.tournament_id)).label(
+            func.count(func.distinct(PlayerStatsRollup.tournament_id)).label(
                 "tournament_count"
             ),
-            func.count(Score.id).label("game_count"),
-            func.sum(case((Score.rank == 1, 1), else_=0)).label("rank1_count"),
-            func.sum(case((Score.rank == 2, 1), else_=0)).label("rank2_count"),
-            func.sum(case((Score.rank == 3, 1), else_=0)).label("rank3_count"),
-            func.sum(case((Score.rank >= 4, 1), else_=0)).label("rank4_or_lower_count"),
-            func.avg(Score.rank).label("average_rank"),
-            func.coalesce(func.sum(Score.score), 0).label("total_score"),
-            func.coalesce(func.sum(Score.score * Tournament.rate), 0).label(
+            func.sum(PlayerStatsRollup.game_count).label("game_count"),
+            func.sum(PlayerStatsRollup.rank1_count).label("rank1_count"),
+            func.sum(PlayerStatsRollup.rank2_count).label("rank2_count"),
+            func.sum(PlayerStatsRollup.rank3_count).label("rank3_count"),
+            func.sum(PlayerStatsRollup.rank4_or_lower_count).label(
+                "rank4_or_lower_count"
+            ),
+            (
+                func.sum(PlayerStatsRollup.rank_sum)
+                * 1.0
+                / case((ranked_count > 0, ranked_count), else_=None)
+            ).label("average_rank"),
+            func.coalesce(func.sum(PlayerStatsRollup.score_sum), 0).label(
+                "total_score"
+            ),
+            func.coalesce(func.sum(PlayerStatsRollup.balance), 0).label(
                 "total_balance"
             ),
         )
-        .join(Score, Score.player_id == Player.id)
-        .join(Game, Game.id == Score.game_id)
-        .join(Table, Table.id == Game.table_id)
-        .join(Tournament, Tournament.id == Table.tournament_id)
+        .join(PlayerStatsRollup, PlayerStatsRollup.player_id == Player.id)
+        .join(Tournament, Tournament.id == PlayerStatsRollup.tournament_id)
         .join(
             TournamentPlayer,
             and_(
@@ -214,8 +339,8 @@ def get_group_player_stats(
                 TournamentPlayer.tournament_id == Tournament.id,
             ),
         )
+        .filter(PlayerStatsRollup.group_id == group.id)
         .filter(Player.group_id == group.id)
-        .filter(Table.type != TableTypeEnum.CHIP)
     )
 
     # --- 期間フィルタ（Tournament.started_atベース）---
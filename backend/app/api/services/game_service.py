@@ -1,56 +1,23 @@
-from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
 
 from app import db
 from app.models import AccessLevel, Game, Score, Table, TablePlayer, TableTypeEnum
 from app.service_errors import (
+    ServiceConflictError,
     ServiceNotFoundError,
-    ServicePermissionError,
     ServiceValidationError,
 )
-from app.utils.share_link_utils import get_share_link_by_key
-
-_ACCESS_PRIORITY = {
-    AccessLevel.VIEW: 1,
-    AccessLevel.EDIT: 2,
-    AccessLevel.OWNER: 3,
-}
-
-
-# =========================================================
-# 内部ユーティリティ
-# =========================================================
-def _require_table(short_key: str):
-    """共有キーから卓を特定"""
-    link = get_share_link_by_key(short_key)
-    if not link:
-        raise ServiceNotFoundError("table_keyが無効です。")
-    if link.resource_type != "table":
-        raise ServicePermissionError("table_keyの対象が一致しません。")
-
-    table = Table.query.get(link.resource_id)
-    if not table:
-        raise ServiceNotFoundError("卓が見つかりません。")
-    return link, table
-
-
-def _require_game(short_key: str):
-    """共有キーから対局を特定"""
-    link = get_share_link_by_key(short_key)
-    if not link:
-        raise ServiceNotFoundError("game_keyが無効です。")
-    if link.resource_type != "game":
-        raise ServicePermissionError("game_keyの対象が一致しません。")
-
-    game = Game.query.get(link.resource_id)
-    if not game:
-        raise ServiceNotFoundError("対局が見つかりません。")
-    return link, game
-
-
-def _ensure_access(link, required: AccessLevel, message: str):
-    """アクセスレベルチェック"""
-    if _ACCESS_PRIORITY[link.access_level] < _ACCESS_PRIORITY[required]:
-        raise ServicePermissionError(message)
+from app.utils.game_utils import (
+    insert_games,
+    load_games_with_scores,
+    sync_game_index_counter,
+)
+from app.utils.player_stats_utils import apply_game_scores
+from app.utils.share_link_utils import (
+    ensure_access,
+    get_share_link_by_key,
+    require_resource,
+)
 
 
 # =========================================================
@@ -59,18 +26,18 @@ def _ensure_access(link, required: AccessLevel, message: str):
 def create_game(table_key: str, data: dict) -> Game:
     """卓に対局（スコア付き）を追加"""
 
-    link = get_share_link_by_key(table_key)
-    if not link:
-        raise ServiceNotFoundError("table_keyが無効です。")
-
-    _ensure_access(link, AccessLevel.EDIT, "対局を作成する権限がありません。")
-
-    if not link or link.resource_type != "table":
-        raise ServiceNotFoundError("指定された卓が見つかりません。")
-
-    table = Table.query.get(link.resource_id)
-    if not table:
-        raise ServiceNotFoundError("卓が存在しません。")
+    _, table = require_resource(
+        table_key,
+        "table",
+        Table,
+        AccessLevel.EDIT,
+        invalid_message="table_keyが無効です。",
+        missing_message="卓が存在しません。",
+        forbidden_message="対局を作成する権限がありません。",
+        # 卓以外のキーは従来どおり 404
+        mismatch_message="指定された卓が見つかりません。",
+        mismatch_error=ServiceNotFoundError,
+    )
 
     scores = data.get("scores", [])
     memo = data.get("memo")
@@ -89,25 +56,16 @@ def create_game(table_key: str, data: dict) -> Game:
         raise ServiceValidationError("この卓にはまだプレイヤーが登録されていません。")
     # 作成者情報
     created_by = table.created_by or "anonymous"
-    # game_index 自動採番
-    max_index = (
-        db.session.query(func.max(Game.game_index))
-        .filter_by(table_id=table.id)
-        .scalar()
-    )
-    next_index = (max_index or 0) + 1
-
-    game = Game(
-        table_id=table.id,
-        game_index=next_index,
-        memo=memo,
-        created_by=created_by,  # ← ここを継承する
-    )
-    db.session.add(game)
-    db.session.flush()  # game.idを確定
+    # game_index 自動採番（卓ごとの採番カウンターから払い出す）
+    try:
+        game = insert_games(table.id, [{"memo": memo, "created_by": created_by}])[0]
+    except IntegrityError:
+        db.session.rollback()
+        raise ServiceConflictError("game_index を採番できませんでした。")
     # --- rank自動計算 ---
     scores = sorted(scores, key=lambda s: s.get("score", 0), reverse=True)
     rank = 1
+    game_scores = []
 
     for i, s in enumerate(scores):
         pid = s.get("player_id")
@@ -123,32 +81,32 @@ def create_game(table_key: str, data: dict) -> Game:
         else:
             s["rank"] = rank
         rank += 1
-        db.session.add(Score(game_id=game.id, player_id=pid, score=val, rank=s["rank"]))
+        game_scores.append(
+            Score(game_id=game.id, player_id=pid, score=val, rank=s["rank"])
+        )
 
+    db.session.add_all(game_scores)
+    apply_game_scores(table, game_scores)
     db.session.commit()
     return game
 
 
 def get_games_by_table(table_key: str):
     """卓共有キーから対局一覧（スコア込み）を取得"""
-    from app.models import Game, Score, Table
-    from app.utils.share_link_utils import get_share_link_by_key
-
-    link = get_share_link_by_key(table_key)
-    if not link or link.resource_type != "table":
-        raise ServiceNotFoundError("table_keyが無効です。")
-
-    table = Table.query.get(link.resource_id)
-    if not table:
-        raise ServiceNotFoundError("卓が存在しません。")
+    _, table = require_resource(
+        table_key,
+        "table",
+        Table,
+        invalid_message="table_keyが無効です。",
+        missing_message="卓が存在しません。",
+        forbidden_message="対局を閲覧する権限がありません。",
+        mismatch_message="table_keyが無効です。",
+        mismatch_error=ServiceNotFoundError,
+    )
 
-    games = Game.query.filter_by(table_id=table.id).order_by(Game.id.asc()).all()
     result = []
-    for g in games:
-        scores = [
-            {"player_id": s.player_id, "score": s.score}
-            for s in Score.query.filter_by(game_id=g.id).all()
-        ]
+    for g, game_scores in load_games_with_scores(table.id):
+        scores = [{"player_id": s.player_id, "score": s.score} for s in game_scores]
         result.append(
             {
                 "id": g.id,
@@ -166,23 +124,34 @@ def get_game_by_key(table_key: str, game_id: int) -> Game:
     link = get_share_link_by_key(table_key)
     if not link:
         raise ServiceNotFoundError("table_keyが無効です。")
-    _ensure_access(link, AccessLevel.VIEW, "対局を閲覧する権限がありません。")
+    ensure_access(link, AccessLevel.VIEW, "対局を閲覧する権限がありません。")
     game = Game.query.get_or_404(game_id)
     return game
 
 
 def update_game(table_key: str, game_id: int, data: dict) -> Game:
     """Tableキー,Game_idから更新（メモ・日付・スコア）"""
-    link, table = _require_table(table_key)
-    if not link:
-        raise ServiceNotFoundError("table_keyが無効です。")
-    _ensure_access(link, AccessLevel.EDIT, "対局を更新する権限がありません。")
+    _, table = require_resource(
+        table_key,
+        "table",
+        Table,
+        AccessLevel.EDIT,
+        invalid_message="table_keyが無効です。",
+        forbidden_message="対局を更新する権限がありません。",
+        mismatch_message="table_keyの対象が一致しません。",
+    )
     game = Game.query.get_or_404(game_id)
     if game.table_id != table.id:
         raise ServiceNotFoundError("指定された対局が見つかりません。")
     # --- 基本項目更新 ---
-    if "game_index" in data:
+    if "game_index" in data and data["game_index"] != game.game_index:
+        if Game.query.filter_by(
+            table_id=table.id, game_index=data["game_index"]
+        ).first():
+            raise ServiceConflictError("同じ game_index の対局が既に存在します。")
         game.game_index = data["game_index"]
+        db.session.flush()
+        sync_game_index_counter(table.id)
     if "memo" in data:
         game.memo = data["memo"]
     if "played_at" in data:
@@ -201,12 +170,14 @@ def update_game(table_key: str, game_id: int, data: dict) -> Game:
         if total != 0 and table.type == TableTypeEnum.NORMAL:
             raise ServiceValidationError("スコアの合計は0でなければなりません。")
 
-        # 既存スコア削除
+        # 既存スコア削除（ロールアップから差し引く）
+        apply_game_scores(table, Score.query.filter_by(game_id=game.id).all(), -1)
         Score.query.filter_by(game_id=game.id).delete()
         db.session.flush()
         # 新しいスコアを追加
         scores = sorted(scores, key=lambda s: s.get("score", 0), reverse=True)
         rank = 1
+        game_scores = []
         for i, s in enumerate(scores):
             pid = s.get("player_id")
             val = s.get("score")
@@ -221,9 +192,11 @@ def update_game(table_key: str, game_id: int, data: dict) -> Game:
             else:
                 s["rank"] = rank
             rank += 1
-            db.session.add(
+            game_scores.append(
                 Score(game_id=game.id, player_id=pid, score=val, rank=s["rank"])
             )
+        db.session.add_all(game_scores)
+        apply_game_scores(table, game_scores)
 
     db.session.commit()
     db.session.refresh(game)
@@ -233,12 +206,18 @@ def update_game(table_key: str, game_id: int, data: dict) -> Game:
 
 def delete_game(table_key: str, game_id: int) -> None:
     """対局共有キーから削除"""
-    link, table = _require_table(table_key)
-    if not link:
-        raise ServiceNotFoundError("table_keyが無効です。")
-    _ensure_access(link, AccessLevel.EDIT, "対局を削除する権限がありません。")
+    _, table = require_resource(
+        table_key,
+        "table",
+        Table,
+        AccessLevel.EDIT,
+        invalid_message="table_keyが無効です。",
+        forbidden_message="対局を削除する権限がありません。",
+        mismatch_message="table_keyの対象が一致しません。",
+    )
     game = Game.query.get_or_404(game_id)
     if game.table_id != table.id:
         raise ServiceNotFoundError("指定された対局が見つかりません。")
+    apply_game_scores(table, game.scores, -1)
     db.session.delete(game)
     db.session.commit()
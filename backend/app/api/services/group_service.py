@@ -4,6 +4,7 @@ from datetime import datetime, timedelta, timezone
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from flask import current_app, request
+from limits import parse
 
 from app import db
 from app.api.schemas.group_schema import GroupCreateSchema, GroupRequestSchema
@@ -13,42 +14,10 @@ from app.service_errors import (
     ServicePermissionError,
     ServiceValidationError,
 )
-from app.utils.share_link_utils import create_default_share_links, get_share_link_by_key
-
-_ACCESS_PRIORITY = {
-    AccessLevel.VIEW: 1,
-    AccessLevel.EDIT: 2,
-    AccessLevel.OWNER: 3,
-}
-
 from app.tasks.email_tasks import send_group_creation_email_task
+from app.utils.rate_counter import group_creation_counter
 from app.utils.recaptcha import verify_recaptcha  # noqa: F401
-
-# =========================================================
-# 内部ユーティリティ
-# =========================================================
-
-
-def _require_group(short_key: str):
-    """共有リンクからGroupを特定"""
-    link = get_share_link_by_key(short_key)
-    if not link:
-        raise ServiceNotFoundError("共有リンクが無効です。")
-    if link.resource_type != "group":
-        raise ServicePermissionError("共有リンクの対象が一致しません。")
-
-    group = Group.query.get(link.resource_id)
-    if not group:
-        raise ServiceNotFoundError("グループが見つかりません。")
-    return link, group
-
-
-def _ensure_access(link, group, required: AccessLevel, message: str):
-    """アクセスレベルチェック"""
-    if link.resource_id != group.id:
-        raise ServicePermissionError("共有リンクの対象が一致しません。")
-    if _ACCESS_PRIORITY[link.access_level] < _ACCESS_PRIORITY[required]:
-        raise ServicePermissionError(message)
+from app.utils.share_link_utils import create_default_share_links, require_resource
 
 
 # =========================================================
@@ -63,38 +32,78 @@ def get_client_ip() -> str:
     return request.remote_addr or "unknown"
 
 
-def check_group_creation_rate_limit(email: str, ip_address: str) -> None:
-    now = datetime.now(timezone.utc)
-
-    ip_count_1h = GroupCreationToken.query.filter(
-        GroupCreationToken.ip_address == ip_address,
-        GroupCreationToken.created_at >= now - timedelta(hours=1),
-    ).count()
-
-    if ip_count_1h >= 5:
-        raise ServicePermissionError(
-            "同一IPからのリクエストが多すぎます。しばらくしてから再試行してください。"
-        )
-
-    email_count_1h = GroupCreationToken.query.filter(
-        GroupCreationToken.email == email,
-        GroupCreationToken.created_at >= now - timedelta(hours=1),
-    ).count()
+# (対象, 上限, 超過時メッセージ)。カウンター・DB集計の両方で共通に使う
+_GROUP_CREATION_LIMITS = (
+    (
+        "ip",
+        "5 per hour",
+        "同一IPからのリクエストが多すぎます。しばらくしてから再試行してください。",
+    ),
+    (
+        "email",
+        "3 per hour",
+        "同一メールアドレスへの送信回数が多すぎます。しばらくしてから再試行してください。",
+    ),
+    (
+        "email",
+        "10 per day",
+        "本日の送信回数上限に達しました。明日以降に再試行してください。",
+    ),
+)
 
-    if email_count_1h >= 3:
-        raise ServicePermissionError(
-            "同一メールアドレスへの送信回数が多すぎます。しばらくしてから再試行してください。"
-        )
 
-    email_count_1d = GroupCreationToken.query.filter(
-        GroupCreationToken.email == email,
-        GroupCreationToken.created_at >= now - timedelta(days=1),
-    ).count()
+def check_group_creation_rate_limit(email: str, ip_address: str) -> None:
+    """
+    IP / メールアドレス別のリクエスト回数を確認する（記録はしない）。
+    sliding window カウンターを優先し、無効・障害時は DB 集計（発行済みトークン
+    行の件数）で判定する。
+    """
+    identifiers = {"ip": ip_address, "email": email}
+    if group_creation_counter.enabled:
+        try:
+            for kind, limit, message in _GROUP_CREATION_LIMITS:
+                if not group_creation_counter.test(
+                    limit, "group-creation", kind, identifiers[kind]
+                ):
+                    raise ServicePermissionError(message)
+            return
+        except ServicePermissionError:
+            raise
+        except Exception:
+            current_app.logger.exception(
+                "[RateLimit] group creation counter unavailable; using DB"
+            )
 
-    if email_count_1d >= 10:
-        raise ServicePermissionError(
-            "本日の送信回数上限に達しました。明日以降に再試行してください。"
-        )
+    now = datetime.now(timezone.utc)
+    columns = {"ip": GroupCreationToken.ip_address, "email": GroupCreationToken.email}
+    for kind, limit, message in _GROUP_CREATION_LIMITS:
+        item = parse(limit)
+        count = GroupCreationToken.query.filter(
+            columns[kind] == identifiers[kind],
+            GroupCreationToken.created_at >= now - timedelta(seconds=item.get_expiry()),
+        ).count()
+        if count >= item.amount:
+            raise ServicePermissionError(message)
+
+
+def record_group_creation_request(email: str, ip_address: str) -> str | None:
+    """
+    発行済みのリクエストを全ウィンドウに記録する（トークンの commit 後に呼ぶ）。
+    hit は確認と記録を1回で行うため、check 後に同時リクエストで上限に
+    達していた場合はそのウィンドウのメッセージを返す。DB 集計時は何もしない。
+    """
+    if not group_creation_counter.enabled:
+        return None
+    identifiers = {"ip": ip_address, "email": email}
+    try:
+        for kind, limit, message in _GROUP_CREATION_LIMITS:
+            if not group_creation_counter.hit(
+                limit, "group-creation", kind, identifiers[kind]
+            ):
+                return message
+    except Exception:
+        current_app.logger.exception("[RateLimit] failed to record group creation")
+    return None
 
 
 def create_group_creation_token(data: GroupRequestSchema) -> GroupCreationToken:
@@ -117,7 +126,9 @@ def create_group_creation_token(data: GroupRequestSchema) -> GroupCreationToken:
     ip_address = get_client_ip()
 
     # アクセス制限チェック
-    if os.getenv("FLASK_ENV") == "production":
+    rate_limited = os.getenv("FLASK_ENV") == "production"
+    if rate_limited:
+        # 拒否されたリクエストは記録しない（全ウィンドウを確認してから記録する）
         check_group_creation_rate_limit(email, ip_address)
 
     # 既存の未使用トークンを無効化
@@ -134,10 +145,18 @@ def create_group_creation_token(data: GroupRequestSchema) -> GroupCreationToken:
         token=secrets.token_urlsafe(32),
         expires_at=datetime.now(timezone.utc) + timedelta(minutes=30),
         is_used=False,
+        ip_address=ip_address,
     )
 
     db.session.add(new_token)
     db.session.commit()
+    if rate_limited:
+        # commit に失敗したリクエストは枠を消費しない
+        exceeded = record_group_creation_request(email, ip_address)
+        if exceeded:
+            new_token.is_used = True
+            db.session.commit()
+            raise ServicePermissionError(exceeded)
 
     # メール送信をCeleryで実行
     frontend_url = current_app.config.get("FRONTEND_URL", "http://localhost:5173/")
@@ -238,7 +257,7 @@ def create_group_status(data: GroupRequestSchema) -> dict[str, str]:
 # =========================================================
 def get_group_by_key(short_key: str) -> Group:
     """共有リンクキーからグループを取得"""
-    link, group = _require_group(short_key)
+    link, group = require_resource(short_key, "group", Group)
     group.current_user_access = link.access_level
     return group
 
@@ -248,9 +267,12 @@ def get_group_by_key(short_key: str) -> Group:
 # =========================================================
 def update_group(short_key: str, data: dict) -> Group:
     """共有リンクキーからGroupを特定して更新"""
-    link, group = _require_group(short_key)
-    _ensure_access(
-        link, group, AccessLevel.OWNER, "グループの更新にはOWNER権限が必要です。"
+    link, group = require_resource(
+        short_key,
+        "group",
+        Group,
+        AccessLevel.OWNER,
+        forbidden_message="グループの更新にはOWNER権限が必要です。",
     )
 
     if "name" in data:
@@ -270,9 +292,12 @@ def update_group(short_key: str, data: dict) -> Group:
 # =========================================================
 def delete_group(short_key: str) -> None:
     """共有リンクキーからGroupを特定して削除"""
-    link, group = _require_group(short_key)
-    _ensure_access(
-        link, group, AccessLevel.OWNER, "グループの削除にはOWNER権限が必要です。"
+    _, group = require_resource(
+        short_key,
+        "group",
+        Group,
+        AccessLevel.OWNER,
+        forbidden_message="グループの削除にはOWNER権限が必要です。",
     )
 
     db.session.delete(group)
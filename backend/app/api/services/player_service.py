@@ -5,33 +5,11 @@ from app.service_errors import (
     ServicePermissionError,
     ServiceValidationError,
 )
-from app.utils.share_link_utils import get_share_link_by_key
-
-_ACCESS_PRIORITY = {
-    AccessLevel.VIEW: 1,
-    AccessLevel.EDIT: 2,
-    AccessLevel.OWNER: 3,
-}
-
-
-def _require_group(short_key: str):
-    """共有キーからグループを特定"""
-    link = get_share_link_by_key(short_key)
-    if not link:
-        raise ServiceNotFoundError("共有リンクが無効です。")
-    if link.resource_type != "group":
-        raise ServicePermissionError("共有リンクの対象が一致しません。")
-
-    group = Group.query.get(link.resource_id)
-    if not group:
-        raise ServiceNotFoundError("グループが見つかりません。")
-    return link, group
-
-
-def _ensure_access(link, required: AccessLevel, message: str):
-    """アクセスレベルチェック"""
-    if _ACCESS_PRIORITY[link.access_level] < _ACCESS_PRIORITY[required]:
-        raise ServicePermissionError(message)
+from app.utils.share_link_utils import (
+    ensure_access,
+    get_share_link_by_key,
+    require_resource,
+)
 
 
 # =========================================================
@@ -39,8 +17,13 @@ def _ensure_access(link, required: AccessLevel, message: str):
 # =========================================================
 def list_players_by_group_key(group_key: str):
     """グループ共有キーからプレイヤー一覧取得"""
-    link, group = _require_group(group_key)
-    _ensure_access(link, AccessLevel.VIEW, "プレイヤーを閲覧する権限がありません。")
+    _, group = require_resource(
+        group_key,
+        "group",
+        Group,
+        AccessLevel.VIEW,
+        forbidden_message="プレイヤーを閲覧する権限がありません。",
+    )
 
     return Player.query.filter_by(group_id=group.id).order_by(Player.id).all()
 
@@ -54,8 +37,13 @@ def create_player(data: dict, group_key: str) -> Player:
     if not name:
         raise ServiceValidationError("name は必須です。")
 
-    link, group = _require_group(group_key)
-    _ensure_access(link, AccessLevel.EDIT, "プレイヤーを追加する権限がありません。")
+    _, group = require_resource(
+        group_key,
+        "group",
+        Group,
+        AccessLevel.EDIT,
+        forbidden_message="プレイヤーを追加する権限がありません。",
+    )
 
     player = Player(
         group_id=group.id,
@@ -77,7 +65,7 @@ def get_player_by_key(group_key: str, player_id: int) -> Player:
     if not link or link.resource_type != "group":
         raise ServicePermissionError("共有リンクが不正です。")
 
-    _ensure_access(link, AccessLevel.VIEW, "プレイヤーを閲覧する権限がありません。")
+    ensure_access(link, AccessLevel.VIEW, "プレイヤーを閲覧する権限がありません。")
     player = Player.query.filter_by(id=player_id, group_id=link.resource_id).first()
     if not player:
         raise ServiceNotFoundError("プレイヤーが見つかりません。")
@@ -93,7 +81,7 @@ def update_player(group_key: str, player_id: int, data: dict) -> Player:
     if not player:
         raise ServiceNotFoundError("プレイヤーが見つかりません。")
 
-    _ensure_access(link, AccessLevel.EDIT, "プレイヤーを更新する権限がありません。")
+    ensure_access(link, AccessLevel.EDIT, "プレイヤーを更新する権限がありません。")
 
     if "name" in data:
         player.name = data["name"]
@@ -116,7 +104,7 @@ def delete_player(group_key: str, player_id: int) -> None:
     if not player:
         raise ServiceNotFoundError("プレイヤーが見つかりません。")
 
-    _ensure_access(link, AccessLevel.EDIT, "プレイヤーを削除する権限がありません。")
+    ensure_access(link, AccessLevel.EDIT, "プレイヤーを削除する権限がありません。")
 
     participation = TournamentPlayer.query.filter_by(player_id=player.id).first()
     if participation:
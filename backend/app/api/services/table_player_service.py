@@ -16,35 +16,11 @@ from app.service_errors import (
     ServicePermissionError,
     ServiceValidationError,
 )
-from app.utils.share_link_utils import get_share_link_by_key
-
-_ACCESS_PRIORITY = {
-    AccessLevel.VIEW: 1,
-    AccessLevel.EDIT: 2,
-    AccessLevel.OWNER: 3,
-}
-
-
-# =========================================================
-# 内部ユーティリティ
-# =========================================================
-def _require_table(short_key: str):
-    """共有キーから卓を特定"""
-    link = get_share_link_by_key(short_key)
-    if not link:
-        raise ServiceNotFoundError("共有リンクが無効です。")
-    if link.resource_type != "table":
-        raise ServicePermissionError("共有リンクの対象が一致しません。")
-
-    table = Table.query.get(link.resource_id)
-    if not table:
-        raise ServiceNotFoundError("卓が見つかりません。")
-    return link, table
-
-
-def _ensure_access(link, required: AccessLevel, message: str):
-    if _ACCESS_PRIORITY[link.access_level] < _ACCESS_PRIORITY[required]:
-        raise ServicePermissionError(message)
+from app.utils.share_link_utils import (
+    ensure_access,
+    get_share_link_by_key,
+    require_resource,
+)
 
 
 # =========================================================
@@ -52,8 +28,13 @@ def _ensure_access(link, required: AccessLevel, message: str):
 # =========================================================
 def list_table_players_by_key(table_key: str):
     """卓共有キーから卓参加者一覧を取得"""
-    link, table = _require_table(table_key)
-    _ensure_access(link, AccessLevel.VIEW, "卓の参加者を閲覧する権限がありません。")
+    _, table = require_resource(
+        table_key,
+        "table",
+        Table,
+        AccessLevel.VIEW,
+        forbidden_message="卓の参加者を閲覧する権限がありません。",
+    )
     table_player = TablePlayer.query.filter_by(table_id=table.id).all()
     player_ids = [t.player_id for t in table_player]
     result = {
@@ -68,8 +49,13 @@ def list_table_players_by_key(table_key: str):
 # =========================================================
 def create_table_player(table_key: str, data: dict):
     """卓共有キーから大会参加者を複数登録"""
-    link, table = _require_table(table_key)
-    _ensure_access(link, AccessLevel.EDIT, "卓に参加者を追加する権限がありません。")
+    _, table = require_resource(
+        table_key,
+        "table",
+        Table,
+        AccessLevel.EDIT,
+        forbidden_message="卓に参加者を追加する権限がありません。",
+    )
 
     players_data = data.get("players")
     if not players_data or not isinstance(players_data, list):
@@ -143,7 +129,7 @@ def delete_table_player(table_key: str, player_id: int):
     if not table_player:
         raise ServiceNotFoundError("卓参加者が見つかりません。")
 
-    _ensure_access(link, AccessLevel.EDIT, "卓参加者を削除する権限がありません。")
+    ensure_access(link, AccessLevel.EDIT, "卓参加者を削除する権限がありません。")
 
     # 1. 同じ卓のゲームを取得
     games = Game.query.filter_by(table_id=table_player.table_id).all()
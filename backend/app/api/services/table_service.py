@@ -4,55 +4,9 @@ from sqlalchemy.exc import IntegrityError
 
 from app import db
 from app.models import AccessLevel, Table, Tournament
-from app.service_errors import (
-    ServiceNotFoundError,
-    ServicePermissionError,
-    ServiceValidationError,
-)
-from app.utils.share_link_utils import create_default_share_links, get_share_link_by_key
-
-_ACCESS_PRIORITY = {
-    AccessLevel.VIEW: 1,
-    AccessLevel.EDIT: 2,
-    AccessLevel.OWNER: 3,
-}
-
-
-# =========================================================
-# 内部ユーティリティ
-# =========================================================
-def _require_tournament(short_key: str):
-    """共有キーから大会を特定"""
-    link = get_share_link_by_key(short_key)
-    if not link:
-        raise ServiceNotFoundError("共有リンクが無効です。")
-    if link.resource_type != "tournament":
-        raise ServicePermissionError("共有リンクの対象が一致しません。")
-
-    tournament = Tournament.query.get(link.resource_id)
-    if not tournament:
-        raise ServiceNotFoundError("大会が見つかりません。")
-    return link, tournament
-
-
-def _require_table(short_key: str):
-    """共有キーから卓を特定"""
-    link = get_share_link_by_key(short_key)
-    if not link:
-        raise ServiceNotFoundError("共有リンクが無効です。")
-    if link.resource_type != "table":
-        raise ServicePermissionError("共有リンクの対象が一致しません。")
-
-    table = Table.query.get(link.resource_id)
-    if not table:
-        raise ServiceNotFoundError("卓が見つかりません。")
-    return link, table
-
-
-def _ensure_access(link, required: AccessLevel, message: str):
-    """アクセスレベルチェック"""
-    if _ACCESS_PRIORITY[link.access_level] < _ACCESS_PRIORITY[required]:
-        raise ServicePermissionError(message)
+from app.service_errors import ServiceValidationError
+from app.utils.player_stats_utils import rebuild_player_stats
+from app.utils.share_link_utils import create_default_share_links, require_resource
 
 
 # =========================================================
@@ -60,8 +14,13 @@ def _ensure_access(link, required: AccessLevel, message: str):
 # =========================================================
 def create_table(data: dict, tournament_key: str) -> Table:
     """大会共有キーから卓を作成"""
-    link, tournament = _require_tournament(tournament_key)
-    _ensure_access(link, AccessLevel.EDIT, "卓を作成する権限がありません。")
+    link, tournament = require_resource(
+        tournament_key,
+        "tournament",
+        Tournament,
+        AccessLevel.EDIT,
+        forbidden_message="卓を作成する権限がありません。",
+    )
 
     name = data.get("name")
     if not name:
@@ -88,8 +47,13 @@ def create_table(data: dict, tournament_key: str) -> Table:
 # =========================================================
 def get_table_by_tournament(tournament_key: str):
     """卓共有キーから対局一覧を取得"""
-    link, tournament = _require_tournament(tournament_key)
-    _ensure_access(link, AccessLevel.VIEW, "対局を閲覧する権限がありません。")
+    link, tournament = require_resource(
+        tournament_key,
+        "tournament",
+        Tournament,
+        AccessLevel.VIEW,
+        forbidden_message="対局を閲覧する権限がありません。",
+    )
 
     tables = Table.query.filter_by(tournament_id=tournament.id).all()
     tables = [setattr(t, "current_user_access", link.access_level) or t for t in tables]
@@ -101,7 +65,7 @@ def get_table_by_tournament(tournament_key: str):
 # =========================================================
 def get_table_by_key(short_key: str) -> Table:
     """卓共有キーから卓を取得"""
-    link, table = _require_table(short_key)
+    link, table = require_resource(short_key, "table", Table)
     table.current_user_access = link.access_level
     if table:
         table.tournament.current_user_access = link.access_level
@@ -113,13 +77,20 @@ def get_table_by_key(short_key: str) -> Table:
 # =========================================================
 def update_table(short_key: str, data: dict) -> Table:
     """卓共有キーから卓を更新"""
-    link, table = _require_table(short_key)
-    _ensure_access(link, AccessLevel.EDIT, "卓を更新する権限がありません。")
+    link, table = require_resource(
+        short_key,
+        "table",
+        Table,
+        AccessLevel.EDIT,
+        forbidden_message="卓を更新する権限がありません。",
+    )
 
     if "name" in data:
         table.name = data["name"]
-    if "type" in data:
+    if "type" in data and data["type"] != table.type:
         table.type = data["type"]
+        # CHIP卓は成績統計の対象外のため、種別変更時は大会単位で集計し直す
+        rebuild_player_stats([table.tournament_id])
 
     db.session.commit()
     db.session.refresh(table)
@@ -132,8 +103,13 @@ def update_table(short_key: str, data: dict) -> Table:
 # =========================================================
 def delete_table(short_key: str) -> None:
     """卓共有キーから卓を削除"""
-    link, table = _require_table(short_key)
-    _ensure_access(link, AccessLevel.EDIT, "卓を削除する権限がありません。")
+    _, table = require_resource(
+        short_key,
+        "table",
+        Table,
+        AccessLevel.EDIT,
+        forbidden_message="卓を削除する権限がありません。",
+    )
 
     try:
         db.session.delete(table)
@@ -16,32 +16,11 @@ from app.service_errors import (
     ServicePermissionError,
     ServiceValidationError,
 )
-from app.utils.share_link_utils import get_share_link_by_key
-
-_ACCESS_PRIORITY = {
-    AccessLevel.VIEW: 1,
-    AccessLevel.EDIT: 2,
-    AccessLevel.OWNER: 3,
-}
-
-
-def _require_tournament(short_key: str):
-    """共有キーから大会を特定"""
-    link = get_share_link_by_key(short_key)
-    if not link:
-        raise ServiceNotFoundError("共有リンクが無効です。")
-    if link.resource_type != "tournament":
-        raise ServicePermissionError("共有リンクの対象が一致しません。")
-
-    tournament = Tournament.query.get(link.resource_id)
-    if not tournament:
-        raise ServiceNotFoundError("大会が見つかりません。")
-    return link, tournament
-
-
-def _ensure_access(link, required: AccessLevel, message: str):
-    if _ACCESS_PRIORITY[link.access_level] < _ACCESS_PRIORITY[required]:
-        raise ServicePermissionError(message)
+from app.utils.share_link_utils import (
+    ensure_access,
+    get_share_link_by_key,
+    require_resource,
+)
 
 
 # =========================================================
@@ -49,8 +28,13 @@ def _ensure_access(link, required: AccessLevel, message: str):
 # =========================================================
 def list_participants_by_key(tournament_key: str):
     """大会共有キーから参加者一覧を取得"""
-    link, tournament = _require_tournament(tournament_key)
-    _ensure_access(link, AccessLevel.VIEW, "参加者一覧を閲覧する権限がありません。")
+    _, tournament = require_resource(
+        tournament_key,
+        "tournament",
+        Tournament,
+        AccessLevel.VIEW,
+        forbidden_message="参加者一覧を閲覧する権限がありません。",
+    )
     tournament_players = (
         db.session.query(TournamentPlayer).filter_by(tournament_id=tournament.id).all()
     )
@@ -67,9 +51,14 @@ def list_participants_by_key(tournament_key: str):
 # =========================================================
 def create_participants(tournament_key: str, data: list[dict]):
     """大会共有キーから複数のプレイヤーを登録"""
-    link, tournament = _require_tournament(tournament_key)
+    _, tournament = require_resource(
+        tournament_key,
+        "tournament",
+        Tournament,
+        AccessLevel.EDIT,
+        forbidden_message="参加者を追加する権限がありません。",
+    )
     data_list = data.get("participants", [])
-    _ensure_access(link, AccessLevel.EDIT, "参加者を追加する権限がありません。")
     if not isinstance(data_list, list) or not data_list:
         raise ServiceValidationError("data_list は空ではいけません。")
 
@@ -139,7 +128,7 @@ def delete_participant(tournament_key: str, player_id: int):
     if not participant:
         raise ServiceNotFoundError("大会参加者が見つかりません。")
 
-    _ensure_access(link, AccessLevel.EDIT, "大会参加者を削除する権限がありません。")
+    ensure_access(link, AccessLevel.EDIT, "大会参加者を削除する権限がありません。")
 
     score = (
         Score.query.join(Game, Score.game_id == Game.id)
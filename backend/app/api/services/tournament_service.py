@@ -1,59 +1,29 @@
 from datetime import datetime, timezone
 
+from sqlalchemy import delete, exists, select
 from sqlalchemy.exc import IntegrityError
 
 from app import db
-from app.models import AccessLevel, Group, TableTypeEnum, Tournament
-from app.service_errors import (
-    ServiceNotFoundError,
-    ServicePermissionError,
-    ServiceValidationError,
+from app.models import (
+    AccessLevel,
+    Game,
+    Group,
+    PlayerStatsRollup,
+    Score,
+    Table,
+    TablePlayer,
+    TableTypeEnum,
+    Tournament,
+    TournamentPlayer,
+    mark_group_touched,
+)
+from app.service_errors import ServiceValidationError
+from app.utils.player_stats_utils import refresh_tournament_balance
+from app.utils.share_link_utils import (
+    create_default_share_links,
+    delete_share_links,
+    require_resource,
 )
-from app.utils.share_link_utils import create_default_share_links, get_share_link_by_key
-
-_ACCESS_PRIORITY = {
-    AccessLevel.VIEW: 1,
-    AccessLevel.EDIT: 2,
-    AccessLevel.OWNER: 3,
-}
-
-
-# =========================================================
-# 内部共通関数
-# =========================================================
-def _require_tournament(short_key: str):
-    """共有キーから大会を特定"""
-    link = get_share_link_by_key(short_key)
-    if not link:
-        raise ServiceNotFoundError("共有リンクが無効です。")
-    if link.resource_type != "tournament":
-        raise ServicePermissionError("共有リンクの対象が一致しません。")
-
-    tournament = Tournament.query.get(link.resource_id)
-    if not tournament:
-        raise ServiceNotFoundError("大会が見つかりません。")
-
-    return link, tournament
-
-
-def _require_group(short_key: str):
-    """共有キーからグループを特定"""
-    link = get_share_link_by_key(short_key)
-    if not link:
-        raise ServiceNotFoundError("group_keyが無効です。")
-    if link.resource_type != "group":
-        raise ServicePermissionError("group_keyの対象が一致しません。")
-
-    group = Group.query.get(link.resource_id)
-    if not group:
-        raise ServiceNotFoundError("グループが見つかりません。")
-    return link, group
-
-
-def _ensure_access(link, required: AccessLevel, message: str):
-    """アクセスレベルチェック"""
-    if _ACCESS_PRIORITY[link.access_level] < _ACCESS_PRIORITY[required]:
-        raise ServicePermissionError(message)
 
 
 # =========================================================
@@ -61,8 +31,14 @@ def _ensure_access(link, required: AccessLevel, message: str):
 # =========================================================
 def create_tournament(data: dict, group_key: str) -> Tournament:
     """グループ共有キーから大会を作成"""
-    link, group = _require_group(group_key)
-    _ensure_access(link, AccessLevel.EDIT, "大会を作成する権限がありません。")
+    _, group = require_resource(
+        group_key,
+        "group",
+        Group,
+        AccessLevel.EDIT,
+        invalid_message="group_keyが無効です。",
+        forbidden_message="大会を作成する権限がありません。",
+    )
 
     name = data.get("name")
     if not name:
@@ -88,10 +64,14 @@ def create_tournament(data: dict, group_key: str) -> Tournament:
 
 def get_tournaments_by_group(group_key: str):
     """グループ内の大会一覧を取得"""
-    link, group = _require_group(group_key)
-    if not group:
-        raise ServiceNotFoundError("指定されたグループが見つかりません。")
-    _ensure_access(link, AccessLevel.VIEW, "大会を閲覧する権限がありません。")
+    link, group = require_resource(
+        group_key,
+        "group",
+        Group,
+        AccessLevel.VIEW,
+        invalid_message="group_keyが無効です。",
+        forbidden_message="大会を閲覧する権限がありません。",
+    )
     tournaments = (
         db.session.query(Tournament)
         .filter(Tournament.group_id == group.id)
@@ -106,7 +86,7 @@ def get_tournaments_by_group(group_key: str):
 
 def get_tournament_by_key(short_key: str) -> Tournament:
     """大会共有キーから大会取得"""
-    link, tournament = _require_tournament(short_key)
+    link, tournament = require_resource(short_key, "tournament", Tournament)
     tournament.current_user_access = link.access_level
     # ✅ 親グループにも同じアクセス権を適用
     if tournament.group:
@@ -116,8 +96,13 @@ def get_tournament_by_key(short_key: str) -> Tournament:
 
 def update_tournament(short_key: str, data: dict) -> Tournament:
     """大会共有キーから大会更新"""
-    link, tournament = _require_tournament(short_key)
-    _ensure_access(link, AccessLevel.EDIT, "大会を更新する権限がありません。")
+    link, tournament = require_resource(
+        short_key,
+        "tournament",
+        Tournament,
+        AccessLevel.EDIT,
+        forbidden_message="大会を更新する権限がありません。",
+    )
 
     if "name" in data:
         tournament.name = data["name"]
@@ -125,6 +110,7 @@ def update_tournament(short_key: str, data: dict) -> Tournament:
         tournament.description = data["description"]
     if "rate" in data:
         tournament.rate = data["rate"]
+        refresh_tournament_balance(tournament)
     if "started_at" in data:
         tournament.started_at = data["started_at"]
 
@@ -134,25 +120,69 @@ def update_tournament(short_key: str, data: dict) -> Tournament:
     return tournament
 
 
+def _deletable_chip_table_ids(tournament_id: int) -> list[int]:
+    """
+    削除してよい卓（CHIP卓で0以外のスコアを持たないもの）のIDを1クエリで返す。
+    対局がない卓も NOT EXISTS が真になるため削除対象になる。
+    """
+    has_nonzero_score = (
+        select(Score.id)
+        .join(Game, Game.id == Score.game_id)
+        .where(Game.table_id == Table.id, Score.score != 0)
+        .exists()
+    )
+    return db.session.scalars(
+        select(Table.id).where(
+            Table.tournament_id == tournament_id,
+            Table.type == TableTypeEnum.CHIP,
+            ~has_nonzero_score,
+        )
+    ).all()
+
+
+def _bulk_delete(model, criteria) -> int:
+    return db.session.execute(
+        delete(model).where(criteria),
+        execution_options={"synchronize_session": False},
+    ).rowcount
+
+
 def delete_tournament(short_key: str) -> None:
     """大会共有キーから大会削除"""
-    link, tournament = _require_tournament(short_key)
-    _ensure_access(link, AccessLevel.EDIT, "大会を削除する権限がありません。")
+    _, tournament = require_resource(
+        short_key,
+        "tournament",
+        Tournament,
+        AccessLevel.EDIT,
+        forbidden_message="大会を削除する権限がありません。",
+    )
     try:
-        # CHIP卓は全員のスコアが0ならデータなしとして扱う。
-        # 対局がない卓も all() の空真により削除対象になる。
-        empty_chip_tables = [
-            table
-            for table in tournament.tables
-            if table.type == TableTypeEnum.CHIP
-            and all(score.score == 0 for game in table.games for score in game.scores)
-        ]
-        for table in empty_chip_tables:
-            for game in table.games:
-                db.session.delete(game)
-            db.session.delete(table)
-
-        db.session.delete(tournament)
+        table_ids = _deletable_chip_table_ids(tournament.id)
+        if db.session.scalar(
+            select(
+                exists().where(
+                    Table.tournament_id == tournament.id, Table.id.not_in(table_ids)
+                )
+            )
+        ):
+            raise ServiceValidationError(
+                "この大会には関連データが存在するため削除できません。"
+            )
+
+        # --- 空のCHIP卓と大会を一括削除（対局数によらず固定回数のSQL） ---
+        game_ids = select(Game.id).where(Game.table_id.in_(table_ids))
+        _bulk_delete(Score, Score.game_id.in_(game_ids))
+        _bulk_delete(Game, Game.table_id.in_(table_ids))
+        _bulk_delete(TablePlayer, TablePlayer.table_id.in_(table_ids))
+        _bulk_delete(Table, Table.id.in_(table_ids))
+        _bulk_delete(TournamentPlayer, TournamentPlayer.tournament_id == tournament.id)
+        _bulk_delete(
+            PlayerStatsRollup, PlayerStatsRollup.tournament_id == tournament.id
+        )
+        delete_share_links("table", table_ids)
+        delete_share_links("tournament", [tournament.id])
+        _bulk_delete(Tournament, Tournament.id == tournament.id)
+        mark_group_touched(db.session, "group", tournament.group_id)
         db.session.commit()
     except IntegrityError:
         db.session.rollback()
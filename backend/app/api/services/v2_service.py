@@ -2,7 +2,12 @@
 
 import hashlib
 import json
-from datetime import datetime, timezone
+import zlib
+from datetime import datetime, timedelta, timezone
+
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import Integer, cast, func, insert
+from sqlalchemy.exc import IntegrityError
 
 from app import db
 from app.models import (
@@ -19,10 +24,18 @@ from app.models import (
     TableTypeEnum,
     Tournament,
     TournamentPlayer,
+    group_touch_min_interval,
+)
+from app.utils.game_utils import insert_games, load_games_with_scores, rank_scores
+from app.utils.player_stats_utils import apply_game_scores, rebuild_player_stats
+from app.utils.share_link_utils import (
+    ACCESS_PRIORITY,
+    create_share_links,
+    delete_share_links,
+    get_share_link_by_key,
+    has_access,
+    resolve_share_link,
 )
-from app.utils.share_link_utils import create_unique_share_link, get_share_link_by_key
-
-ACCESS_PRIORITY = {AccessLevel.VIEW: 1, AccessLevel.EDIT: 2, AccessLevel.OWNER: 3}
 
 
 class V2Error(Exception):
@@ -35,41 +48,71 @@ class V2Error(Exception):
 
 
 def _require(key, resource_type, model, access=AccessLevel.VIEW):
-    link = get_share_link_by_key(key)
+    link, resource = resolve_share_link(key, resource_type, model)
     if not link or link.resource_type != resource_type:
         raise V2Error(404, "RESOURCE_NOT_FOUND", "Resource was not found")
-    if ACCESS_PRIORITY[link.access_level] < ACCESS_PRIORITY[access]:
+    if not has_access(link, access):
         raise V2Error(403, "FORBIDDEN", "Insufficient access")
-    resource = db.session.get(model, link.resource_id)
     if not resource:
         raise V2Error(404, "RESOURCE_NOT_FOUND", "Resource was not found")
     return link, resource
 
 
-def _links(resource_type, resource_id, created_by):
-    result = {}
-    for level in (AccessLevel.OWNER, AccessLevel.EDIT, AccessLevel.VIEW):
-        result[level.value.lower() + "_link"] = create_unique_share_link(
-            resource_type, resource_id, created_by, level
-        ).short_key
-    return result
+def _create_links(resources):
+    """作成直後のリソースの共有リンクを一括作成し、メモに登録する"""
+    levels = (AccessLevel.OWNER, AccessLevel.EDIT, AccessLevel.VIEW)
+    memo = _link_memo()
+    for key, links in create_share_links(resources, levels).items():
+        memo[key] = [(links[level], level) for level in levels]
 
 
-def _resource_links(resource_type, resource_id, access_level=None):
+def _link_memo():
+    """リクエスト単位の共有リンクメモ（リクエスト外ではアプリコンテキスト単位）"""
+    scope = request._get_current_object() if has_request_context() else None
+    if g.get("v2_share_links_scope") is not scope:
+        g.v2_share_links_scope = scope
+        g.v2_share_links = {}
+    return g.v2_share_links
+
+
+def _prefetch_links(resource_type, resource_ids):
+    """同一種別の複数リソースの共有リンクを1回の IN クエリで取得してメモ化"""
+    memo = _link_memo()
+    missing = {
+        resource_id
+        for resource_id in resource_ids
+        if (resource_type, resource_id) not in memo
+    }
+    if not missing:
+        return
+    for resource_id in missing:
+        memo[(resource_type, resource_id)] = []
     links = (
-        ShareLink.query.filter_by(resource_type=resource_type, resource_id=resource_id)
+        ShareLink.query.filter(
+            ShareLink.resource_type == resource_type,
+            ShareLink.resource_id.in_(missing),
+        )
         .order_by(ShareLink.id)
         .all()
     )
+    for link in links:
+        memo[(resource_type, link.resource_id)].append(
+            (link.short_key, link.access_level)
+        )
+
+
+def _resource_links(resource_type, resource_id, access_level=None):
+    _prefetch_links(resource_type, [resource_id])
+    links = _link_memo()[(resource_type, resource_id)]
     if access_level is not None:
         links = [
-            link
-            for link in links
-            if (ACCESS_PRIORITY[link.access_level] <= ACCESS_PRIORITY[access_level])
+            (short_key, level)
+            for short_key, level in links
+            if ACCESS_PRIORITY[level] <= ACCESS_PRIORITY[access_level]
         ]
     return [
-        {"short_key": link.short_key, "access_level": link.access_level.value}
-        for link in links
+        {"short_key": short_key, "access_level": level.value}
+        for short_key, level in links
     ]
 
 
@@ -105,6 +148,17 @@ def _tournament(tournament, access_level):
     }
 
 
+def _game(game, scores):
+    return {
+        "id": game.id,
+        "table_id": game.table_id,
+        "game_index": game.game_index,
+        "memo": game.memo,
+        "played_at": game.played_at.isoformat() if game.played_at else None,
+        "scores": [{"player_id": s.player_id, "score": s.score} for s in scores],
+    }
+
+
 def _group(group, access_level):
     return {
         "id": group.id,
@@ -121,6 +175,26 @@ def _hash(payload):
     ).hexdigest()
 
 
+def _idempotency_cutoff():
+    hours = float(current_app.config.get("IDEMPOTENCY_RETENTION_HOURS", 48))
+    return datetime.now(timezone.utc) - timedelta(hours=hours)
+
+
+def _pack_body(body):
+    """閾値以上のレスポンスは zlib 圧縮する。戻り値: (response_body, compressed)"""
+    threshold = int(current_app.config.get("IDEMPOTENCY_COMPRESS_THRESHOLD", 2048))
+    encoded = json.dumps(body, separators=(",", ":"), ensure_ascii=False).encode()
+    if len(encoded) < threshold:
+        return body, None
+    return None, zlib.compress(encoded)
+
+
+def _unpack_body(response_body, compressed):
+    if compressed is not None:
+        return json.loads(zlib.decompress(compressed))
+    return response_body
+
+
 def _replay(scope, key, payload):
     if key and len(key) > 255:
         raise V2Error(
@@ -128,16 +202,39 @@ def _replay(scope, key, payload):
         )
     if not key:
         return None
-    record = IdempotencyRecord.query.filter_by(scope=scope, idempotency_key=key).first()
+    record = (
+        db.session.query(
+            IdempotencyRecord.id,
+            IdempotencyRecord.request_hash,
+            IdempotencyRecord.status_code,
+            IdempotencyRecord.response_body,
+            IdempotencyRecord.response_body_compressed,
+            IdempotencyRecord.created_at,
+        )
+        .filter_by(scope=scope, idempotency_key=key)
+        .first()
+    )
     if not record:
         return None
+    created_at = record.created_at
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    if created_at < _idempotency_cutoff():
+        # 保持期間切れ（未パージ）のレコードは破棄して新規リクエストとして扱う
+        IdempotencyRecord.query.filter_by(id=record.id).delete(
+            synchronize_session=False
+        )
+        return None
     if record.request_hash != _hash(payload):
         raise V2Error(
             409,
             "IDEMPOTENCY_KEY_REUSED",
             "Idempotency-Key was used with a different request",
         )
-    return record.response_body, record.status_code
+    return (
+        _unpack_body(record.response_body, record.response_body_compressed),
+        record.status_code,
+    )
 
 
 def _remember(scope, key, payload, body, status):
@@ -146,17 +243,50 @@ def _remember(scope, key, payload, body, status):
             400, "VALIDATION_ERROR", "Idempotency-Key must be at most 255 characters"
         )
     if key:
+        response_body, compressed = _pack_body(body)
         db.session.add(
             IdempotencyRecord(
                 scope=scope,
                 idempotency_key=key,
                 request_hash=_hash(payload),
-                response_body=body,
+                response_body=response_body,
+                response_body_compressed=compressed,
                 status_code=status,
             )
         )
 
 
+def purge_idempotency_records(batch_size=None):
+    """
+    保持期間を過ぎた冪等性レコードをチャンク単位で削除する。
+    チャンクごとに commit するため、長時間のロックを取らない。
+
+    Returns:
+        int: 削除件数
+    """
+    batch_size = batch_size or int(
+        current_app.config.get("IDEMPOTENCY_PURGE_BATCH_SIZE", 1000)
+    )
+    cutoff = _idempotency_cutoff()
+    deleted = 0
+    while True:
+        ids = [
+            row.id
+            for row in db.session.query(IdempotencyRecord.id)
+            .filter(IdempotencyRecord.created_at < cutoff)
+            .order_by(IdempotencyRecord.id)
+            .limit(batch_size)
+        ]
+        if not ids:
+            return deleted
+        deleted += IdempotencyRecord.query.filter(IdempotencyRecord.id.in_(ids)).delete(
+            synchronize_session=False
+        )
+        db.session.commit()
+        if len(ids) < batch_size:
+            return deleted
+
+
 def create_tournament_with_tables(group_key, payload, idempotency_key=None):
     scope = f"create-tournament:{group_key}"
     replay = _replay(scope, idempotency_key, payload)
@@ -187,8 +317,7 @@ def create_tournament_with_tables(group_key, payload, idempotency_key=None):
         )
         db.session.add(tournament)
         db.session.flush()
-        _links("tournament", tournament.id, tournament.created_by)
-        created = []
+        tables = []
         for item in initial_tables:
             try:
                 table_type = TableTypeEnum(item.get("type", "NORMAL"))
@@ -196,24 +325,25 @@ def create_tournament_with_tables(group_key, payload, idempotency_key=None):
                 raise V2Error(
                     400, "VALIDATION_ERROR", "type must be NORMAL or CHIP"
                 ) from exc
-            table = Table(
-                tournament_id=tournament.id,
-                name=item["name"],
-                type=table_type,
-                created_by=tournament.created_by,
-                created_at=datetime.now(timezone.utc),
-            )
-            db.session.add(table)
-            db.session.flush()
-            _links("table", table.id, table.created_by)
-            db.session.flush()
-            created.append(
-                {
-                    "client_id": item["client_id"],
-                    "table": _table(table, link.access_level),
-                }
+            tables.append(
+                Table(
+                    tournament_id=tournament.id,
+                    name=item["name"],
+                    type=table_type,
+                    created_by=tournament.created_by,
+                    created_at=datetime.now(timezone.utc),
+                )
             )
+        db.session.add_all(tables)
         db.session.flush()
+        _create_links(
+            [("tournament", tournament.id, tournament.created_by)]
+            + [("table", table.id, table.created_by) for table in tables]
+        )
+        created = [
+            {"client_id": item["client_id"], "table": _table(table, link.access_level)}
+            for item, table in zip(initial_tables, tables)
+        ]
         body = {
             "tournament": _tournament(tournament, link.access_level),
             "created_tables": created,
@@ -291,6 +421,98 @@ def batch_add_participants(tournament_key, payload, idempotency_key=None):
         raise
 
 
+def batch_create_games(table_key, payload, idempotency_key=None):
+    scope = f"batch-create-games:{table_key}"
+    replay = _replay(scope, idempotency_key, payload)
+    if replay:
+        return replay
+    _, table = _require(table_key, "table", Table, AccessLevel.EDIT)
+    items = payload.get("games", [])
+    client_ids = [item.get("client_id") for item in items]
+    if not items or None in client_ids or len(client_ids) != len(set(client_ids)):
+        raise V2Error(
+            400, "VALIDATION_ERROR", "games must contain unique client_id values"
+        )
+
+    # --- 全ゲームをDBへ書き込む前にメモリ上で検証 ---
+    seated = {
+        row.player_id for row in TablePlayer.query.filter_by(table_id=table.id).all()
+    }
+    invalid = []
+    for item in items:
+        scores = item.get("scores") or []
+        player_ids = [s.get("player_id") for s in scores]
+        if not scores or None in player_ids or len(player_ids) != len(set(player_ids)):
+            reason = "scores must contain unique player_id values"
+        elif not set(player_ids) <= seated:
+            reason = "all players must be registered to the table"
+        elif table.type == TableTypeEnum.NORMAL and sum(
+            s.get("score", 0) for s in scores
+        ):
+            reason = "scores of a NORMAL table must sum to zero"
+        else:
+            continue
+        invalid.append({"client_id": item["client_id"], "reason": reason})
+    if invalid:
+        raise V2Error(
+            400, "INVALID_GAMES", "One or more games are invalid", {"games": invalid}
+        )
+
+    try:
+        created_by = table.created_by or "anonymous"
+        try:
+            games = insert_games(
+                table.id,
+                [
+                    {"memo": item.get("memo"), "created_by": created_by}
+                    for item in items
+                ],
+            )
+        except IntegrityError as exc:
+            raise V2Error(
+                409, "GAME_INDEX_CONFLICT", "Could not allocate game indexes"
+            ) from exc
+        game_scores = [
+            [
+                Score(
+                    game_id=game.id,
+                    player_id=s["player_id"],
+                    score=s["score"],
+                    rank=s["rank"],
+                )
+                for s in rank_scores(item["scores"])
+            ]
+            for game, item in zip(games, items)
+        ]
+        all_scores = [score for scores in game_scores for score in scores]
+        db.session.execute(
+            insert(Score),
+            [
+                {
+                    "game_id": score.game_id,
+                    "player_id": score.player_id,
+                    "score": score.score,
+                    "rank": score.rank,
+                }
+                for score in all_scores
+            ],
+        )
+        apply_game_scores(table, all_scores)
+        body = {
+            "table_id": table.id,
+            "created_games": [
+                {"client_id": item["client_id"], "game": _game(game, scores)}
+                for item, game, scores in zip(items, games, game_scores)
+            ],
+        }
+        _remember(scope, idempotency_key, payload, body, 201)
+        db.session.commit()
+        return body, 201
+    except Exception:
+        db.session.rollback()
+        raise
+
+
 def delete_participant(tournament_key, player_id, idempotency_key=None):
     payload = {"player_id": player_id}
     scope = f"delete-participant:{tournament_key}:{player_id}"
@@ -367,10 +589,11 @@ def cascade_delete_table(table_key, idempotency_key=None):
             )
         Game.query.filter_by(table_id=table.id).delete(synchronize_session=False)
         TablePlayer.query.filter_by(table_id=table.id).delete(synchronize_session=False)
-        ShareLink.query.filter_by(resource_type="table", resource_id=table.id).delete(
-            synchronize_session=False
-        )
+        delete_share_links("table", [table.id])
+        tournament_id = table.tournament_id
         db.session.delete(table)
+        if score_count:
+            rebuild_player_stats([tournament_id])
         body = {
             "deleted": {
                 "table_id": table_id,
@@ -400,6 +623,10 @@ def batch_get_groups(payload):
         link.short_key: link
         for link in ShareLink.query.filter(ShareLink.short_key.in_(keys)).all()
     }
+    _prefetch_links(
+        "group",
+        [link.resource_id for link in links.values() if link.resource_type == "group"],
+    )
     results = []
     for item in items:
         link = links.get(item["group_key"])
@@ -421,6 +648,50 @@ def batch_get_groups(payload):
     return {"results": results}
 
 
+def dashboard_etag(key, resource_type):
+    """
+    ダッシュボード用の検証子を返す。
+
+    共有リンク（キャッシュ済み）とグループの版番号だけで算出するため、
+    ダッシュボード本体を組み立てる前に 304 を判定できる。
+    キーが無効な場合は None を返し、通常のエラー処理に任せる。
+    """
+    link = get_share_link_by_key(key)
+    if not link or link.resource_type != resource_type:
+        return None
+    query = db.session.query(Group.id, Group.revision, Group.last_updated_at)
+    if resource_type == "group":
+        query = query.filter(Group.id == link.resource_id)
+    elif resource_type == "tournament":
+        query = query.join(Tournament, Tournament.group_id == Group.id).filter(
+            Tournament.id == link.resource_id
+        )
+    else:
+        query = (
+            query.join(Tournament, Tournament.group_id == Group.id)
+            .join(Table, Table.tournament_id == Tournament.id)
+            .filter(Table.id == link.resource_id)
+        )
+    row = query.first()
+    if not row:
+        return None
+    interval = group_touch_min_interval()
+    if interval > 0 and row.last_updated_at:
+        # 間引き期間中は revision が進まない更新があり得るため検証子を出さない
+        updated_at = row.last_updated_at
+        if updated_at.tzinfo is None:
+            updated_at = updated_at.replace(tzinfo=timezone.utc)
+        if datetime.now(timezone.utc) - updated_at < timedelta(seconds=interval):
+            return None
+    return _hash(
+        {
+            "resource": [resource_type, link.resource_id],
+            "access_level": link.access_level.value,
+            "group": [row.id, row.revision],
+        }
+    )[:32]
+
+
 def group_dashboard(group_key):
     link, group = _require(group_key, "group", Group)
     tournaments = (
@@ -428,6 +699,7 @@ def group_dashboard(group_key):
         .order_by(Tournament.created_at.desc())
         .all()
     )
+    _prefetch_links("tournament", [t.id for t in tournaments])
     return {
         "group": _group(group, link.access_level),
         "tournaments": [_tournament(t, link.access_level) for t in tournaments],
@@ -438,11 +710,14 @@ def group_dashboard(group_key):
 
 
 def _score_map(tournament, access_level):
-    tables = Table.query.filter_by(tournament_id=tournament.id).all()
-    participants = [
-        row.player
-        for row in TournamentPlayer.query.filter_by(tournament_id=tournament.id).all()
-    ]
+    tables = Table.query.filter_by(tournament_id=tournament.id).order_by(Table.id).all()
+    _prefetch_links("table", [t.id for t in tables])
+    participants = (
+        Player.query.join(TournamentPlayer, TournamentPlayer.player_id == Player.id)
+        .filter(TournamentPlayer.tournament_id == tournament.id)
+        .order_by(TournamentPlayer.id)
+        .all()
+    )
     values = {
         p.id: {
             "id": p.id,
@@ -453,12 +728,24 @@ def _score_map(tournament, access_level):
         }
         for p in participants
     }
-    for table in tables:
-        for game in Game.query.filter_by(table_id=table.id).all():
-            for score in Score.query.filter_by(game_id=game.id).all():
-                if score.player_id in values:
-                    scores = values[score.player_id]["scores"]
-                    scores[str(table.id)] = scores.get(str(table.id), 0) + score.score
+    # 卓×プレイヤー単位の合計を1回の集計クエリで取得
+    # （MySQL の SUM は Decimal を返すため整数に揃える）
+    totals = (
+        db.session.query(
+            Score.player_id,
+            Game.table_id,
+            cast(func.sum(Score.score), Integer).label("score"),
+        )
+        .join(Game, Game.id == Score.game_id)
+        .join(Table, Table.id == Game.table_id)
+        .filter(Table.tournament_id == tournament.id)
+        .group_by(Score.player_id, Game.table_id)
+        .order_by(Game.table_id)
+        .all()
+    )
+    for row in totals:
+        if row.player_id in values:
+            values[row.player_id]["scores"][str(row.table_id)] = row.score
     rate = tournament.rate if tournament.rate is not None else 0.001
     for value in values.values():
         value["total"] = sum(value["scores"].values())
@@ -486,16 +773,15 @@ def tournament_dashboard(tournament_key):
         if participant_ids
         else Player.query.filter_by(group_id=tournament.group_id).all()
     )
+    tables = Table.query.filter_by(tournament_id=tournament.id).all()
+    _prefetch_links("table", [t.id for t in tables])
     value = _tournament(tournament, link.access_level)
     return {
         "parent": {"group": {"id": group.id, "name": group.name}},
         "tournament": value,
         "participants": [_player(p) for p in participants],
         "available_group_players": [_player(p) for p in available],
-        "tables": [
-            _table(t, link.access_level)
-            for t in Table.query.filter_by(tournament_id=tournament.id).all()
-        ],
+        "tables": [_table(t, link.access_level) for t in tables],
         "score_map": _score_map(tournament, link.access_level),
     }
 
@@ -518,21 +804,10 @@ def table_dashboard(table_key):
     available = (
         Player.query.filter(Player.id.in_(available_ids)).all() if available_ids else []
     )
-    games = []
-    for game in Game.query.filter_by(table_id=table.id).order_by(Game.game_index).all():
-        games.append(
-            {
-                "id": game.id,
-                "table_id": table.id,
-                "game_index": game.game_index,
-                "memo": game.memo,
-                "played_at": game.played_at.isoformat() if game.played_at else None,
-                "scores": [
-                    {"player_id": s.player_id, "score": s.score}
-                    for s in Score.query.filter_by(game_id=game.id).all()
-                ],
-            }
-        )
+    games = [
+        _game(game, scores)
+        for game, scores in load_games_with_scores(table.id, Game.game_index)
+    ]
     return {
         "parent": {
             "tournament": {"id": tournament.id, "name": tournament.name},
@@ -17,8 +17,11 @@ else:
 
 
 def make_celery():
-    """Flaskに依存しないCeleryインスタンスを作成"""
-    celery = Celery(__name__)
+    """Celeryインスタンスを作成（タスクは FlaskTask 上で実行する）"""
+    # .env の読み込み後にアプリ側のモジュールを import する
+    from app.tasks.base import FlaskTask
+
+    celery = Celery(__name__, task_cls=FlaskTask)
     # .envから直接取得
     celery.conf.broker_url = os.getenv("CELERY_BROKER_URL", "redis://redis:6379/0")
     celery.conf.result_backend = os.getenv(
@@ -34,6 +37,7 @@ def make_celery():
     # ---- 明示的にインポート（確実に登録させる） ----
     celery.conf.imports = (
         "app.tasks.email_tasks",
+        "app.tasks.export_tasks",
         "app.tasks.maintenance_task",
     )
     # 🔸 Celery Beat スケジュール定義
@@ -42,6 +46,14 @@ def make_celery():
             "task": "app.tasks.maintenance_task.delete_expired_group_tokens",
             "schedule": timedelta(minutes=5),
         },
+        "purge-expired-idempotency-records-hourly": {
+            "task": "app.tasks.maintenance_task.purge_expired_idempotency_records",
+            "schedule": timedelta(hours=1),
+        },
+        "purge-expired-export-files-hourly": {
+            "task": "app.tasks.maintenance_task.purge_expired_export_files",
+            "schedule": timedelta(hours=1),
+        },
         "nightly-summary-at-midnight": {
             "task": "app.tasks.maintenance_task.generate_daily_summary",
             "schedule": timedelta(hours=24),
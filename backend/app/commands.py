@@ -0,0 +1,30 @@
+# app/commands.py
+import click
+
+from app import db
+from app.api.services.contact_service import ContactService
+from app.utils.player_stats_utils import rebuild_player_stats
+
+
+def register_commands(app):
+    """Flask CLI コマンドを登録"""
+
+    @app.cli.command("rebuild-player-stats")
+    @click.option(
+        "--tournament-id",
+        "tournament_ids",
+        type=int,
+        multiple=True,
+        help="再構築する大会ID（複数指定可）。省略時は全件を再構築する。",
+    )
+    def rebuild_player_stats_command(tournament_ids):
+        """成績統計ロールアップを Score から作り直す"""
+        count = rebuild_player_stats(list(tournament_ids) or None)
+        db.session.commit()
+        click.echo(f"player stats rollup rebuilt: {count} rows")
+
+    @app.cli.command("reindex-contact-search")
+    def reindex_contact_search_command():
+        """お問い合わせ検索用の転置インデックスを全件作り直す"""
+        count = ContactService.reindex_all()
+        click.echo(f"contact search index rebuilt: {count} contacts")
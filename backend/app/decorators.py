@@ -1,7 +1,11 @@
 from functools import wraps
 
+from flask import Response, request
+from werkzeug.http import quote_etag
+
 from app.api.schemas.common_schemas import ErrorResponseSchema
 from app.api.schemas.v2_schema import V2ErrorSchema
+from app.api.services.v2_service import dashboard_etag
 
 
 def with_common_error_responses(bp):
@@ -65,3 +69,31 @@ def with_v2_error_responses(bp):
         return wraps(func)(wrapped)
 
     return decorator
+
+
+def with_v2_etag(bp, resource_type):
+    """
+    V2ダッシュボードの条件付きGET（ETag / If-None-Match）。
+
+    グループの版番号から求めた検証子が If-None-Match と一致すれば、
+    ダッシュボードを組み立てずに 304 を返す。
+    """
+
+    def decorator(func):
+        @bp.alt_response(304, description="Not Modified")
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            etag = dashboard_etag(kwargs[f"{resource_type}_key"], resource_type)
+            if etag is None:
+                return func(*args, **kwargs)
+            headers = {
+                "ETag": quote_etag(etag, weak=True),
+                "Cache-Control": "private, no-cache",
+            }
+            if request.if_none_match.contains_weak(etag):
+                return Response(status=304, headers=headers)
+            return func(*args, **kwargs), 200, headers
+
+        return wrapper
+
+    return decorator
@@ -1,3 +1,4 @@
+from flask import current_app, request
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 from flask_login import LoginManager
@@ -24,8 +25,25 @@ def set_sqlite_pragma(dbapi_connection, connection_record):
         pass  # 他のDB（PostgreSQLなど）では何もしない
 
 
+def _is_read_limited_request() -> bool:
+    """RATELIMIT_READ_BLUEPRINTS に含まれる Blueprint への参照リクエストか"""
+    return request.method in ("GET", "HEAD") and request.blueprint in (
+        current_app.config.get("RATELIMIT_READ_BLUEPRINTS") or ()
+    )
+
+
+# 更新系・旧APIの制限（既定は moving-window。RATELIMIT_STRATEGY で変更可）
 limiter = Limiter(
     key_func=get_remote_address,
-    storage_uri="memory://",
     default_limits=["200 per hour"],  # ← 全APIのデフォルト制限
+    default_limits_exempt_when=_is_read_limited_request,
+)
+
+# 参照系 V2 エンドポイントの制限（キーごとに1カウンターで済む fixed-window）
+read_limiter = Limiter(
+    key_func=get_remote_address,
+    strategy="fixed-window",
+    key_prefix="read",
+    default_limits=[lambda: current_app.config["RATELIMIT_READ_LIMIT"]],
+    default_limits_exempt_when=lambda: not _is_read_limited_request(),
 )
@@ -6,6 +6,7 @@
     SMTP_HOST, SMTP_PORT, SMTP_USERNAME, SMTP_PASSWORD
     MAIL_FROM, MAIL_REPLY_TO, MAIL_RETURN_PATH
     SMTP_TIMEOUT
+    SMTP_POOL_SIZE, SMTP_POOL_MAX_IDLE, SMTP_POOL_NOOP_AFTER
 - 使い方：
     from app.util.mailer import MailMessage, send_email
     send_email(MailMessage(
@@ -14,12 +15,17 @@
         sender_name="麻雀集計ScoreBoard",
         text="Hi",
     ))
+    # 複数通をプール済みの1セッションで送信
+    send_emails([msg1, msg2, ...])
 """
 
 from __future__ import annotations
 
 import os
 import smtplib
+import threading
+import time
+from contextlib import contextmanager
 from dataclasses import dataclass
 from email.header import Header
 from email.mime.multipart import MIMEMultipart
@@ -31,6 +37,13 @@ class MailSendError(Exception):
     """メール送信に失敗した場合に送出される例外。"""
 
 
+class MailPermanentError(MailSendError):
+    """
+    再送しても成功しない失敗（宛先なし・設定不備・本文のエンコード失敗・
+    SMTP 5xx 応答など）。呼び出し側は再試行しない。
+    """
+
+
 @dataclass
 class MailMessage:
     """
@@ -80,7 +93,7 @@ def _connect() -> smtplib.SMTP:
     """SMTPへ接続して、必要に応じてSTARTTLS/LOGINまで実施して返す。"""
     host = os.getenv("SMTP_HOST")
     if not host:
-        raise MailSendError("SMTP_HOST is not configured.")
+        raise MailPermanentError("SMTP_HOST is not configured.")
 
     port = int(os.getenv("SMTP_PORT", "587"))
     user = os.getenv("SMTP_USERNAME")
@@ -105,20 +118,110 @@ def _connect() -> smtplib.SMTP:
         raise MailSendError(f"SMTP connect/login failed: {e}") from e
 
 
-def send_email(msg: MailMessage) -> str:
+# =========================================================
+# 接続プール（ワーカープロセス単位）
+# =========================================================
+class SMTPConnectionPool:
     """
-    メールを送信する。
-    戻り値: provider_message_id（SMTPでは固定 'smtp:ok'）
+    ログイン済み SMTP 接続をワーカープロセス内で再利用するプール。
 
-    例外:
-        MailSendError: 接続/送信/設定不備などの失敗時
+    - 一定時間（SMTP_POOL_NOOP_AFTER 秒）以上アイドルだった接続は NOOP で
+      生存確認し、応答がなければ接続し直す
+    - SMTP_POOL_MAX_IDLE 秒を超えてアイドルだった接続は破棄する
+    - fork 後の子プロセスでは親の接続を使わない
     """
+
+    def __init__(self, size=None, max_idle=None, noop_after=None):
+        self.size = int(size if size is not None else os.getenv("SMTP_POOL_SIZE", "2"))
+        self.max_idle = float(
+            max_idle if max_idle is not None else os.getenv("SMTP_POOL_MAX_IDLE", "60")
+        )
+        self.noop_after = float(
+            noop_after
+            if noop_after is not None
+            else os.getenv("SMTP_POOL_NOOP_AFTER", "5")
+        )
+        self._idle: list[tuple[float, smtplib.SMTP]] = []
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    @contextmanager
+    def connection(self):
+        """
+        プールから接続を借りる。ブロック内で例外が起きた接続は返却せず閉じる。
+        """
+        smtp = self._acquire()
+        try:
+            yield smtp
+        except BaseException:
+            _close(smtp)
+            raise
+        self._release(smtp)
+
+    def _acquire(self) -> smtplib.SMTP:
+        while True:
+            with self._lock:
+                self._check_pid()
+                if not self._idle:
+                    break
+                released_at, smtp = self._idle.pop()
+            idle = time.monotonic() - released_at
+            if idle > self.max_idle:
+                _close(smtp)
+                continue
+            if idle < self.noop_after or _is_alive(smtp):
+                return smtp
+            _close(smtp)
+        return _connect()
+
+    def _release(self, smtp: smtplib.SMTP) -> None:
+        with self._lock:
+            self._check_pid()
+            if len(self._idle) < self.size:
+                self._idle.append((time.monotonic(), smtp))
+                return
+        _close(smtp)
+
+    def _check_pid(self) -> None:
+        if self._pid != os.getpid():
+            self._idle = []
+            self._pid = os.getpid()
+
+    def close_all(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for _, smtp in idle:
+            _close(smtp)
+
+
+def _is_alive(smtp: smtplib.SMTP) -> bool:
+    try:
+        return smtp.noop()[0] == 250
+    except (OSError, smtplib.SMTPException):
+        return False
+
+
+def _close(smtp: smtplib.SMTP) -> None:
+    try:
+        smtp.quit()
+    except (OSError, smtplib.SMTPException):
+        smtp.close()
+
+
+smtp_pool = SMTPConnectionPool()
+
+
+# =========================================================
+# 送信
+# =========================================================
+def _build_message(msg: MailMessage) -> tuple[str, list[str], str]:
+    """(envelope from, 実際の宛先, 本文) を組み立てる"""
     if not msg.to:
-        raise MailSendError("No recipients: 'to' is empty.")
+        raise MailPermanentError("No recipients: 'to' is empty.")
 
     mail_from = os.getenv("MAIL_FROM") or os.getenv("SMTP_USERNAME")
     if not mail_from:
-        raise MailSendError("MAIL_FROM or SMTP_USERNAME must be configured.")
+        raise MailPermanentError("MAIL_FROM or SMTP_USERNAME must be configured.")
     reply_to = msg.reply_to or os.getenv("MAIL_REPLY_TO")
     return_path = os.getenv("MAIL_RETURN_PATH") or mail_from
 
@@ -140,11 +243,84 @@ def send_email(msg: MailMessage) -> str:
 
     # 実際に送る宛先（Bcc含む）
     rcpt = list(msg.to) + (msg.cc or []) + (msg.bcc or [])
+    return return_path, rcpt, m.as_string()
+
+
+def _is_permanent(e: BaseException) -> bool:
+    """
+    再送しても成功しない失敗かどうか。
+    切断・接続失敗・タイムアウト・4xx 応答は一時的な失敗として扱う。
+    """
+    if isinstance(e, MailPermanentError):
+        return True
+    if isinstance(e, smtplib.SMTPRecipientsRefused):
+        return all(code >= 500 for code, _ in e.recipients.values())
+    if isinstance(e, smtplib.SMTPConnectError):
+        return False
+    if isinstance(e, smtplib.SMTPResponseException):
+        return e.smtp_code >= 500
+    # 接続・ログイン時の失敗（MailSendError）や OSError は一時的な失敗
+    # それ以外（エンコード失敗など）は再送しても結果が変わらない
+    return not isinstance(e, (MailSendError, smtplib.SMTPException, OSError))
+
+
+def _send_error(message: str, e: Exception) -> MailSendError:
+    error_cls = MailPermanentError if _is_permanent(e) else MailSendError
+    return error_cls(message)
+
+
+def send_email(msg: MailMessage) -> str:
+    """
+    メールを送信する（1通ごとに接続・切断する）。
+    戻り値: provider_message_id（SMTPでは固定 'smtp:ok'）
+
+    例外:
+        MailSendError: 接続/送信/設定不備などの失敗時
+            （再送しても成功しない場合は MailPermanentError）
+    """
+    return_path, rcpt, body = _build_message(msg)
 
     try:
         smtp = _connect()
-        smtp.sendmail(return_path, rcpt, m.as_string())
+        smtp.sendmail(return_path, rcpt, body)
         smtp.quit()
         return "smtp:ok"
     except Exception as e:
-        raise MailSendError(f"Failed to send email to {rcpt}: {e}") from e
+        raise _send_error(f"Failed to send email to {rcpt}: {e}", e) from e
+
+
+def send_emails(
+    messages: list[MailMessage], pool: SMTPConnectionPool | None = None
+) -> list[str]:
+    """
+    複数のメールをプールした1つの SMTP セッションで送信する。
+
+    送信中に接続が切れた場合は1度だけ接続し直して、未送信分から再開する。
+    戻り値: 各メッセージの provider_message_id
+
+    例外:
+        MailSendError: 接続/送信/設定不備などの失敗時（送信済み件数をメッセージに含む）
+            （再送しても成功しない場合は MailPermanentError）
+    """
+    pool = pool or smtp_pool
+    prepared = [_build_message(msg) for msg in messages]
+    sent = 0
+
+    def _send_remaining():
+        nonlocal sent
+        with pool.connection() as smtp:
+            while sent < len(prepared):
+                smtp.sendmail(*prepared[sent])
+                sent += 1
+
+    try:
+        try:
+            _send_remaining()
+        except smtplib.SMTPServerDisconnected:
+            # プール中に切断されていた接続は1度だけ張り直して続きから送る
+            _send_remaining()
+        return ["smtp:ok"] * len(prepared)
+    except Exception as e:
+        raise _send_error(
+            f"Failed to send emails ({sent}/{len(prepared)} sent): {e}", e
+        ) from e
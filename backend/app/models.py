@@ -1,8 +1,10 @@
 import uuid
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from enum import StrEnum
 
+from flask import current_app, has_app_context
 from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
 
 from app import db
 
@@ -28,6 +30,24 @@ class ContactStatus(StrEnum):
     CLOSED = "closed"  # 完了
 
 
+class ExportKind(StrEnum):
+    TOURNAMENT_SCORES = "tournament_scores"  # 大会の参加者成績
+    GROUP_SUMMARY = "group_summary"  # グループ内全大会の参加者成績
+    GAME_HISTORY = "game_history"  # グループの全対局・スコア履歴
+
+
+class ExportFormat(StrEnum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+class ExportJobStatus(StrEnum):
+    PENDING = "pending"  # 受付済み
+    RUNNING = "running"  # 生成中
+    SUCCEEDED = "succeeded"  # 完了（ダウンロード可）
+    FAILED = "failed"  # 失敗
+
+
 # =========================================================
 # グループ（最上位レイヤー）
 # =========================================================
@@ -49,6 +69,8 @@ class Group(db.Model):
         nullable=False,
         server_default=db.func.now(),
     )
+    # 配下データ更新ごとに加算（ダッシュボードETag用の版番号）
+    revision = db.Column(db.Integer, nullable=False, default=0, server_default="0")
     email = db.Column(db.String(255), nullable=True, index=True)
     # リレーション
     tournaments = db.relationship("Tournament", back_populates="group")
@@ -65,6 +87,11 @@ class Group(db.Model):
         lazy="joined",
     )
 
+    __table_args__ = (
+        # 管理画面一覧のキーセットページング（last_updated_at, id の降順）用
+        db.Index("ix_groups_last_updated_id", "last_updated_at", "id"),
+    )
+
 
 # =========================================================
 # 大会
@@ -121,6 +148,10 @@ class Table(db.Model):
     type = db.Column(
         db.Enum(TableTypeEnum), nullable=False, default=TableTypeEnum.NORMAL
     )
+    # 最後に払い出した game_index（採番カウンター）
+    last_game_index = db.Column(
+        db.Integer, nullable=False, default=0, server_default="0"
+    )
     created_by = db.Column(db.String(64), nullable=False)
     created_at = db.Column(
         db.DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
@@ -191,6 +222,9 @@ class Player(db.Model):
 # =========================================================
 class Game(db.Model):
     __tablename__ = "tbl_games"
+    __table_args__ = (
+        db.UniqueConstraint("table_id", "game_index", name="uq_games_table_game_index"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     table_id = db.Column(db.Integer, db.ForeignKey("tbl_tables.id"), nullable=False)
@@ -241,6 +275,47 @@ class TournamentPlayer(db.Model):
     player = db.relationship("Player", back_populates="tournament_participations")
 
 
+# =========================================================
+# プレイヤー成績ロールアップ（グループ×プレイヤー×大会）
+# =========================================================
+class PlayerStatsRollup(db.Model):
+    """CHIP卓を除くスコアを大会単位で集計した成績統計用のロールアップ"""
+
+    __tablename__ = "tbl_player_stats_rollups"
+
+    id = db.Column(db.Integer, primary_key=True)
+    group_id = db.Column(
+        db.Integer, db.ForeignKey("tbl_groups.id", ondelete="CASCADE"), nullable=False
+    )
+    player_id = db.Column(
+        db.Integer, db.ForeignKey("tbl_players.id", ondelete="CASCADE"), nullable=False
+    )
+    tournament_id = db.Column(
+        db.Integer,
+        db.ForeignKey("tbl_tournaments.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    game_count = db.Column(db.Integer, nullable=False, default=0)
+    rank1_count = db.Column(db.Integer, nullable=False, default=0)
+    rank2_count = db.Column(db.Integer, nullable=False, default=0)
+    rank3_count = db.Column(db.Integer, nullable=False, default=0)
+    rank4_or_lower_count = db.Column(db.Integer, nullable=False, default=0)
+    ranked_count = db.Column(db.Integer, nullable=False, default=0)  # rank登録済み数
+    rank_sum = db.Column(db.Integer, nullable=False, default=0)
+    score_sum = db.Column(db.Integer, nullable=False, default=0)
+    balance = db.Column(db.Float, nullable=False, default=0)  # score × 大会レート
+
+    __table_args__ = (
+        db.UniqueConstraint(
+            "group_id",
+            "player_id",
+            "tournament_id",
+            name="uq_player_stats_rollup_key",
+        ),
+        db.Index("ix_player_stats_rollups_tournament", "tournament_id", "player_id"),
+    )
+
+
 # =========================================================
 # 共有リンク（短縮キー方式）
 # =========================================================
@@ -261,6 +336,15 @@ class ShareLink(db.Model):
         db.DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
     )
 
+    __table_args__ = (
+        db.Index(
+            "ix_share_links_resource",
+            "resource_type",
+            "resource_id",
+            "access_level",
+        ),
+    )
+
 
 # =========================================================
 # グループ作成用トークン
@@ -284,6 +368,12 @@ class GroupCreationToken(db.Model):
         nullable=True,
     )
 
+    __table_args__ = (
+        # 作成リクエスト回数の DB 集計（レート制限のフォールバック）用
+        db.Index("ix_group_creation_tokens_ip_created", "ip_address", "created_at"),
+        db.Index("ix_group_creation_tokens_email_created", "email", "created_at"),
+    )
+
 
 class IdempotencyRecord(db.Model):
     """V2 mutation responses persisted for safe client retries."""
@@ -294,7 +384,9 @@ class IdempotencyRecord(db.Model):
     idempotency_key = db.Column(db.String(255), nullable=False)
     request_hash = db.Column(db.String(64), nullable=False)
     status_code = db.Column(db.Integer, nullable=False)
-    response_body = db.Column(db.JSON, nullable=False)
+    # 閾値未満のレスポンスは JSON のまま、以上は zlib 圧縮して保存する
+    response_body = db.Column(db.JSON, nullable=True)
+    response_body_compressed = db.Column(db.LargeBinary, nullable=True)
     created_at = db.Column(
         db.DateTime(timezone=True),
         default=lambda: datetime.now(timezone.utc),
@@ -304,9 +396,43 @@ class IdempotencyRecord(db.Model):
         db.UniqueConstraint(
             "scope", "idempotency_key", name="uq_idempotency_scope_key"
         ),
+        db.Index("ix_idempotency_records_created_at", "created_at"),
     )
 
 
+# =========================================================
+# 非同期エクスポートジョブ
+# =========================================================
+class ExportJob(db.Model):
+    """Celery で生成するエクスポートファイル（EXPORT_DIR 配下）の管理レコード"""
+
+    __tablename__ = "tbl_export_jobs"
+
+    id = db.Column(db.Integer, primary_key=True)
+    job_key = db.Column(db.String(64), unique=True, nullable=False)
+    kind = db.Column(db.String(32), nullable=False)  # ExportKind
+    format = db.Column(db.String(16), nullable=False)  # ExportFormat
+    resource_type = db.Column(db.String(32), nullable=False)  # group / tournament
+    resource_id = db.Column(db.Integer, nullable=False)
+    status = db.Column(
+        db.String(16), nullable=False, default=ExportJobStatus.PENDING
+    )  # ExportJobStatus
+    row_count = db.Column(db.Integer)
+    file_path = db.Column(db.Text)
+    error = db.Column(db.Text)
+    created_at = db.Column(
+        db.DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
+    )
+    started_at = db.Column(db.DateTime(timezone=True))
+    finished_at = db.Column(db.DateTime(timezone=True))
+    # 期限を過ぎたジョブはファイルごと削除される
+    expires_at = db.Column(db.DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (db.Index("ix_export_jobs_expires_at", "expires_at"),)
+
+
 # =========================================================
 # お問い合わせモデル
 # =========================================================
@@ -336,61 +462,164 @@ class Contact(db.Model):
         db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
     )
 
+    __table_args__ = (
+        # 管理画面一覧（ステータス絞り込み + 新しい順のキーセットページング）用
+        db.Index("ix_contacts_status_created", "status", "created_at"),
+        db.Index("ix_contacts_created_at", "created_at"),
+    )
+
+
+class ContactSearchTerm(db.Model):
+    """お問い合わせの件名・本文の転置インデックス（語 → お問い合わせ）"""
+
+    __tablename__ = "tbl_contact_search_terms"
+
+    term = db.Column(db.String(64), primary_key=True)
+    contact_id = db.Column(
+        db.Integer,
+        db.ForeignKey("tbl_contacts.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+
+    __table_args__ = (db.Index("ix_contact_search_terms_contact", "contact_id"),)
+
 
 # =========================================================
 # Groupの最終更新日時を自動更新するイベントリスナー
 # =========================================================
-def touch_group(connection, group_id: int) -> bool:
-    """Groupのlast_updated_atを現在時刻に更新"""
-    if not group_id:
-        return False
-    connection.execute(
-        db.text("UPDATE tbl_groups SET last_updated_at = :now WHERE id = :gid"),
-        {"now": datetime.now(timezone.utc), "gid": group_id},
+# 行ごとに UPDATE tbl_groups を発行せず、flush 中は親リソースのIDだけを
+# セッションに記録し、commit 直前に1回の UPDATE ... WHERE id IN (...) へまとめる。
+# 削除された行は自身の親IDを記録するため、親ごと削除されても祖先まで辿れる。
+_PENDING_TOUCHES = "pending_group_touches"
+
+
+def mark_group_touched(session, kind: str, resource_id: int | None) -> None:
+    """
+    commit 時に所属グループを touch するよう記録する。
+
+    ORM イベントを通らない一括 INSERT/UPDATE から明示的に呼び出す。
+    kind は group / tournament / table / game のいずれか。
+    """
+    if not resource_id:
+        return
+    pending = session.info.setdefault(
+        _PENDING_TOUCHES,
+        {"group": set(), "tournament": set(), "table": set(), "game": set()},
     )
-    return True
+    pending[kind].add(resource_id)
+
+
+def _mark_touched(target, kind: str, resource_id: int | None) -> None:
+    session = object_session(target)
+    if session is not None:
+        mark_group_touched(session, kind, resource_id)
+
+
+def group_touch_min_interval() -> float:
+    """同一グループへの touch を間引く最小間隔（秒）。0 なら毎回更新する"""
+    if not has_app_context():
+        return 0.0
+    return float(current_app.config.get("GROUP_TOUCH_MIN_INTERVAL", 0) or 0)
+
+
+def _resolve_group_ids(session, pending) -> set[int]:
+    """記録済みの対局・卓・大会IDを所属グループIDへ解決"""
+    group_ids = set(pending["group"])
+    table_ids = set(pending["table"])
+    tournament_ids = set(pending["tournament"])
+    if pending["game"]:
+        table_ids |= set(
+            session.scalars(
+                db.select(Game.table_id).where(Game.id.in_(pending["game"]))
+            )
+        )
+    if table_ids:
+        tournament_ids |= set(
+            session.scalars(
+                db.select(Table.tournament_id).where(Table.id.in_(table_ids))
+            )
+        )
+    if tournament_ids:
+        group_ids |= set(
+            session.scalars(
+                db.select(Tournament.group_id).where(Tournament.id.in_(tournament_ids))
+            )
+        )
+    return group_ids
+
+
+@event.listens_for(Session, "before_commit")
+def flush_group_touches(session):
+    """commit 直前に、変更のあったグループの last_updated_at / revision を一括更新"""
+    if session.in_nested_transaction():
+        # SAVEPOINT の commit では更新せず、外側のトランザクションの commit に任せる
+        return
+    if session.new or session.dirty or session.deleted:
+        session.flush()
+    pending = session.info.pop(_PENDING_TOUCHES, None)
+    if not pending:
+        return
+    group_ids = _resolve_group_ids(session, pending)
+    if not group_ids:
+        return
+    now = datetime.now(timezone.utc)
+    stmt = (
+        db.update(Group)
+        .where(Group.id.in_(sorted(group_ids)))  # ロック順を固定
+        .values(last_updated_at=now, revision=Group.revision + 1)
+    )
+    interval = group_touch_min_interval()
+    if interval > 0:
+        stmt = stmt.where(Group.last_updated_at <= now - timedelta(seconds=interval))
+    session.execute(stmt, execution_options={"synchronize_session": False})
+
+
+@event.listens_for(Session, "after_transaction_end")
+def discard_group_touches(session, transaction):
+    if transaction.parent is None:
+        session.info.pop(_PENDING_TOUCHES, None)
 
 
 # --- Groupの変更 ---
 @event.listens_for(Group, "before_update")
 def update_self_last_updated(mapper, connection, target):
-    touch_group(connection, target.id)
+    _mark_touched(target, "group", target.id)
 
 
-# --- Tournamentの変更 ---
+# --- Tournament・プレイヤーの変更 ---
 @event.listens_for(Tournament, "after_insert")
 @event.listens_for(Tournament, "after_update")
 @event.listens_for(Tournament, "after_delete")
+@event.listens_for(Player, "after_insert")
+@event.listens_for(Player, "after_update")
+@event.listens_for(Player, "after_delete")
 def update_group_on_tournament_change(mapper, connection, target):
-    touch_group(connection, target.group_id)
+    _mark_touched(target, "group", target.group_id)
 
 
-# --- Tableの変更 ---
+# --- Table・大会参加者の変更 ---
 @event.listens_for(Table, "after_insert")
 @event.listens_for(Table, "after_update")
 @event.listens_for(Table, "after_delete")
+@event.listens_for(TournamentPlayer, "after_insert")
+@event.listens_for(TournamentPlayer, "after_delete")
 def update_group_on_table_change(mapper, connection, target):
-    result = connection.execute(
-        db.text("SELECT group_id FROM tbl_tournaments WHERE id = :tid"),
-        {"tid": target.tournament_id},
-    ).fetchone()
-    if result:
-        touch_group(connection, result.group_id)
+    _mark_touched(target, "tournament", target.tournament_id)
 
 
-# --- Gameの変更 ---
+# --- Game・卓参加者の変更 ---
 @event.listens_for(Game, "after_insert")
 @event.listens_for(Game, "after_update")
 @event.listens_for(Game, "after_delete")
+@event.listens_for(TablePlayer, "after_insert")
+@event.listens_for(TablePlayer, "after_delete")
 def update_group_on_game_change(mapper, connection, target):
-    result = connection.execute(
-        db.text(
-            "SELECT tr.group_id FROM tbl_tournaments tr "
-            "JOIN tbl_tables t ON tr.id = t.tournament_id "
-            "JOIN tbl_games gm ON gm.table_id = t.id "
-            "WHERE gm.id = :gid"
-        ),
-        {"gid": target.id},
-    ).fetchone()
-    if result:
-        touch_group(connection, result.group_id)
+    _mark_touched(target, "table", target.table_id)
+
+
+# --- 対局スコアの変更 ---
+@event.listens_for(Score, "after_insert")
+@event.listens_for(Score, "after_update")
+@event.listens_for(Score, "after_delete")
+def update_group_on_score_change(mapper, connection, target):
+    _mark_touched(target, "game", target.game_id)
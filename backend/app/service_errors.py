@@ -56,6 +56,20 @@ class ServiceConflictError(ServiceError):
     error_name = "Conflict with current state or duplicated resource"
 
 
+class ServiceGoneError(ServiceError):
+    """Resource existed but is no longer available."""
+
+    status_code = 410
+    error_name = "Resource no longer available"
+
+
+class ServiceUnavailableError(ServiceError):
+    """Dependent service is temporarily unavailable."""
+
+    status_code = 503
+    error_name = "Service unavailable"
+
+
 class AdminAuthError(ServiceError):
     """Admin authentication error."""
 
@@ -0,0 +1,36 @@
+# app/tasks/base.py
+from celery import Task
+from celery.signals import worker_process_init
+from flask import has_app_context
+
+# ワーカープロセスごとに1度だけ作成する Flask アプリ
+_flask_app = None
+
+
+def get_flask_app():
+    """ワーカープロセスの Flask アプリを返す（未作成なら作成する）"""
+    global _flask_app
+    if _flask_app is None:
+        from app import create_app
+
+        _flask_app = create_app()
+    return _flask_app
+
+
+@worker_process_init.connect
+def init_worker_flask_app(**kwargs):
+    """fork 後の各ワーカープロセスでアプリ・DB接続プールを用意する"""
+    get_flask_app()
+
+
+class FlaskTask(Task):
+    """
+    タスクごとにワーカーの Flask アプリのコンテキストを push する基底クラス。
+    既にアプリコンテキストがある場合（テスト・eager 実行）はそれを使う。
+    """
+
+    def __call__(self, *args, **kwargs):
+        if has_app_context():
+            return self.run(*args, **kwargs)
+        with get_flask_app().app_context():
+            return self.run(*args, **kwargs)
@@ -1,12 +1,26 @@
 from celery import shared_task
 
-from app.mailer.send_mail import MailMessage, MailSendError, send_email
+from app.mailer.send_mail import (
+    MailMessage,
+    MailPermanentError,
+    MailSendError,
+    send_emails,
+)
 from app.tasks.render_mail import render_mail_template
 
+# 再試行間隔（秒）: 30, 60, 120, ... を上限 MAIL_RETRY_MAX_DELAY で打ち切る
+MAIL_RETRY_BASE_DELAY = 30
+MAIL_RETRY_MAX_DELAY = 600
 
-@shared_task
+
+def retry_countdown(retries: int) -> int:
+    """指数バックオフの待ち時間（秒）"""
+    return min(MAIL_RETRY_BASE_DELAY * 2**retries, MAIL_RETRY_MAX_DELAY)
+
+
+@shared_task(bind=True, max_retries=5)
 def send_group_creation_email_task(
-    email: str, url: str, group_name: str, expires_at: str
+    self, email: str, url: str, group_name: str, expires_at: str
 ):
     print("send_group_creation_email_task")
     """Celeryジョブ: グループ作成メール送信"""
@@ -28,8 +42,12 @@ def send_group_creation_email_task(
         html=html_body,
     )
     try:
-        mid = send_email(mail_message)
+        (mid,) = send_emails([mail_message])
         print("OK:", mid)
+    except MailPermanentError as e:
+        # 宛先不正・SMTP 5xx などは再送しても成功しないため再試行しない
+        print("ERROR (permanent):", e)
+        raise
     except MailSendError as e:
         print("ERROR:", e)
-        raise SystemExit(1)
+        raise self.retry(exc=e, countdown=retry_countdown(self.request.retries))
@@ -0,0 +1,10 @@
+from celery import shared_task
+
+
+@shared_task(name="app.tasks.export_tasks.run_export_job_task")
+def run_export_job_task(job_key: str):
+    """Celeryジョブ: エクスポートファイルを生成して EXPORT_DIR に保存"""
+    # サービス層がこのタスクを import するため、循環を避けて実行時に読み込む
+    from app.api.services.export_job_service import run_export_job
+
+    return run_export_job(job_key)
@@ -3,9 +3,14 @@ from __future__ import annotations
 from datetime import datetime, timedelta, timezone
 
 from celery import shared_task
+from flask import current_app
 from sqlalchemy import and_, func
 
-from app import create_app
+from app.api.services.export_job_service import (
+    fail_stale_export_jobs,
+    purge_expired_export_jobs,
+)
+from app.api.services.v2_service import purge_idempotency_records
 from app.extensions import db
 from app.models import GroupCreationToken
 
@@ -21,31 +26,84 @@ def delete_expired_group_tokens(self):
     期限切れで未使用のグループ作成トークンを削除する。
     Beat: 5分おき
     """
-    app = create_app()
-    with app.app_context():
-        now = datetime.now(timezone.utc)
-        try:
-            q = db.session.query(GroupCreationToken).filter(
-                and_(
-                    GroupCreationToken.is_used.is_(False),
-                    GroupCreationToken.expires_at <= now,
-                )
+    now = datetime.now(timezone.utc)
+    try:
+        q = db.session.query(GroupCreationToken).filter(
+            and_(
+                GroupCreationToken.is_used.is_(False),
+                GroupCreationToken.expires_at <= now,
             )
-            to_delete = q.count()
-            # まとめてDELETE
-            q.delete(synchronize_session=False)
-            db.session.commit()
+        )
+        to_delete = q.count()
+        # まとめてDELETE
+        q.delete(synchronize_session=False)
+        db.session.commit()
 
-            app.logger.info(
-                "[Maintenance] Deleted %s expired group tokens at %s",
-                to_delete,
-                now.isoformat(),
-            )
-            return {"deleted": to_delete, "now": now.isoformat()}
-        except Exception as e:
-            db.session.rollback()
-            app.logger.exception("[Maintenance] Failed to delete expired group tokens")
-            raise self.retry(exc=e)
+        current_app.logger.info(
+            "[Maintenance] Deleted %s expired group tokens at %s",
+            to_delete,
+            now.isoformat(),
+        )
+        return {"deleted": to_delete, "now": now.isoformat()}
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.exception(
+            "[Maintenance] Failed to delete expired group tokens"
+        )
+        raise self.retry(exc=e)
+
+
+@shared_task(
+    bind=True,
+    name="app.tasks.maintenance_task.purge_expired_idempotency_records",
+    max_retries=3,
+    default_retry_delay=30,  # 秒
+)
+def purge_expired_idempotency_records(self):
+    """
+    保持期間（IDEMPOTENCY_RETENTION_HOURS）を過ぎた V2 冪等性レコードを
+    チャンク単位で削除する。
+    Beat: 1時間おき
+    """
+    try:
+        deleted = purge_idempotency_records()
+        current_app.logger.info(
+            "[Maintenance] Purged %s expired idempotency records", deleted
+        )
+        return {"deleted": deleted}
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.exception(
+            "[Maintenance] Failed to purge expired idempotency records"
+        )
+        raise self.retry(exc=e)
+
+
+@shared_task(
+    bind=True,
+    name="app.tasks.maintenance_task.purge_expired_export_files",
+    max_retries=3,
+    default_retry_delay=30,  # 秒
+)
+def purge_expired_export_files(self):
+    """
+    生成が止まった RUNNING のジョブを失敗にし、有効期限
+    （EXPORT_JOB_TTL_HOURS）を過ぎたエクスポートジョブと出力ファイルを削除する。
+    Beat: 1時間おき
+    """
+    try:
+        failed = fail_stale_export_jobs()
+        deleted = purge_expired_export_jobs()
+        current_app.logger.info(
+            "[Maintenance] Failed %s stale and purged %s expired export jobs",
+            failed,
+            deleted,
+        )
+        return {"failed": failed, "deleted": deleted}
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.exception("[Maintenance] Failed to purge export jobs")
+        raise self.retry(exc=e)
 
 
 @shared_task(
@@ -56,44 +114,42 @@ def generate_daily_summary():
     簡易デイリーサマリー（直近24時間の作成件数など）をログに出す。
     Beat: 24時間おき
     """
-    app = create_app()
-    with app.app_context():
-        now = datetime.now(timezone.utc)
-        since = now - timedelta(days=1)
+    now = datetime.now(timezone.utc)
+    since = now - timedelta(days=1)
 
-        total_tokens = db.session.query(func.count(GroupCreationToken.id)).scalar() or 0
-        new_tokens_24h = (
-            db.session.query(func.count(GroupCreationToken.id))
-            .filter(GroupCreationToken.created_at >= since)
-            .scalar()
-            or 0
-        )
-        expired_24h = (
-            db.session.query(func.count(GroupCreationToken.id))
-            .filter(
-                and_(
-                    GroupCreationToken.expires_at >= since,
-                    GroupCreationToken.expires_at < now,
-                    GroupCreationToken.is_used.is_(False),
-                )
+    total_tokens = db.session.query(func.count(GroupCreationToken.id)).scalar() or 0
+    new_tokens_24h = (
+        db.session.query(func.count(GroupCreationToken.id))
+        .filter(GroupCreationToken.created_at >= since)
+        .scalar()
+        or 0
+    )
+    expired_24h = (
+        db.session.query(func.count(GroupCreationToken.id))
+        .filter(
+            and_(
+                GroupCreationToken.expires_at >= since,
+                GroupCreationToken.expires_at < now,
+                GroupCreationToken.is_used.is_(False),
             )
-            .scalar()
-            or 0
         )
+        .scalar()
+        or 0
+    )
 
-        app.logger.info(
-            "[DailySummary] %s..%s new_tokens=%d expired_tokens=%d total_tokens=%d",
-            since.isoformat(),
-            now.isoformat(),
-            new_tokens_24h,
-            expired_24h,
-            total_tokens,
-        )
+    current_app.logger.info(
+        "[DailySummary] %s..%s new_tokens=%d expired_tokens=%d total_tokens=%d",
+        since.isoformat(),
+        now.isoformat(),
+        new_tokens_24h,
+        expired_24h,
+        total_tokens,
+    )
 
-        return {
-            "since": since.isoformat(),
-            "until": now.isoformat(),
-            "new_tokens": int(new_tokens_24h),
-            "expired_tokens": int(expired_24h),
-            "total_tokens": int(total_tokens),
-        }
+    return {
+        "since": since.isoformat(),
+        "until": now.isoformat(),
+        "new_tokens": int(new_tokens_24h),
+        "expired_tokens": int(expired_24h),
+        "total_tokens": int(total_tokens),
+    }
@@ -1,15 +1,48 @@
 import os
 
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from celery.signals import worker_process_init
+from jinja2 import (
+    Environment,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+    select_autoescape,
+)
 
+TEMPLATE_DIR = os.path.join(os.path.dirname(__file__), "templates")
+
+
+def _bytecode_cache():
+    """MAIL_TEMPLATE_CACHE_DIR 未指定時は OS の一時ディレクトリを使う"""
+    cache_dir = os.getenv("MAIL_TEMPLATE_CACHE_DIR")
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+    return FileSystemBytecodeCache(cache_dir)
+
+
+# プロセス内で使い回す環境（パース済みテンプレートは env.cache に保持される）
+env = Environment(
+    loader=FileSystemLoader(TEMPLATE_DIR),
+    autoescape=select_autoescape(["html", "xml"]),
+    bytecode_cache=_bytecode_cache(),
+    auto_reload=False,
+    cache_size=-1,
+)
 
-def render_mail_template(template_name, **context):
-    template_dir = os.path.join(os.path.dirname(__file__), "templates")
-    env = Environment(
-        loader=FileSystemLoader(template_dir),
-        autoescape=select_autoescape(["html", "xml"]),
-    )
 
+def precompile_mail_templates() -> int:
+    """templates 配下の全テンプレートを読み込んでおく。戻り値: 件数"""
+    names = env.list_templates(extensions=["txt", "html"])
+    for name in names:
+        env.get_template(name)
+    return len(names)
+
+
+@worker_process_init.connect
+def _precompile_on_worker_start(**kwargs):
+    precompile_mail_templates()
+
+
+def render_mail_template(template_name, **context):
     text_template = env.get_template(f"{template_name}.txt")
     html_template = env.get_template(f"{template_name}.html")
 
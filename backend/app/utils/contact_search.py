@@ -0,0 +1,75 @@
+# app/utils/contact_search.py
+import re
+import unicodedata
+
+from sqlalchemy import delete, func, insert, select
+
+from app import db
+from app.models import ContactSearchTerm
+
+MAX_TERM_LENGTH = 64
+
+# 英数字は単語単位、それ以外（日本語など）は文字の連続をまとめて取り出す
+_TOKEN_RE = re.compile(r"[0-9a-z]+|[^\x00-\x7f\W]+")
+
+
+def tokenize(text: str | None) -> list[str]:
+    """
+    検索語に分解する（NFKC 正規化・小文字化済み）。
+    英数字は単語、分かち書きのない日本語などは文字 bigram（1文字ならそのまま）。
+    """
+    if not text:
+        return []
+    normalized = unicodedata.normalize("NFKC", text).lower()
+    terms = set()
+    for run in _TOKEN_RE.findall(normalized):
+        if run.isascii() or len(run) == 1:
+            terms.add(run[:MAX_TERM_LENGTH])
+        else:
+            terms.update(run[i : i + 2] for i in range(len(run) - 1))
+    return sorted(terms)
+
+
+def index_terms(text: str | None) -> list[str]:
+    """
+    登録用の語。tokenize の語に加えて、英数字以外の各1文字も登録し、
+    「卓」のような1文字の検索語でも「卓球」を含むお問い合わせに一致させる。
+    """
+    if not text:
+        return []
+    normalized = unicodedata.normalize("NFKC", text).lower()
+    terms = set(tokenize(text))
+    for run in _TOKEN_RE.findall(normalized):
+        if not run.isascii():
+            terms.update(run)
+    return sorted(terms)
+
+
+def index_contact(contact) -> int:
+    """件名・本文から転置インデックスを作り直す（flush 済みの Contact を渡す）"""
+    db.session.execute(
+        delete(ContactSearchTerm).where(ContactSearchTerm.contact_id == contact.id)
+    )
+    terms = index_terms(f"{contact.subject}\n{contact.message}")
+    if terms:
+        db.session.execute(
+            insert(ContactSearchTerm),
+            [{"contact_id": contact.id, "term": term} for term in terms],
+        )
+    return len(terms)
+
+
+def matching_contact_ids(text: str):
+    """
+    検索語をすべて含むお問い合わせIDのサブクエリを返す。
+    検索語を取り出せない場合は None。
+    """
+    terms = tokenize(text)
+    if not terms:
+        return None
+    return (
+        select(ContactSearchTerm.contact_id)
+        .where(ContactSearchTerm.term.in_(terms))
+        .group_by(ContactSearchTerm.contact_id)
+        .having(func.count() == len(terms))
+    )
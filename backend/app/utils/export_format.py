@@ -0,0 +1,60 @@
+# app/utils/export_format.py
+import csv
+import io
+import json
+from collections.abc import Iterable, Iterator, Mapping
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+
+from app.models import ExportFormat
+
+MIMETYPES = {
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+    ExportFormat.NDJSON: "application/x-ndjson",
+}
+
+
+def _plain(value):
+    """CSV / JSON に書き出せる値へ変換（日時は ISO 8601、Decimal は数値）"""
+    if isinstance(value, datetime | date):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, Decimal):
+        # MySQL の SUM() などは Decimal を返し、そのままでは JSON にできない
+        return int(value) if value == value.to_integral_value() else float(value)
+    return value
+
+
+def csv_lines(rows: Iterable[Mapping], columns: list[str]) -> Iterator[str]:
+    """ヘッダー行を先頭に、1行ずつ CSV 文字列を返す（行を溜め込まない）"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def _flush():
+        line = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return line
+
+    writer.writerow(columns)
+    yield _flush()
+    for row in rows:
+        writer.writerow([_plain(row.get(column)) for column in columns])
+        yield _flush()
+
+
+def ndjson_lines(rows: Iterable[Mapping], columns: list[str]) -> Iterator[str]:
+    """1行1オブジェクトの NDJSON 文字列を返す"""
+    for row in rows:
+        record = {column: _plain(row.get(column)) for column in columns}
+        yield json.dumps(record, ensure_ascii=False) + "\n"
+
+
+def format_lines(
+    fmt: ExportFormat, rows: Iterable[Mapping], columns: list[str]
+) -> Iterator[str]:
+    if fmt == ExportFormat.CSV:
+        return csv_lines(rows, columns)
+    return ndjson_lines(rows, columns)
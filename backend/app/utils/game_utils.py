@@ -0,0 +1,133 @@
+# app/utils/game_utils.py
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+from app.models import Game, Score, Table, mark_group_touched
+
+# 採番カウンターが実データより遅れていた場合の再試行回数
+GAME_INDEX_RETRIES = 3
+
+
+def load_games_with_scores(table_id: int, order_by=Game.id):
+    """
+    卓の対局とスコアを1回の SELECT でまとめて取得する。
+
+    Game と Score を外部結合し、対局順・スコアID順に並べた結果を1パスで
+    グルーピングする。スコア未登録の対局も空リストとして返す。
+
+    Returns:
+        list[tuple[Game, list[Score]]]
+    """
+    rows = (
+        db.session.query(Game, Score)
+        .outerjoin(Score, Score.game_id == Game.id)
+        .filter(Game.table_id == table_id)
+        .order_by(order_by, Game.id, Score.id)
+        .all()
+    )
+    result = []
+    for game, score in rows:
+        if not result or result[-1][0] is not game:
+            result.append((game, []))
+        if score is not None:
+            result[-1][1].append(score)
+    return result
+
+
+def rank_scores(scores):
+    """
+    スコア降順に順位を付ける（同点は同順位、次の順位は人数分進める）。
+
+    Args:
+        scores: {"player_id": int, "score": int} の一覧
+
+    Returns:
+        list[dict]: rank を付与した新しい辞書のスコア降順リスト
+    """
+    ranked = []
+    for i, s in enumerate(sorted(scores, key=lambda s: s["score"], reverse=True)):
+        if i > 0 and s["score"] == ranked[-1]["score"]:
+            rank = ranked[-1]["rank"]
+        else:
+            rank = i + 1
+        ranked.append({**s, "rank": rank})
+    return ranked
+
+
+# =========================================================
+# game_index 採番
+# =========================================================
+def allocate_game_indexes(table_id: int, count: int = 1) -> int:
+    """
+    卓の採番カウンターを count 件分進め、払い出した先頭の game_index を返す。
+
+    UPDATE ... SET last_game_index = last_game_index + :count で卓の行を
+    ロックするため、同じ卓への同時書き込みでも同じ番号は払い出されない。
+    """
+    db.session.execute(
+        update(Table)
+        .where(Table.id == table_id)
+        .values(last_game_index=Table.last_game_index + count)
+        .execution_options(synchronize_session=False)
+    )
+    last = db.session.execute(
+        select(Table.last_game_index).where(Table.id == table_id)
+    ).scalar_one()
+    return last - count + 1
+
+
+def sync_game_index_counter(table_id: int) -> None:
+    """採番カウンターを既存対局の最大 game_index まで引き上げる"""
+    max_index = (
+        select(func.coalesce(func.max(Game.game_index), 0))
+        .where(Game.table_id == table_id)
+        .scalar_subquery()
+    )
+    db.session.execute(
+        update(Table)
+        .where(Table.id == table_id, Table.last_game_index < max_index)
+        .values(last_game_index=max_index)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def insert_games(table_id: int, rows: list[dict]) -> list[Game]:
+    """
+    連続した game_index を割り当てて対局をまとめて INSERT する。
+
+    (table_id, game_index) の一意制約に違反した場合は、カウンターを
+    既存対局に合わせてから採番し直す。commit は呼び出し側に任せる。
+
+    Args:
+        rows: game_index・table_id を除いた Game の列値の一覧
+
+    Returns:
+        list[Game]: rows と同じ順序の作成済み対局
+    """
+    for attempt in range(GAME_INDEX_RETRIES):
+        first = allocate_game_indexes(table_id, len(rows))
+        try:
+            with db.session.begin_nested():
+                db.session.execute(
+                    insert(Game),
+                    [
+                        {**row, "table_id": table_id, "game_index": first + offset}
+                        for offset, row in enumerate(rows)
+                    ],
+                )
+            break
+        except IntegrityError:
+            if attempt == GAME_INDEX_RETRIES - 1:
+                raise
+            sync_game_index_counter(table_id)
+
+    mark_group_touched(db.session, "table", table_id)
+    return (
+        Game.query.filter(
+            Game.table_id == table_id,
+            Game.game_index.between(first, first + len(rows) - 1),
+        )
+        .order_by(Game.game_index)
+        .all()
+    )
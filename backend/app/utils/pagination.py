@@ -0,0 +1,53 @@
+# app/utils/pagination.py
+import base64
+from datetime import datetime
+
+from sqlalchemy import and_, or_
+
+from app.service_errors import ServiceValidationError
+
+
+# =========================================================
+# (日時, id) の降順キーセットページング
+# =========================================================
+def encode_cursor(timestamp: datetime, row_id: int) -> str:
+    """ページ末尾の行から次ページ取得用の不透明なカーソルを作る"""
+    raw = f"{timestamp.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        timestamp, row_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(timestamp), int(row_id)
+    except ValueError as e:
+        raise ServiceValidationError("cursor が不正です。") from e
+
+
+def keyset_before(timestamp_column, id_column, cursor: str):
+    """(timestamp, id) の降順で、カーソル位置より後ろの行を選ぶ条件"""
+    timestamp, row_id = decode_cursor(cursor)
+    return or_(
+        timestamp_column < timestamp,
+        and_(timestamp_column == timestamp, id_column < row_id),
+    )
+
+
+def paginate_keyset(query, timestamp_column, id_column, limit: int, cursor=None):
+    """
+    (timestamp, id) の降順で limit 件を取得する。
+    戻り値: (行リスト, 次ページのカーソル or None)
+    """
+    if cursor:
+        query = query.filter(keyset_before(timestamp_column, id_column, cursor))
+    rows = (
+        query.order_by(timestamp_column.desc(), id_column.desc()).limit(limit + 1).all()
+    )
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(
+        getattr(last, timestamp_column.key), getattr(last, id_column.key)
+    )
@@ -0,0 +1,166 @@
+# app/utils/player_stats_utils.py
+from sqlalchemy import case, func, insert, select
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+from app.models import (
+    Game,
+    PlayerStatsRollup,
+    Score,
+    Table,
+    TableTypeEnum,
+    Tournament,
+)
+
+_COUNTER_COLUMNS = (
+    "game_count",
+    "rank1_count",
+    "rank2_count",
+    "rank3_count",
+    "rank4_or_lower_count",
+    "ranked_count",
+    "rank_sum",
+    "score_sum",
+    "balance",
+)
+
+
+# =========================================================
+# 差分更新（対局の作成・更新・削除と同一トランザクション）
+# =========================================================
+def _score_delta(score, rate, sign: int) -> dict:
+    """スコア1件分のロールアップ増分を返す"""
+    rank = score.rank
+    return {
+        "game_count": sign,
+        "rank1_count": sign if rank == 1 else 0,
+        "rank2_count": sign if rank == 2 else 0,
+        "rank3_count": sign if rank == 3 else 0,
+        "rank4_or_lower_count": sign if rank is not None and rank >= 4 else 0,
+        "ranked_count": sign if rank is not None else 0,
+        "rank_sum": sign * (rank or 0),
+        "score_sum": sign * score.score,
+        "balance": sign * score.score * rate if rate is not None else 0,
+    }
+
+
+def apply_game_scores(table: Table, scores, sign: int = 1) -> None:
+    """
+    対局のスコアをロールアップへ加算（sign=-1 で減算）する。
+    複数対局分のスコアをまとめて渡してもよい。
+
+    増分は UPDATE ... SET col = col + :delta で適用するため、同一大会への
+    同時書き込みでも値を取りこぼさない。CHIP卓のスコアは集計対象外。
+    commit は呼び出し側のトランザクションに任せる。
+    """
+    if table.type == TableTypeEnum.CHIP:
+        return
+    tournament = table.tournament
+    # 同一プレイヤーの増分は合算し、プレイヤーごとに1回だけ UPDATE する
+    deltas = {}
+    for score in scores:
+        delta = _score_delta(score, tournament.rate, sign)
+        total = deltas.setdefault(score.player_id, dict.fromkeys(delta, 0))
+        for column, value in delta.items():
+            total[column] += value
+
+    touched = set(deltas)
+    for player_id, delta in deltas.items():
+        key = {
+            "group_id": tournament.group_id,
+            "player_id": player_id,
+            "tournament_id": tournament.id,
+        }
+        if _increment(key, delta) or sign < 0:
+            continue
+        try:
+            with db.session.begin_nested():
+                db.session.add(PlayerStatsRollup(**key, **delta))
+        except IntegrityError:
+            # 同時に作成された行があれば加算に切り替える
+            _increment(key, delta)
+
+    if sign < 0 and touched:
+        PlayerStatsRollup.query.filter(
+            PlayerStatsRollup.tournament_id == tournament.id,
+            PlayerStatsRollup.player_id.in_(touched),
+            PlayerStatsRollup.game_count <= 0,
+        ).delete(synchronize_session=False)
+
+
+def _increment(key: dict, delta: dict) -> bool:
+    updated = PlayerStatsRollup.query.filter_by(**key).update(
+        {
+            getattr(PlayerStatsRollup, column): getattr(PlayerStatsRollup, column)
+            + value
+            for column, value in delta.items()
+        },
+        synchronize_session=False,
+    )
+    return updated > 0
+
+
+def refresh_tournament_balance(tournament: Tournament) -> None:
+    """大会レート変更時に balance を score_sum × rate で再計算"""
+    PlayerStatsRollup.query.filter_by(tournament_id=tournament.id).update(
+        {
+            PlayerStatsRollup.balance: PlayerStatsRollup.score_sum
+            * (tournament.rate if tournament.rate is not None else 0)
+        },
+        synchronize_session=False,
+    )
+
+
+# =========================================================
+# 再構築（CLI・卓種別変更・一括削除など）
+# =========================================================
+def rebuild_player_stats(tournament_ids=None) -> int:
+    """
+    Score からロールアップを作り直す。
+
+    Args:
+        tournament_ids: 対象大会ID。None の場合は全件を再構築する。
+
+    Returns:
+        int: 作成したロールアップ行数
+    """
+    db.session.flush()
+    delete_query = PlayerStatsRollup.query
+    if tournament_ids is not None:
+        if not tournament_ids:
+            return 0
+        delete_query = delete_query.filter(
+            PlayerStatsRollup.tournament_id.in_(tournament_ids)
+        )
+    delete_query.delete(synchronize_session=False)
+
+    aggregate = (
+        select(
+            Tournament.group_id,
+            Score.player_id,
+            Tournament.id,
+            func.count(Score.id),
+            func.sum(case((Score.rank == 1, 1), else_=0)),
+            func.sum(case((Score.rank == 2, 1), else_=0)),
+            func.sum(case((Score.rank == 3, 1), else_=0)),
+            func.sum(case((Score.rank >= 4, 1), else_=0)),
+            func.count(Score.rank),
+            func.coalesce(func.sum(Score.rank), 0),
+            func.sum(Score.score),
+            func.coalesce(func.sum(Score.score * Tournament.rate), 0),
+        )
+        .join(Game, Game.id == Score.game_id)
+        .join(Table, Table.id == Game.table_id)
+        .join(Tournament, Tournament.id == Table.tournament_id)
+        .filter(Table.type != TableTypeEnum.CHIP)
+        .group_by(Tournament.group_id, Score.player_id, Tournament.id)
+    )
+    if tournament_ids is not None:
+        aggregate = aggregate.filter(Tournament.id.in_(tournament_ids))
+
+    result = db.session.execute(
+        insert(PlayerStatsRollup).from_select(
+            ["group_id", "player_id", "tournament_id", *_COUNTER_COLUMNS], aggregate
+        )
+    )
+    return result.rowcount
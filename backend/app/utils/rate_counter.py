@@ -0,0 +1,48 @@
+# app/utils/rate_counter.py
+from limits import parse
+from limits.storage import storage_from_string
+from limits.strategies import MovingWindowRateLimiter
+
+
+class SlidingWindowCounter:
+    """
+    limits のストレージ（redis:// / memory://）上の sliding window カウンター。
+    ストレージ URI が未設定の場合は無効（呼び出し側で DB 集計にフォールバックする）。
+    """
+
+    def __init__(self, config_key: str):
+        self.config_key = config_key
+        self._storage = None
+        self._limiter = None
+
+    def init_app(self, app):
+        uri = app.config.get(self.config_key)
+        if uri:
+            self._storage = storage_from_string(uri)
+            self._limiter = MovingWindowRateLimiter(self._storage)
+        else:
+            self._storage = self._limiter = None
+
+    @property
+    def enabled(self) -> bool:
+        return self._limiter is not None
+
+    def test(self, limit: str, *identifiers: str) -> bool:
+        """あと1回記録しても limit（例: "5 per hour"）以内に収まるか（記録はしない）"""
+        return self._limiter.test(parse(limit), *identifiers)
+
+    def hit(self, limit: str, *identifiers: str) -> bool:
+        """
+        limit（例: "5 per hour"）以内なら1回分を記録して True を返す。
+        確認と記録はストレージ上で1回の操作として行われるため、
+        同時リクエストでも上限を超えて記録されない。超過時は記録せず False。
+        """
+        return self._limiter.hit(parse(limit), *identifiers)
+
+    def clear(self) -> None:
+        if self._storage is not None:
+            self._storage.reset()
+
+
+# グループ作成リクエストの IP / メールアドレス別カウンター
+group_creation_counter = SlidingWindowCounter("GROUP_CREATION_COUNTER_STORAGE_URI")
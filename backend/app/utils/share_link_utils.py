@@ -1,10 +1,36 @@
 # app/utils/share_link_utils.py
 import secrets
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import datetime, timezone
 
+from sqlalchemy import and_, event, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
 from app import db
 from app.models import AccessLevel, ShareLink
-from app.service_errors import ServiceValidationError
+from app.service_errors import (
+    ServiceError,
+    ServiceNotFoundError,
+    ServicePermissionError,
+    ServiceValidationError,
+)
+
+ACCESS_PRIORITY = {
+    AccessLevel.VIEW: 1,
+    AccessLevel.EDIT: 2,
+    AccessLevel.OWNER: 3,
+}
+
+_RESOURCE_LABELS = {
+    "group": "グループ",
+    "tournament": "大会",
+    "table": "卓",
+    "game": "対局",
+}
 
 
 def generate_short_key(length: int = 12) -> str:
@@ -12,40 +38,312 @@ def generate_short_key(length: int = 12) -> str:
     return secrets.token_urlsafe(length)[:length]
 
 
-def create_unique_share_link(
-    resource_type: str, resource_id: int, created_by: str, access_level: AccessLevel
-):
+def create_share_links(
+    resources, levels, *, attempts: int = 5
+) -> dict[tuple[str, int], dict[AccessLevel, str]]:
     """
-    指定されたリソースに対してユニークな共有リンクを作成する。
-    同じresource_type / resource_id / access_level の組み合わせが存在すれば再利用する。
+    作成直後の複数リソースに共有リンクをまとめて作成する。
+
+    全リソース × アクセスレベル分のキーを生成して1回の複数行 INSERT で登録し、
+    short_key の一意制約違反が起きた場合のみ、衝突したキーを作り直して再試行する。
+    既存リンクの再利用は行わない（作成直後のリソース専用）。
+
+    Args:
+        resources: (resource_type, resource_id, created_by) の一覧
+        levels: 各リソースに作成する AccessLevel の一覧（この順に INSERT する）
+
+    Returns:
+        {(resource_type, resource_id): {AccessLevel: short_key}}
     """
-    existing = ShareLink.query.filter_by(
-        resource_type=resource_type, resource_id=resource_id, access_level=access_level
-    ).first()
-    if existing:
-        return existing
+    now = datetime.now(timezone.utc)
+    rows = [
+        {
+            "resource_type": resource_type,
+            "resource_id": resource_id,
+            "access_level": level,
+            "created_by": created_by,
+            "created_at": now,
+        }
+        for resource_type, resource_id, created_by in resources
+        for level in levels
+    ]
+    if not rows:
+        return {}
 
-    for _ in range(5):  # 衝突回避のため最大5回試行
-        short_key = generate_short_key(12)
-        if not ShareLink.query.filter_by(short_key=short_key).first():
-            link = ShareLink(
-                short_key=short_key,
-                resource_type=resource_type,
-                resource_id=resource_id,
-                created_by=created_by,
-                access_level=access_level,
-                created_at=datetime.now(timezone.utc),
+    keys = set()
+    for row in rows:
+        row["short_key"] = _new_key(keys)
+
+    for _ in range(attempts):
+        try:
+            with db.session.begin_nested():
+                db.session.execute(insert(ShareLink).values(rows))
+            break
+        except IntegrityError:
+            taken = set(
+                db.session.execute(
+                    select(ShareLink.short_key).where(ShareLink.short_key.in_(keys))
+                ).scalars()
             )
-            db.session.add(link)
-            db.session.flush()
+            if not taken:
+                raise
+            for row in rows:
+                if row["short_key"] in taken:
+                    keys.discard(row["short_key"])
+                    row["short_key"] = _new_key(keys | taken)
+                    keys.add(row["short_key"])
+    else:
+        raise ServiceValidationError("共有リンクの生成に失敗しました。")
+
+    result = {}
+    for row in rows:
+        result.setdefault((row["resource_type"], row["resource_id"]), {})[
+            row["access_level"]
+        ] = row["short_key"]
+    return result
+
+
+def _new_key(used: set) -> str:
+    """used と重複しない短縮キーを生成して used に追加"""
+    while True:
+        short_key = generate_short_key(12)
+        if short_key not in used:
+            used.add(short_key)
+            return short_key
+
+
+@dataclass(frozen=True)
+class ResolvedShareLink:
+    """short_key の解決結果（セッションに依存しないためキャッシュ可能）"""
+
+    short_key: str
+    resource_type: str
+    resource_id: int
+    access_level: AccessLevel
+
+
+class ShareLinkCache:
+    """
+    short_key → ResolvedShareLink のプロセス内 LRU + TTL キャッシュ。
+    maxsize が 0 の場合は無効（常にDBを参照）。
+
+    キャッシュはプロセスごとのため、別プロセスでの削除は TTL が切れるまで
+    反映されない。このため保持するのは VIEW リンクだけにし、EDIT 以上を
+    与えるリンクは毎回DBで確認する（失効直後の書き込みを通さない）。
+    """
+
+    def __init__(self, maxsize: int = 4096, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, ResolvedShareLink]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def init_app(self, app):
+        self.maxsize = int(app.config.get("SHARE_LINK_CACHE_MAXSIZE", self.maxsize))
+        self.ttl = float(app.config.get("SHARE_LINK_CACHE_TTL", self.ttl))
+        self.clear()
+
+    def get(self, short_key: str) -> ResolvedShareLink | None:
+        with self._lock:
+            entry = self._entries.get(short_key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, link = entry
+            if expires_at <= time.monotonic():
+                del self._entries[short_key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(short_key)
+            self.hits += 1
             return link
 
-    raise ServiceValidationError("共有リンクの生成に失敗しました。")
+    def set(self, link: ResolvedShareLink) -> None:
+        if self.maxsize <= 0 or link.access_level != AccessLevel.VIEW:
+            return
+        with self._lock:
+            self._entries[link.short_key] = (time.monotonic() + self.ttl, link)
+            self._entries.move_to_end(link.short_key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate_resources(self, resource_type: str, resource_ids) -> None:
+        """指定リソースに紐づくエントリを破棄"""
+        ids = set(resource_ids)
+        with self._lock:
+            stale = [
+                key
+                for key, (_, link) in self._entries.items()
+                if link.resource_type == resource_type and link.resource_id in ids
+            ]
+            for key in stale:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+            }
+
+
+share_link_cache = ShareLinkCache()
 
 
-def get_share_link_by_key(short_key: str) -> ShareLink | None:
-    """short_key から ShareLink を取得"""
-    return ShareLink.query.filter_by(short_key=short_key).first()
+def get_share_link_by_key(short_key: str) -> ResolvedShareLink | None:
+    """short_key から共有リンクを解決（プロセス内キャッシュ経由）"""
+    cached = share_link_cache.get(short_key)
+    if cached is not None:
+        return cached
+
+    link = ShareLink.query.filter_by(short_key=short_key).first()
+    if not link:
+        return None
+    resolved = _resolve(link)
+    share_link_cache.set(resolved)
+    return resolved
+
+
+def _resolve(link: ShareLink) -> ResolvedShareLink:
+    return ResolvedShareLink(
+        short_key=link.short_key,
+        resource_type=link.resource_type,
+        resource_id=link.resource_id,
+        access_level=link.access_level,
+    )
+
+
+def resolve_share_link(short_key: str, resource_type: str, model):
+    """
+    short_key から共有リンクと対象リソースを1往復で取得する。
+    キャッシュヒット時はリソースの主キー取得のみ、
+    ミス時は ShareLink と対象テーブルを1回の JOIN SELECT で取得する。
+
+    戻り値: (link, resource)
+        - キーが存在しない場合は (None, None)
+        - 種別不一致・リソース削除済みの場合は (link, None)
+    """
+    cached = share_link_cache.get(short_key)
+    if cached is not None:
+        if cached.resource_type != resource_type:
+            return cached, None
+        return cached, db.session.get(model, cached.resource_id)
+
+    row = (
+        db.session.query(ShareLink, model)
+        .outerjoin(
+            model,
+            and_(
+                ShareLink.resource_type == resource_type,
+                model.id == ShareLink.resource_id,
+            ),
+        )
+        .filter(ShareLink.short_key == short_key)
+        .first()
+    )
+    if row is None:
+        return None, None
+    link, resource = row
+    resolved = _resolve(link)
+    share_link_cache.set(resolved)
+    return resolved, resource
+
+
+def has_access(link, required: AccessLevel) -> bool:
+    """共有リンクが required 以上のアクセスレベルを持つか"""
+    return ACCESS_PRIORITY[link.access_level] >= ACCESS_PRIORITY[required]
+
+
+def ensure_access(link, required: AccessLevel, message: str) -> None:
+    """アクセスレベルチェック"""
+    if not has_access(link, required):
+        raise ServicePermissionError(message)
+
+
+def require_resource(
+    short_key: str,
+    resource_type: str,
+    model,
+    required: AccessLevel = AccessLevel.VIEW,
+    *,
+    forbidden_message: str = "この操作を行う権限がありません。",
+    invalid_message: str = "共有リンクが無効です。",
+    missing_message: str | None = None,
+    mismatch_message: str = "共有リンクの対象が一致しません。",
+    mismatch_error: type[ServiceError] = ServicePermissionError,
+):
+    """
+    共有キーからリソースを特定し、アクセスレベルまで確認する共通リゾルバ。
+    戻り値: (link, resource)
+
+    例外:
+        ServiceNotFoundError: キーが無効 / リソースが存在しない
+        ServicePermissionError: 種別不一致（mismatch_error で変更可） / 権限不足
+    """
+    link, resource = resolve_share_link(short_key, resource_type, model)
+    if link is None:
+        raise ServiceNotFoundError(invalid_message)
+    if link.resource_type != resource_type:
+        raise mismatch_error(mismatch_message)
+    if resource is None:
+        label = _RESOURCE_LABELS.get(resource_type, "リソース")
+        raise ServiceNotFoundError(missing_message or f"{label}が見つかりません。")
+    ensure_access(link, required, forbidden_message)
+    return link, resource
+
+
+# =========================================================
+# 削除した共有リンクのキャッシュ破棄
+# =========================================================
+# commit 前に破棄すると、commit までの間に別リクエストが削除前の行を
+# 読んで再びキャッシュしてしまう。このため削除対象はセッションに記録し、
+# commit 後に破棄する（rollback された場合は何もしない）。
+_PENDING_INVALIDATIONS = "pending_share_link_invalidations"
+
+
+def delete_share_links(resource_type: str, resource_ids) -> int:
+    """
+    指定リソースの共有リンクを一括削除し、commit 後にキャッシュからも破棄する。
+    戻り値: 削除件数
+    """
+    ids = list(resource_ids)
+    if not ids:
+        return 0
+    deleted = ShareLink.query.filter(
+        ShareLink.resource_type == resource_type, ShareLink.resource_id.in_(ids)
+    ).delete(synchronize_session=False)
+    db.session.info.setdefault(_PENDING_INVALIDATIONS, []).append((resource_type, ids))
+    return deleted
+
+
+@event.listens_for(Session, "after_commit")
+def invalidate_deleted_share_links(session):
+    """commit 後に、削除した共有リンクをキャッシュから破棄"""
+    for resource_type, ids in session.info.pop(_PENDING_INVALIDATIONS, ()):
+        share_link_cache.invalidate_resources(resource_type, ids)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def discard_share_link_invalidations(session, transaction):
+    if transaction.parent is None:
+        session.info.pop(_PENDING_INVALIDATIONS, None)
 
 
 def create_default_share_links(
@@ -63,20 +361,14 @@ def create_default_share_links(
             "view": "..."
         }
     """
-    links = {}
     if resource_type == "group":
         levels = [AccessLevel.OWNER, AccessLevel.EDIT, AccessLevel.VIEW]
     else:
         levels = [AccessLevel.EDIT, AccessLevel.VIEW]
 
-    for level in levels:
-        link = create_unique_share_link(
-            resource_type=resource_type,
-            resource_id=resource_id,
-            created_by=created_by,
-            access_level=level,
-        )
-        links[level.value] = link.short_key
-
+    created = create_share_links([(resource_type, resource_id, created_by)], levels)
     db.session.commit()
-    return links
+    return {
+        level.value: short_key
+        for level, short_key in created[(resource_type, resource_id)].items()
+    }
@@ -0,0 +1,122 @@
+# app/utils/sql_profiler.py
+import heapq
+import json
+from dataclasses import dataclass, field
+from time import perf_counter
+
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_G_KEY = "sql_profile"
+_START_KEY = "sql_profiler_started"
+MAX_STATEMENT_LENGTH = 500
+
+
+@dataclass
+class RequestProfile:
+    """1リクエスト中に発行された SQL の集計"""
+
+    started: float
+    slowest_count: int
+    statements: int = 0
+    db_seconds: float = 0.0
+    # (所要秒, 連番, SQL) の最小ヒープ。遅い上位 slowest_count 件だけを保持する
+    slowest: list = field(default_factory=list)
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.statements += 1
+        self.db_seconds += seconds
+        entry = (seconds, self.statements, statement[:MAX_STATEMENT_LENGTH])
+        if len(self.slowest) < self.slowest_count:
+            heapq.heappush(self.slowest, entry)
+        elif self.slowest and seconds > self.slowest[0][0]:
+            heapq.heapreplace(self.slowest, entry)
+
+
+class SQLProfiler:
+    """
+    リクエスト単位の SQL 発行回数・DB 時間・遅いクエリを計測する。
+
+    SQL_PROFILING_ENABLED が有効なときだけ記録し、結果を Server-Timing
+    ヘッダーと構造化ログ（JSON）で出力する。エンジンのイベントは最初に
+    計測したリクエストで登録するため、無効のままなら SQL 実行に影響しない。
+    ストリーミングレスポンスの本文生成中に発行された SQL は含まれない。
+    """
+
+    def __init__(self):
+        self._listening = False
+
+    def init_app(self, app):
+        app.before_request(self._start)
+        app.after_request(self._finish)
+
+    # --- SQLAlchemy イベント ---
+    def _listen(self):
+        if self._listening:
+            return
+        event.listen(Engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", self._after_cursor_execute)
+        self._listening = True
+
+    @staticmethod
+    def _current() -> RequestProfile | None:
+        return g.get(_G_KEY) if has_request_context() else None
+
+    def _before_cursor_execute(self, conn, cursor, statement, *args):
+        if self._current() is not None:
+            conn.info.setdefault(_START_KEY, []).append(perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, *args):
+        profile = self._current()
+        started = conn.info.get(_START_KEY)
+        if profile is None or not started:
+            return
+        profile.record(statement, perf_counter() - started.pop())
+
+    # --- Flask リクエストフック ---
+    def _start(self):
+        config = current_app.config
+        if not config.get("SQL_PROFILING_ENABLED"):
+            return
+        self._listen()
+        g.setdefault(
+            _G_KEY,
+            RequestProfile(
+                started=perf_counter(),
+                slowest_count=config.get("SQL_PROFILING_SLOWEST_COUNT", 3),
+            ),
+        )
+
+    def _finish(self, response):
+        profile = g.pop(_G_KEY, None)
+        if profile is None:
+            return response
+
+        db_ms = profile.db_seconds * 1000
+        total_ms = (perf_counter() - profile.started) * 1000
+        response.headers["Server-Timing"] = (
+            f'db;dur={db_ms:.1f};desc="{profile.statements} queries", '
+            f"app;dur={total_ms:.1f}"
+        )
+        record = {
+            "method": request.method,
+            "path": request.path,
+            "endpoint": request.endpoint,
+            "status": response.status_code,
+            "statements": profile.statements,
+            "db_ms": round(db_ms, 2),
+            "total_ms": round(total_ms, 2),
+            "slowest": [
+                {"ms": round(seconds * 1000, 2), "statement": statement}
+                for seconds, _, statement in sorted(profile.slowest, reverse=True)
+            ],
+        }
+        current_app.logger.info(
+            "[SQLProfile] %s", json.dumps(record, ensure_ascii=False)
+        )
+        return response
+
+
+# リクエストごとの SQL 計測（SQL_PROFILING_ENABLED で有効化）
+sql_profiler = SQLProfiler()
@@ -1,6 +1,7 @@
 # config.py
 
 import os
+import tempfile
 from typing import ClassVar
 
 from dotenv import load_dotenv
@@ -70,5 +71,63 @@ class Config:
     # Frontend URL
     FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:5173/")
 
+    # ShareLink 解決キャッシュ（プロセス内 LRU + TTL）。VIEW リンクのみ保持し、
+    # 他プロセスで削除された VIEW リンクは最大 TTL 秒まで閲覧に使える
+    SHARE_LINK_CACHE_MAXSIZE = int(os.getenv("SHARE_LINK_CACHE_MAXSIZE", "4096"))
+    SHARE_LINK_CACHE_TTL = float(os.getenv("SHARE_LINK_CACHE_TTL", "60"))
+
+    # Group.last_updated_at の更新間引き（秒）。0 なら commit ごとに更新
+    GROUP_TOUCH_MIN_INTERVAL = float(os.getenv("GROUP_TOUCH_MIN_INTERVAL", "0"))
+
+    # V2 冪等性レコードの保持期間（時間）・削除チャンク・圧縮閾値（バイト）
+    IDEMPOTENCY_RETENTION_HOURS = float(os.getenv("IDEMPOTENCY_RETENTION_HOURS", "48"))
+    IDEMPOTENCY_PURGE_BATCH_SIZE = int(
+        os.getenv("IDEMPOTENCY_PURGE_BATCH_SIZE", "1000")
+    )
+    IDEMPOTENCY_COMPRESS_THRESHOLD = int(
+        os.getenv("IDEMPOTENCY_COMPRESS_THRESHOLD", "2048")
+    )
+
+    # 管理画面のグループ一覧の既定ページサイズ
+    ADMIN_GROUP_PAGE_SIZE = int(os.getenv("ADMIN_GROUP_PAGE_SIZE", "100"))
+
+    # 管理画面のお問い合わせ一覧の既定ページサイズ
+    CONTACT_PAGE_SIZE = int(os.getenv("CONTACT_PAGE_SIZE", "50"))
+
+    # 管理者によるグループ削除で1回の DELETE / commit に含める行数
+    ADMIN_DELETE_CHUNK_SIZE = int(os.getenv("ADMIN_DELETE_CHUNK_SIZE", "1000"))
+
+    # リクエストごとの SQL 計測（Server-Timing ヘッダー・[SQLProfile] ログ）
+    SQL_PROFILING_ENABLED = os.getenv("SQL_PROFILING_ENABLED", "False").lower() in (
+        "true",
+        "1",
+    )
+    SQL_PROFILING_SLOWEST_COUNT = int(os.getenv("SQL_PROFILING_SLOWEST_COUNT", "3"))
+
+    # 非同期エクスポートの出力先と保持期間（時間）
+    EXPORT_DIR = os.getenv(
+        "EXPORT_DIR", os.path.join(tempfile.gettempdir(), "score-exports")
+    )
+    EXPORT_JOB_TTL_HOURS = float(os.getenv("EXPORT_JOB_TTL_HOURS", "24"))
+    # この時間（分）を過ぎても RUNNING のままのジョブはワーカー停止とみなして失敗にする
+    EXPORT_JOB_STALE_MINUTES = float(os.getenv("EXPORT_JOB_STALE_MINUTES", "60"))
+
     # Rate Limit
     RATELIMIT_ENABLED = os.getenv("RATELIMIT_ENABLED", "True").lower() in ("true", "1")
+    # ワーカー間でカウンターを共有するため本番は redis:// を指定する
+    RATELIMIT_STORAGE_URI = os.getenv("RATELIMIT_STORAGE_URI", "memory://")
+    RATELIMIT_STRATEGY = os.getenv("RATELIMIT_STRATEGY", "moving-window")
+    # Redis 障害時はプロセス内カウンターで継続する
+    RATELIMIT_IN_MEMORY_FALLBACK_ENABLED = True
+    # fixed-window の参照系制限を適用する Blueprint と上限
+    RATELIMIT_READ_BLUEPRINTS: ClassVar[list[str]] = [
+        "groups_v2",
+        "tournaments_v2",
+        "tables_v2",
+    ]
+    RATELIMIT_READ_LIMIT = os.getenv("RATELIMIT_READ_LIMIT", "600 per minute")
+    # グループ作成リクエストの sliding window カウンター（空なら DB 集計）。
+    # ワーカー間で共有できる redis:// を指定したときだけ有効にする
+    GROUP_CREATION_COUNTER_STORAGE_URI = os.getenv(
+        "GROUP_CREATION_COUNTER_STORAGE_URI", ""
+    )
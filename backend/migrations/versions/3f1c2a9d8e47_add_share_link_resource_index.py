@@ -0,0 +1,29 @@
+"""add share link resource index
+
+Revision ID: 3f1c2a9d8e47
+Revises: cd831af184a2
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "3f1c2a9d8e47"
+down_revision = "cd831af184a2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("tbl_share_links", schema=None) as batch_op:
+        batch_op.create_index(
+            "ix_share_links_resource",
+            ["resource_type", "resource_id", "access_level"],
+            unique=False,
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("tbl_share_links", schema=None) as batch_op:
+        batch_op.drop_index("ix_share_links_resource")
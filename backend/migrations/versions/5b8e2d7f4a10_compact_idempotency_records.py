@@ -0,0 +1,36 @@
+"""compact idempotency records and index created_at
+
+Revision ID: 5b8e2d7f4a10
+Revises: e1a9c3f5b702
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "5b8e2d7f4a10"
+down_revision = "e1a9c3f5b702"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("tbl_idempotency_records", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column("response_body_compressed", sa.LargeBinary(), nullable=True)
+        )
+        batch_op.alter_column("response_body", existing_type=sa.JSON(), nullable=True)
+        batch_op.create_index(
+            "ix_idempotency_records_created_at", ["created_at"], unique=False
+        )
+
+
+def downgrade():
+    # 圧縮済みのレコードは JSON 列へ戻せないため削除する
+    op.execute("DELETE FROM tbl_idempotency_records WHERE response_body IS NULL")
+    with op.batch_alter_table("tbl_idempotency_records", schema=None) as batch_op:
+        batch_op.drop_index("ix_idempotency_records_created_at")
+        batch_op.alter_column("response_body", existing_type=sa.JSON(), nullable=False)
+        batch_op.drop_column("response_body_compressed")
@@ -0,0 +1,47 @@
+"""add export jobs
+
+Revision ID: 7f2b9d4c1a63
+Revises: 9c3f6a1e2d58
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "7f2b9d4c1a63"
+down_revision = "9c3f6a1e2d58"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "tbl_export_jobs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("job_key", sa.String(length=64), nullable=False),
+        sa.Column("kind", sa.String(length=32), nullable=False),
+        sa.Column("format", sa.String(length=16), nullable=False),
+        sa.Column("resource_type", sa.String(length=32), nullable=False),
+        sa.Column("resource_id", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(length=16), nullable=False),
+        sa.Column("row_count", sa.Integer(), nullable=True),
+        sa.Column("file_path", sa.Text(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("job_key"),
+    )
+    with op.batch_alter_table("tbl_export_jobs", schema=None) as batch_op:
+        batch_op.create_index("ix_export_jobs_expires_at", ["expires_at"], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table("tbl_export_jobs", schema=None) as batch_op:
+        batch_op.drop_index("ix_export_jobs_expires_at")
+
+    op.drop_table("tbl_export_jobs")
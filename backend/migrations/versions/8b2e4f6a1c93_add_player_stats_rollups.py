@@ -0,0 +1,97 @@
+"""add player stats rollups
+
+Revision ID: 8b2e4f6a1c93
+Revises: 3f1c2a9d8e47
+Create Date: 2026-10-18 11:00:00.000000
+
+既存の Score は upgrade 内で集計する（rebuild_player_stats と同じ INSERT ... SELECT）。
+以降の再集計は `flask rebuild-player-stats` で行う。
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "8b2e4f6a1c93"
+down_revision = "3f1c2a9d8e47"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "tbl_player_stats_rollups",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "group_id",
+            sa.Integer(),
+            sa.ForeignKey("tbl_groups.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column(
+            "player_id",
+            sa.Integer(),
+            sa.ForeignKey("tbl_players.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column(
+            "tournament_id",
+            sa.Integer(),
+            sa.ForeignKey("tbl_tournaments.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("game_count", sa.Integer(), nullable=False),
+        sa.Column("rank1_count", sa.Integer(), nullable=False),
+        sa.Column("rank2_count", sa.Integer(), nullable=False),
+        sa.Column("rank3_count", sa.Integer(), nullable=False),
+        sa.Column("rank4_or_lower_count", sa.Integer(), nullable=False),
+        sa.Column("ranked_count", sa.Integer(), nullable=False),
+        sa.Column("rank_sum", sa.Integer(), nullable=False),
+        sa.Column("score_sum", sa.Integer(), nullable=False),
+        sa.Column("balance", sa.Float(), nullable=False),
+        sa.UniqueConstraint(
+            "group_id",
+            "player_id",
+            "tournament_id",
+            name="uq_player_stats_rollup_key",
+        ),
+    )
+    op.create_index(
+        "ix_player_stats_rollups_tournament",
+        "tbl_player_stats_rollups",
+        ["tournament_id", "player_id"],
+        unique=False,
+    )
+
+    # 既存の対局を集計して初期値を入れる（CHIP卓のスコアは集計対象外）
+    op.execute(
+        sa.text(
+            "INSERT INTO tbl_player_stats_rollups ("
+            "group_id, player_id, tournament_id, game_count, rank1_count, "
+            "rank2_count, rank3_count, rank4_or_lower_count, ranked_count, "
+            "rank_sum, score_sum, balance) "
+            "SELECT tbl_tournaments.group_id, tbl_scores.player_id, "
+            "tbl_tournaments.id, COUNT(tbl_scores.id), "
+            "SUM(CASE WHEN tbl_scores.rank = 1 THEN 1 ELSE 0 END), "
+            "SUM(CASE WHEN tbl_scores.rank = 2 THEN 1 ELSE 0 END), "
+            "SUM(CASE WHEN tbl_scores.rank = 3 THEN 1 ELSE 0 END), "
+            "SUM(CASE WHEN tbl_scores.rank >= 4 THEN 1 ELSE 0 END), "
+            "COUNT(tbl_scores.rank), COALESCE(SUM(tbl_scores.rank), 0), "
+            "SUM(tbl_scores.score), "
+            "COALESCE(SUM(tbl_scores.score * tbl_tournaments.rate), 0) "
+            "FROM tbl_scores "
+            "JOIN tbl_games ON tbl_games.id = tbl_scores.game_id "
+            "JOIN tbl_tables ON tbl_tables.id = tbl_games.table_id "
+            "JOIN tbl_tournaments ON tbl_tournaments.id = tbl_tables.tournament_id "
+            "WHERE tbl_tables.type != 'CHIP' "
+            "GROUP BY tbl_tournaments.group_id, tbl_scores.player_id, "
+            "tbl_tournaments.id"
+        )
+    )
+
+
+def downgrade():
+    op.drop_index(
+        "ix_player_stats_rollups_tournament", table_name="tbl_player_stats_rollups"
+    )
+    op.drop_table("tbl_player_stats_rollups")
@@ -0,0 +1,35 @@
+"""add group creation token rate limit indexes
+
+Revision ID: 9c3f6a1e2d58
+Revises: 5b8e2d7f4a10
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "9c3f6a1e2d58"
+down_revision = "5b8e2d7f4a10"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("tbl_group_creation_tokens", schema=None) as batch_op:
+        batch_op.create_index(
+            "ix_group_creation_tokens_ip_created",
+            ["ip_address", "created_at"],
+            unique=False,
+        )
+        batch_op.create_index(
+            "ix_group_creation_tokens_email_created",
+            ["email", "created_at"],
+            unique=False,
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("tbl_group_creation_tokens", schema=None) as batch_op:
+        batch_op.drop_index("ix_group_creation_tokens_email_created")
+        batch_op.drop_index("ix_group_creation_tokens_ip_created")
@@ -0,0 +1,27 @@
+"""add (last_updated_at, id) index to groups
+
+Revision ID: b3e8d1f6c274
+Revises: 7f2b9d4c1a63
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "b3e8d1f6c274"
+down_revision = "7f2b9d4c1a63"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("tbl_groups", schema=None) as batch_op:
+        batch_op.create_index(
+            "ix_groups_last_updated_id", ["last_updated_at", "id"], unique=False
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("tbl_groups", schema=None) as batch_op:
+        batch_op.drop_index("ix_groups_last_updated_id")
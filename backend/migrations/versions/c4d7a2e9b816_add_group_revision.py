@@ -0,0 +1,28 @@
+"""add group revision
+
+Revision ID: c4d7a2e9b816
+Revises: 8b2e4f6a1c93
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "c4d7a2e9b816"
+down_revision = "8b2e4f6a1c93"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("tbl_groups", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column("revision", sa.Integer(), nullable=False, server_default="0")
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("tbl_groups", schema=None) as batch_op:
+        batch_op.drop_column("revision")
@@ -0,0 +1,86 @@
+"""add contact list indexes and search terms
+
+Revision ID: d5a7c9e3b186
+Revises: b3e8d1f6c274
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# 通常の登録と同じ分割規則にするため、アプリの index_terms をそのまま使う
+from app.utils.contact_search import index_terms
+
+# revision identifiers, used by Alembic.
+revision = "d5a7c9e3b186"
+down_revision = "b3e8d1f6c274"
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH_SIZE = 500
+
+
+def upgrade():
+    with op.batch_alter_table("tbl_contacts", schema=None) as batch_op:
+        batch_op.create_index(
+            "ix_contacts_status_created", ["status", "created_at"], unique=False
+        )
+        batch_op.create_index("ix_contacts_created_at", ["created_at"], unique=False)
+
+    op.create_table(
+        "tbl_contact_search_terms",
+        sa.Column("term", sa.String(length=64), nullable=False),
+        sa.Column("contact_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["contact_id"], ["tbl_contacts.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("term", "contact_id"),
+    )
+    with op.batch_alter_table("tbl_contact_search_terms", schema=None) as batch_op:
+        batch_op.create_index(
+            "ix_contact_search_terms_contact", ["contact_id"], unique=False
+        )
+
+    _backfill_search_terms()
+
+
+def _backfill_search_terms():
+    """既存のお問い合わせを id 順に少しずつ読み、検索語を登録する"""
+    conn = op.get_bind()
+    last_id = 0
+    while True:
+        contacts = conn.execute(
+            sa.text(
+                "SELECT id, subject, message FROM tbl_contacts "
+                "WHERE id > :last_id ORDER BY id LIMIT :limit"
+            ),
+            {"last_id": last_id, "limit": BACKFILL_BATCH_SIZE},
+        ).all()
+        if not contacts:
+            return
+        terms = [
+            {"contact_id": contact.id, "term": term}
+            for contact in contacts
+            for term in index_terms(f"{contact.subject}\n{contact.message}")
+        ]
+        if terms:
+            conn.execute(
+                sa.text(
+                    "INSERT INTO tbl_contact_search_terms (term, contact_id) "
+                    "VALUES (:term, :contact_id)"
+                ),
+                terms,
+            )
+        last_id = contacts[-1].id
+
+
+def downgrade():
+    with op.batch_alter_table("tbl_contact_search_terms", schema=None) as batch_op:
+        batch_op.drop_index("ix_contact_search_terms_contact")
+
+    op.drop_table("tbl_contact_search_terms")
+
+    with op.batch_alter_table("tbl_contacts", schema=None) as batch_op:
+        batch_op.drop_index("ix_contacts_created_at")
+        batch_op.drop_index("ix_contacts_status_created")
@@ -0,0 +1,70 @@
+"""add per-table game_index counter and unique index
+
+Revision ID: e1a9c3f5b702
+Revises: c4d7a2e9b816
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "e1a9c3f5b702"
+down_revision = "c4d7a2e9b816"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("tbl_tables", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column(
+                "last_game_index", sa.Integer(), nullable=False, server_default="0"
+            )
+        )
+
+    conn = op.get_bind()
+    # 一意制約の作成前に、重複した game_index を持つ卓を (game_index, id) 順に振り直す
+    duplicated = conn.execute(
+        sa.text(
+            "SELECT DISTINCT table_id FROM tbl_games "
+            "GROUP BY table_id, game_index HAVING COUNT(*) > 1"
+        )
+    ).scalars()
+    for table_id in list(duplicated):
+        game_ids = conn.execute(
+            sa.text(
+                "SELECT id FROM tbl_games WHERE table_id = :table_id "
+                "ORDER BY game_index, id"
+            ),
+            {"table_id": table_id},
+        ).scalars()
+        conn.execute(
+            sa.text("UPDATE tbl_games SET game_index = :game_index WHERE id = :id"),
+            [
+                {"id": game_id, "game_index": index}
+                for index, game_id in enumerate(game_ids, start=1)
+            ],
+        )
+
+    conn.execute(
+        sa.text(
+            "UPDATE tbl_tables SET last_game_index = COALESCE(("
+            "SELECT MAX(game_index) FROM tbl_games "
+            "WHERE tbl_games.table_id = tbl_tables.id), 0)"
+        )
+    )
+
+    with op.batch_alter_table("tbl_games", schema=None) as batch_op:
+        batch_op.create_unique_constraint(
+            "uq_games_table_game_index", ["table_id", "game_index"]
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("tbl_games", schema=None) as batch_op:
+        batch_op.drop_constraint("uq_games_table_game_index", type_="unique")
+
+    with op.batch_alter_table("tbl_tables", schema=None) as batch_op:
+        batch_op.drop_column("last_game_index")
@@ -6,6 +6,8 @@ import pytest
 
 from app import create_app, db
 from app.models import AccessLevel, Group, ShareLink, Tournament
+from app.utils.rate_counter import group_creation_counter
+from app.utils.share_link_utils import share_link_cache
 
 pytest_plugins = ["tests.utils.test_data_factory"]
 
@@ -148,3 +150,5 @@ def clean_db(db_session):
     for tbl in reversed(db.metadata.sorted_tables):
         db_session.execute(tbl.delete())
     db_session.commit()
+    share_link_cache.clear()
+    group_creation_counter.clear()
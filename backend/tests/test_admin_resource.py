@@ -1,6 +1,18 @@
+from datetime import datetime, timedelta, timezone
+
 import pytest
 
-from app.models import Group
+from app.models import (
+    Game,
+    Group,
+    Player,
+    Score,
+    ShareLink,
+    Table,
+    TablePlayer,
+    Tournament,
+    TournamentPlayer,
+)
 
 # ==== 管理者ログイン情報（グローバル変数） ====
 ADMIN_TEST_USER = "admin"
@@ -43,6 +55,102 @@ def test_get_all_groups(admin_logged_in, create_group):
     assert any(g["name"] == "管理者テストグループ" for g in data)
 
 
+def _add_groups(db_session, count, base=None, **fields):
+    """last_updated_at を1分ずつずらしたグループを直接作成"""
+    base = base or datetime(2026, 1, 1, tzinfo=timezone.utc)
+    groups = [
+        Group(
+            name=f"{fields.get('prefix', 'G')}{i:02d}",
+            email=fields.get("email"),
+            created_by="test",
+            last_updated_at=base + timedelta(minutes=i),
+        )
+        for i in range(count)
+    ]
+    db_session.add_all(groups)
+    db_session.commit()
+    return groups
+
+
+def test_get_groups_is_cursor_paginated(admin_logged_in, db_session):
+    """(last_updated_at, id) の降順に limit 件ずつ、カーソルで全件を辿れる"""
+    client = admin_logged_in
+    groups = _add_groups(db_session, 5)
+    # 同じ last_updated_at のグループは id 降順で並ぶ
+    tie = Group(
+        name="G-tie", created_by="test", last_updated_at=groups[2].last_updated_at
+    )
+    db_session.add(tie)
+    db_session.commit()
+
+    names, cursor, pages = [], None, 0
+    while True:
+        query = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        res = client.get("/api/admin/groups", query_string=query)
+        assert res.status_code == 200
+        page = res.get_json()
+        assert len(page) <= 2
+        names += [g["name"] for g in page]
+        pages += 1
+        cursor = res.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert pages == 3
+    assert names == ["G04", "G03", "G-tie", "G02", "G01", "G00"]
+
+    res = client.get("/api/admin/groups", query_string={"cursor": "broken"})
+    assert res.status_code == 400
+
+
+def test_next_cursor_header_is_exposed_to_cors(admin_logged_in, db_session):
+    """別オリジンの管理画面からも X-Next-Cursor を読める"""
+    _add_groups(db_session, 3)
+    res = admin_logged_in.get(
+        "/api/admin/groups",
+        query_string={"limit": 1},
+        headers={"Origin": "http://localhost:5173"},
+    )
+    assert res.status_code == 200
+    assert res.headers.get("X-Next-Cursor")
+    assert "X-Next-Cursor" in res.headers["Access-Control-Expose-Headers"]
+
+
+def test_get_groups_filters_and_counts(
+    admin_logged_in, db_session, setup_full_tournament
+):
+    client = admin_logged_in
+    data = setup_full_tournament(client)
+    _add_groups(db_session, 3, prefix="Old_", email="old@example.com")
+    _add_groups(db_session, 2, prefix="Oldx")
+
+    res = client.get("/api/admin/groups", query_string={"name_prefix": "Old_"})
+    assert [g["name"] for g in res.get_json()] == ["Old_02", "Old_01", "Old_00"]
+
+    res = client.get("/api/admin/groups", query_string={"email": "old@example.com"})
+    assert len(res.get_json()) == 3
+
+    res = client.get(
+        "/api/admin/groups",
+        query_string={
+            "active_since": "2026-01-01T00:01:00Z",
+            "active_until": "2026-01-01T00:02:00Z",
+        },
+    )
+    assert sorted(g["name"] for g in res.get_json()) == ["Old_01", "Oldx01"]
+
+    res = client.get("/api/admin/groups", query_string={"name_prefix": "Export"})
+    (group,) = res.get_json()
+    assert group["id"] == data["group_data"]["id"]
+    assert group["tournament_count"] == 1
+    assert group["game_count"] == 1
+    assert group["player_count"] == len(data["players"])
+    assert {link["access_level"] for link in group["group_links"]} == {
+        "OWNER",
+        "EDIT",
+        "VIEW",
+    }
+
+
 # -------------------------------------------------
 # 認証エラー（ログインなし）
 # -------------------------------------------------
@@ -75,6 +183,73 @@ def test_delete_group(admin_logged_in, setup_full_tournament, db_session):
     assert deleted is None
 
 
+def test_delete_group_removes_everything_in_chunks(
+    admin_logged_in,
+    setup_full_tournament,
+    create_table,
+    create_game,
+    register_table_players,
+    test_app,
+    db_session,
+    monkeypatch,
+):
+    """配下の全エンティティと全種別の共有リンクを、チャンク単位で削除して件数を返す"""
+    client = admin_logged_in
+    monkeypatch.setitem(test_app.config, "ADMIN_DELETE_CHUNK_SIZE", 2)
+
+    data = setup_full_tournament(client)
+    tournament_edit = data["tournament_links"]["EDIT"]
+    _table, table_links = create_table(tournament_edit, name="2卓目")
+    register_table_players(table_links["EDIT"], data["players"])
+    for _ in range(3):
+        create_game(table_links["EDIT"], data["players"])
+    create_game(data["table_links"]["EDIT"], data["players"])
+    # 別グループのデータは残る
+    other = setup_full_tournament(client)
+
+    remaining = {
+        model: model.query.count()
+        for model in (
+            Tournament,
+            Table,
+            Game,
+            Score,
+            TablePlayer,
+            TournamentPlayer,
+            Player,
+            ShareLink,
+        )
+    }
+
+    res = client.delete(f"/api/admin/groups/{data['group_links']['OWNER']}")
+    assert res.status_code == 200
+    counts = res.get_json()["deleted"]
+    assert counts["group_id"] == data["group_data"]["id"]
+    assert counts["tournament_count"] == 1
+    assert counts["table_count"] == 2
+    assert counts["game_count"] == 5
+    assert counts["score_count"] == 5 * len(data["players"])
+    assert counts["participant_count"] == 2 * len(data["players"])
+    assert counts["tournament_participant_count"] == len(data["players"])
+    assert counts["player_count"] == len(data["players"])
+
+    db_session.expire_all()
+    assert remaining[Game] - Game.query.count() == counts["game_count"]
+    assert remaining[Score] - Score.query.count() == counts["score_count"]
+    assert remaining[ShareLink] - ShareLink.query.count() == counts["share_link_count"]
+    assert Player.query.count() == remaining[Player] - counts["player_count"]
+    # 残った共有リンクは別グループの階層のものだけ
+    other_ids = {
+        ("group", other["group_data"]["id"]),
+        ("tournament", other["tournament_data"]["id"]),
+        ("table", other["table_data"]["id"]),
+    }
+    assert {
+        (link.resource_type, link.resource_id)
+        for link in ShareLink.query.filter(ShareLink.resource_type != "game")
+    } == other_ids
+
+
 # -------------------------------------------------
 # 存在しないグループ削除
 # -------------------------------------------------
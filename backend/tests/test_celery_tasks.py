@@ -0,0 +1,76 @@
+"""Celery タスクの Flask アプリ共有とオーバーヘッドのベンチマーク"""
+
+import logging
+import threading
+import time
+
+from celery import Celery
+from flask import current_app
+
+from app import create_app
+from app.tasks import base, maintenance_task
+
+
+def _run_in_thread(func):
+    """アプリコンテキストを持たない別スレッド（ワーカー相当）で実行する"""
+    result = []
+    thread = threading.Thread(target=lambda: result.append(func()))
+    thread.start()
+    thread.join()
+    return result[0]
+
+
+def test_flask_task_reuses_worker_app(test_app, monkeypatch):
+    created = []
+    monkeypatch.setattr(base, "_flask_app", None)
+    monkeypatch.setattr("app.create_app", lambda: created.append(test_app) or test_app)
+    worker = Celery("tests", task_cls=base.FlaskTask, set_as_current=False)
+
+    @worker.task
+    def current_app_probe():
+        return current_app._get_current_object()
+
+    first = _run_in_thread(current_app_probe)
+    second = _run_in_thread(current_app_probe)
+
+    assert first is second is test_app
+    assert created == [test_app]
+
+
+def test_maintenance_task_runs_in_existing_app_context(db_session):
+    result = maintenance_task.purge_expired_idempotency_records.apply().get()
+    assert result == {"deleted": 0}
+
+
+def test_task_overhead_benchmark(test_app, monkeypatch):
+    """
+    タスク実行ごとのアプリ作成コストを計測してログに出す。
+    時間の大小は環境に左右されるため、検証はアプリの使い回しで行う。
+    """
+    rounds = 3
+    created = []
+    monkeypatch.setattr(base, "_flask_app", None)
+    monkeypatch.setattr("app.create_app", lambda: created.append(test_app) or test_app)
+    worker = Celery("tests", task_cls=base.FlaskTask, set_as_current=False)
+
+    @worker.task
+    def worker_app_probe():
+        return base.get_flask_app()
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        with create_app("testing").app_context():
+            pass
+    per_call = (time.perf_counter() - started) / rounds
+
+    started = time.perf_counter()
+    apps = [_run_in_thread(worker_app_probe) for _ in range(rounds)]
+    shared = (time.perf_counter() - started) / rounds
+
+    logging.getLogger(__name__).info(
+        "task overhead: create_app=%.2fms shared_app=%.3fms",
+        per_call * 1000,
+        shared * 1000,
+    )
+    assert all(app is test_app for app in apps)
+    assert created == [test_app]
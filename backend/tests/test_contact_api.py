@@ -1,8 +1,10 @@
 # backend/tests/contacts/test_contact_api.py
+from datetime import datetime, timedelta
+
 import pytest
 
 from app import db
-from app.models import Contact, ContactStatus
+from app.models import Contact, ContactSearchTerm, ContactStatus
 
 # ==== 管理者ログイン情報（グローバル変数） ====
 ADMIN_TEST_USER = "admin"
@@ -75,6 +77,119 @@ def test_list_contacts(client, admin_logged_in):
     assert data[0]["name"] == "User1"
 
 
+def test_list_contacts_paginates_by_status(client, admin_logged_in):
+    """status 絞り込み + (created_at, id) 降順のカーソルページング、本文は含めない"""
+    client = admin_logged_in
+    base = datetime(2026, 1, 1)
+    for i in range(5):
+        db.session.add(
+            Contact(
+                name=f"User{i}",
+                email=f"u{i}@example.com",
+                subject="sub",
+                message="x" * 300,
+                user_agent="agent",
+                status=ContactStatus.RECEIVED if i % 2 == 0 else ContactStatus.CLOSED,
+                created_at=base + timedelta(minutes=i),
+            )
+        )
+    db.session.commit()
+
+    res = client.get(
+        "/api/admin/contacts", query_string={"status": "received", "limit": 2}
+    )
+    assert res.status_code == 200
+    first = res.get_json()
+    assert [c["name"] for c in first] == ["User4", "User2"]
+    assert "message" not in first[0]
+    assert "user_agent" not in first[0]
+    assert first[0]["message_preview"] == "x" * 100
+
+    res = client.get(
+        "/api/admin/contacts",
+        query_string={
+            "status": "received",
+            "limit": 2,
+            "cursor": res.headers["X-Next-Cursor"],
+        },
+    )
+    assert [c["name"] for c in res.get_json()] == ["User0"]
+    assert "X-Next-Cursor" not in res.headers
+
+
+def test_search_contacts_by_subject_and_message(client, admin_logged_in):
+    """作成・更新時に転置インデックスを作り、件名・本文を全文検索できる"""
+    for subject, message in (
+        ("ログインできません", "Error 500 が表示されます"),
+        ("機能要望", "スコアの CSV 出力がほしい"),
+    ):
+        res = client.post(
+            "/api/contacts/",
+            json={
+                "name": "Taro",
+                "email": "taro@example.com",
+                "subject": subject,
+                "message": message,
+                "recaptcha_token": "dummy-token",
+            },
+        )
+        assert res.status_code == 201
+    login_id = Contact.query.filter_by(subject="ログインできません").one().id
+
+    def _search(q):
+        res = admin_logged_in.get("/api/admin/contacts", query_string={"q": q})
+        assert res.status_code == 200
+        return [c["subject"] for c in res.get_json()]
+
+    assert _search("ログイン") == ["ログインできません"]
+    assert _search("error 表示") == ["ログインできません"]
+    assert _search("ＣＳＶ") == ["機能要望"]
+    assert _search("ログイン csv") == []
+    assert _search("!!") == []
+
+    # 本文を更新するとインデックスも置き換わる
+    res = admin_logged_in.patch(
+        f"/api/admin/contacts/{login_id}", json={"message": "CSV が文字化けします"}
+    )
+    assert res.status_code == 200
+    assert _search("error") == []
+    assert sorted(_search("csv")) == ["ログインできません", "機能要望"]
+
+    # 削除すると検索語も消える
+    assert admin_logged_in.delete(f"/api/admin/contacts/{login_id}").status_code == 204
+    assert ContactSearchTerm.query.filter_by(contact_id=login_id).count() == 0
+
+
+def test_search_contacts_by_single_character(client, admin_logged_in):
+    """1文字の検索語でも、その文字を含む語（卓球・麻雀）に一致する"""
+    for subject, message in (
+        ("卓球の大会", "結果を登録したい"),
+        ("麻雀の点数", "計算が合いません"),
+    ):
+        res = client.post(
+            "/api/contacts/",
+            json={
+                "name": "Taro",
+                "email": "taro@example.com",
+                "subject": subject,
+                "message": message,
+                "recaptcha_token": "dummy-token",
+            },
+        )
+        assert res.status_code == 201
+
+    def _search(q):
+        res = admin_logged_in.get("/api/admin/contacts", query_string={"q": q})
+        assert res.status_code == 200
+        return [c["subject"] for c in res.get_json()]
+
+    assert _search("卓") == ["卓球の大会"]
+    assert _search("麻") == ["麻雀の点数"]
+    assert _search("球 結果") == ["卓球の大会"]
+    assert _search("卓球") == ["卓球の大会"]
+    assert _search("の") == ["麻雀の点数", "卓球の大会"]
+
+
 # ===============================
 # GET ONE
 # ===============================
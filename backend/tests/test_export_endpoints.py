@@ -1,6 +1,42 @@
+import csv
+import io
+import json
+
 import pytest
 
-from app.models import AccessLevel
+from app.api.services.export_service import iter_score_export_rows
+from app.models import (
+    AccessLevel,
+    Game,
+    Group,
+    Player,
+    Score,
+    ShareLink,
+    Table,
+    Tournament,
+    TournamentPlayer,
+)
+from tests.utils.decimal_sum import DecimalSumFunc
+from tests.utils.query_counter import count_queries
+
+
+def _add_scored_tournament(db_session, group_id, player_ids, name):
+    """参加者全員が1半荘打った大会を作成（共有リンクなし）"""
+    tournament = Tournament(group_id=group_id, name=name, created_by="test")
+    db_session.add(tournament)
+    db_session.flush()
+    table = Table(tournament_id=tournament.id, name="卓", created_by="test")
+    db_session.add(table)
+    db_session.flush()
+    game = Game(table_id=table.id, game_index=1, created_by="test")
+    db_session.add(game)
+    db_session.flush()
+    for player_id, score in zip(player_ids, (300, 100, -100, -300)):
+        db_session.add(
+            TournamentPlayer(tournament_id=tournament.id, player_id=player_id)
+        )
+        db_session.add(Score(game_id=game.id, player_id=player_id, score=score))
+    db_session.commit()
 
 
 @pytest.mark.api
@@ -77,3 +113,182 @@ class TestExportEndpoints:
         # --- 存在しないキーで404 ---
         res_404 = client.get("/api/groups/xxxxxx/summary")
         assert res_404.status_code == 404
+
+    def test_group_summary_aggregates_in_constant_queries(self, client, db_session):
+        """大会数に関係なく一定回数のSQLで集計し、VIEWリンクのない大会も含める"""
+        group = Group(name="summary", created_by="test")
+        db_session.add(group)
+        db_session.flush()
+        players = [Player(group_id=group.id, name=f"P{i}") for i in range(4)]
+        db_session.add_all(players)
+        db_session.add(
+            ShareLink(
+                short_key="summary-view",
+                resource_type="group",
+                resource_id=group.id,
+                access_level=AccessLevel.VIEW,
+                created_by="test",
+            )
+        )
+        db_session.commit()
+        player_ids = [p.id for p in players]
+        # 参加者のいない大会
+        db_session.add(Tournament(group_id=group.id, name="empty", created_by="test"))
+        _add_scored_tournament(db_session, group.id, player_ids, "T0")
+
+        with count_queries() as few:
+            res = client.get("/api/groups/summary-view/summary")
+        assert res.status_code == 200
+
+        for i in range(1, 8):
+            _add_scored_tournament(db_session, group.id, player_ids, f"T{i}")
+        with count_queries() as many:
+            res = client.get("/api/groups/summary-view/summary")
+        assert res.status_code == 200
+        assert len(many) == len(few)
+
+        tournaments = res.get_json()["tournaments"]
+        assert [t["tournament"]["name"] for t in tournaments] == [
+            "empty",
+            *(f"T{i}" for i in range(8)),
+        ]
+        assert tournaments[0]["players"] == []
+        for t in tournaments[1:]:
+            assert [p["id"] for p in t["players"]] == player_ids
+            assert [p["total_score"] for p in t["players"]] == [300, 100, -100, -300]
+            assert all(p["games_played"] == 1 for p in t["players"])
+
+    def test_summary_total_score_is_integer_when_sum_returns_decimal(
+        self, client, db_session, monkeypatch
+    ):
+        """MySQL の SUM() は Decimal を返すが、合計点は整数で集計する"""
+        group = Group(name="summary", created_by="test")
+        db_session.add(group)
+        db_session.flush()
+        players = [Player(group_id=group.id, name=f"P{i}") for i in range(4)]
+        db_session.add_all(players)
+        db_session.add(
+            ShareLink(
+                short_key="summary-view",
+                resource_type="group",
+                resource_id=group.id,
+                access_level=AccessLevel.VIEW,
+                created_by="test",
+            )
+        )
+        db_session.commit()
+        _add_scored_tournament(db_session, group.id, [p.id for p in players], "T0")
+        monkeypatch.setattr("app.api.services.export_service.func", DecimalSumFunc())
+
+        # CSV / NDJSON の行もこの集計から作るため、サービス層の値の型を確認する
+        totals = [
+            row["total_score"]
+            for row in iter_score_export_rows(Tournament.group_id == group.id)
+        ]
+        assert totals == [300, 100, -100, -300]
+        assert all(type(total) is int for total in totals)
+
+        res = client.get("/api/groups/summary-view/summary")
+        assert res.status_code == 200
+        players = res.get_json()["tournaments"][0]["players"]
+        assert [p["total_score"] for p in players] == totals
+
+
+def _create_history_group(db_session, tournaments=1):
+    """VIEWリンク history-view を持つ、対局済み大会を含むグループ"""
+    group = Group(name="history", created_by="test")
+    db_session.add(group)
+    db_session.flush()
+    players = [Player(group_id=group.id, name=f"P{i}") for i in range(4)]
+    db_session.add_all(players)
+    db_session.add(
+        ShareLink(
+            short_key="history-view",
+            resource_type="group",
+            resource_id=group.id,
+            access_level=AccessLevel.VIEW,
+            created_by="test",
+        )
+    )
+    db_session.commit()
+    player_ids = [p.id for p in players]
+    for i in range(tournaments):
+        _add_scored_tournament(db_session, group.id, player_ids, f"T{i}")
+    return group, player_ids
+
+
+@pytest.mark.api
+class TestGameHistoryStream:
+    """GET /api/groups/<group_key>/games/export"""
+
+    def test_streams_ndjson_in_game_order_and_since(self, client, db_session):
+        _group, player_ids = _create_history_group(db_session, tournaments=3)
+        # 他グループの対局は含めない
+        other = Group(name="other", created_by="test")
+        db_session.add(other)
+        db_session.flush()
+        other_player = Player(group_id=other.id, name="X")
+        db_session.add(other_player)
+        db_session.flush()
+        _add_scored_tournament(db_session, other.id, [other_player.id], "other")
+
+        res = client.get("/api/groups/history-view/games/export")
+        assert res.status_code == 200
+        assert res.is_streamed
+        assert res.mimetype == "application/x-ndjson"
+        rows = [json.loads(line) for line in res.get_data(as_text=True).splitlines()]
+        assert len(rows) == 3 * len(player_ids)
+        game_ids = [r["game_id"] for r in rows]
+        assert game_ids == sorted(game_ids)
+        assert {r["tournament_name"] for r in rows} == {"T0", "T1", "T2"}
+        assert rows[0]["player_id"] == player_ids[0]
+        assert rows[0]["score"] == 300
+        assert rows[0]["table_type"] == "NORMAL"
+
+        # 前回取得分の最大 game_id 以降だけを差分取得
+        res = client.get(
+            "/api/groups/history-view/games/export",
+            query_string={"since_game_id": game_ids[0]},
+        )
+        newer = [json.loads(line) for line in res.get_data(as_text=True).splitlines()]
+        assert {r["game_id"] for r in newer} == set(game_ids[len(player_ids) :])
+
+        res = client.get(
+            "/api/groups/history-view/games/export",
+            query_string={"since_game_id": game_ids[-1]},
+        )
+        assert res.status_code == 200
+        assert res.get_data(as_text=True) == ""
+
+    def test_streams_csv_and_rejects_unknown_key(self, client, db_session):
+        _create_history_group(db_session)
+
+        res = client.get(
+            "/api/groups/history-view/games/export", query_string={"format": "csv"}
+        )
+        assert res.status_code == 200
+        assert res.mimetype == "text/csv"
+        rows = list(csv.DictReader(io.StringIO(res.get_data(as_text=True))))
+        assert [int(r["score"]) for r in rows] == [300, 100, -100, -300]
+
+        assert client.get("/api/groups/xxxxxx/games/export").status_code == 404
+        res = client.get(
+            "/api/groups/history-view/games/export",
+            query_string={"since_game_id": -1},
+        )
+        assert res.status_code == 422
+
+    def test_history_is_read_in_constant_queries(self, client, db_session):
+        """履歴の件数に関係なく、対局データは1本のクエリで順に読み出す"""
+        group, player_ids = _create_history_group(db_session)
+        with count_queries() as few:
+            res = client.get("/api/groups/history-view/games/export")
+            res.get_data()
+
+        for i in range(1, 10):
+            _add_scored_tournament(db_session, group.id, player_ids, f"T{i}")
+        with count_queries() as many:
+            res = client.get("/api/groups/history-view/games/export")
+            body = res.get_data(as_text=True)
+        assert len(many) == len(few)
+        assert len(body.splitlines()) == 10 * len(player_ids)
@@ -2,7 +2,30 @@ from datetime import datetime
 
 import pytest
 
-from app.models import Tournament
+from app.models import PlayerStatsRollup, Tournament
+
+
+def _stats(client, group_key):
+    res = client.get(f"/api/groups/{group_key}/player_stats")
+    assert res.status_code == 200, res.data
+    return sorted(res.get_json()["players"], key=lambda p: p["player_id"])
+
+
+def _rollup_rows(db_session):
+    db_session.expire_all()
+    return sorted(
+        (
+            r.player_id,
+            r.tournament_id,
+            r.game_count,
+            r.rank1_count,
+            r.rank4_or_lower_count,
+            r.rank_sum,
+            r.score_sum,
+            r.balance,
+        )
+        for r in PlayerStatsRollup.query.all()
+    )
 
 
 @pytest.mark.usefixtures("client")
@@ -41,7 +64,7 @@ class TestGroupPlayerStatsAPI:
         tournaments = db_session.query(Tournament).all()
         assert len(tournaments) >= 1
         t = tournaments[0]
-        t.started_at = datetime(2025, 5, 1)  # noqa: DTZ001
+        t.started_at = datetime(2025, 5, 1)
         db_session.commit()
 
         # --- フィルタ範囲内（ヒットする） ---
@@ -70,3 +93,66 @@ class TestGroupPlayerStatsAPI:
         )
         # サービス内でServiceNotFoundErrorがraiseされ、JSONエラーレスポンスとなる想定
         assert res.status_code == 422
+
+
+class TestPlayerStatsRollup:
+    """成績統計ロールアップの差分更新と再構築"""
+
+    def test_rollup_tracks_game_changes(
+        self, client, db_session, test_app, setup_full_tournament, create_game
+    ):
+        data = setup_full_tournament(client)
+        group_key = data["group_links"]["VIEW"]
+        table_key = data["table_links"]["EDIT"]
+        tournament_key = data["tournament_links"]["EDIT"]
+        players = data["players"]
+
+        second = create_game(table_key, players)
+        res = client.put(
+            f"/api/tables/{table_key}/games/{data['game']['id']}",
+            json={
+                "scores": [
+                    {"player_id": players[0]["id"], "score": -20000},
+                    {"player_id": players[1]["id"], "score": 10000},
+                    {"player_id": players[2]["id"], "score": 6000},
+                    {"player_id": players[3]["id"], "score": 4000},
+                ]
+            },
+        )
+        assert res.status_code == 200, res.data
+        create_game(table_key, players)
+        res = client.delete(f"/api/tables/{table_key}/games/{second['id']}")
+        assert res.status_code in (200, 204), res.data
+        res = client.put(f"/api/tournaments/{tournament_key}", json={"rate": 0.5})
+        assert res.status_code == 200, res.data
+
+        incremental = _stats(client, group_key)
+        top = next(p for p in incremental if p["player_id"] == players[0]["id"])
+        assert top["game_count"] == 2
+        assert top["rank1_count"] == 1
+        assert top["rank4_or_lower_count"] == 1
+        assert top["average_rank"] == 2.5
+        assert top["total_score"] == 5000
+        assert top["total_balance"] == 2500
+        rows = _rollup_rows(db_session)
+
+        # --- CLI で作り直しても結果が一致する ---
+        result = test_app.test_cli_runner().invoke(args=["rebuild-player-stats"])
+        assert result.exit_code == 0, result.output
+        assert "4 rows" in result.output
+        assert _rollup_rows(db_session) == rows
+        assert _stats(client, group_key) == incremental
+
+    def test_chip_table_is_excluded_after_type_change(
+        self, client, db_session, setup_full_tournament
+    ):
+        data = setup_full_tournament(client)
+        group_key = data["group_links"]["VIEW"]
+        assert len(_stats(client, group_key)) == 4
+
+        res = client.put(
+            f"/api/tables/{data['table_links']['EDIT']}", json={"type": "CHIP"}
+        )
+        assert res.status_code == 200, res.data
+        assert _stats(client, group_key) == []
+        assert _rollup_rows(db_session) == []
@@ -0,0 +1,231 @@
+import csv
+import io
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+
+from app.api.services.export_job_service import (
+    fail_stale_export_jobs,
+    purge_expired_export_jobs,
+)
+from app.models import AccessLevel, ExportFormat, ExportJob, ExportJobStatus
+from app.tasks.export_tasks import run_export_job_task
+from app.utils.export_format import format_lines
+
+
+@pytest.fixture()
+def export_env(test_app, tmp_path, monkeypatch):
+    """出力先を一時ディレクトリにし、delay() をその場で実行させる"""
+    monkeypatch.setitem(test_app.config, "EXPORT_DIR", str(tmp_path))
+    with patch(
+        "app.api.services.export_job_service.run_export_job_task.delay",
+        side_effect=run_export_job_task,
+    ) as mock_delay:
+        yield mock_delay
+
+
+@pytest.fixture()
+def scored_group(
+    create_group,
+    create_players,
+    create_tournament,
+    create_table,
+    create_game,
+    register_tournament_participants,
+    register_table_players,
+):
+    """2大会・各1卓で1半荘ずつ打ったグループ"""
+    _group, group_links = create_group()
+    group_key = group_links[AccessLevel.EDIT.value]
+    players = create_players(group_key)
+    tournament_keys = []
+    for name in ("Spring Cup", "Summer Cup"):
+        _t, t_links = create_tournament(group_key, name=name)
+        register_tournament_participants(t_links[AccessLevel.EDIT.value], players)
+        _table, table_links = create_table(t_links[AccessLevel.EDIT.value])
+        register_table_players(table_links[AccessLevel.EDIT.value], players)
+        create_game(table_links[AccessLevel.EDIT.value], players)
+        tournament_keys.append(t_links[AccessLevel.VIEW.value])
+    return {
+        "group_key": group_links[AccessLevel.VIEW.value],
+        "tournament_keys": tournament_keys,
+        "players": players,
+    }
+
+
+@pytest.mark.api
+class TestExportJobs:
+    """非同期エクスポートジョブ（作成 → ポーリング → ダウンロード）"""
+
+    def test_enqueue_failure_marks_job_failed(self, client, test_app, scored_group):
+        with patch(
+            "app.api.services.export_job_service.run_export_job_task.delay",
+            side_effect=ConnectionError("broker is down"),
+        ):
+            res = client.post(
+                "/api/exports",
+                json={"kind": "game_history", "key": scored_group["group_key"]},
+            )
+        assert res.status_code == 503
+
+        with test_app.app_context():
+            (job,) = ExportJob.query.all()
+            assert job.status == ExportJobStatus.FAILED
+            assert job.error == "broker is down"
+            assert job.finished_at is not None
+
+    def test_game_history_csv_roundtrip(self, client, export_env, scored_group):
+        res = client.post(
+            "/api/exports",
+            json={"kind": "game_history", "key": scored_group["group_key"]},
+        )
+        assert res.status_code == 202
+        job_key = res.get_json()["job_key"]
+        export_env.assert_called_once_with(job_key)
+
+        res = client.get(f"/api/exports/{job_key}")
+        assert res.status_code == 200
+        status = res.get_json()
+        assert status["status"] == "succeeded"
+        assert status["format"] == "csv"
+        # 2大会 × 1半荘 × 4人
+        assert status["row_count"] == 8
+
+        res = client.get(f"/api/exports/{job_key}/download")
+        assert res.status_code == 200
+        assert res.mimetype == "text/csv"
+        assert "attachment" in res.headers["Content-Disposition"]
+        rows = list(csv.DictReader(io.StringIO(res.get_data(as_text=True))))
+        assert len(rows) == 8
+        assert {r["tournament_name"] for r in rows} == {"Spring Cup", "Summer Cup"}
+        assert [int(r["game_id"]) for r in rows] == sorted(
+            int(r["game_id"]) for r in rows
+        )
+
+    def test_tournament_scores_ndjson(self, client, export_env, scored_group):
+        res = client.post(
+            "/api/exports",
+            json={
+                "kind": "tournament_scores",
+                "key": scored_group["tournament_keys"][0],
+                "format": "ndjson",
+            },
+        )
+        assert res.status_code == 202
+        job_key = res.get_json()["job_key"]
+
+        res = client.get(f"/api/exports/{job_key}/download")
+        assert res.status_code == 200
+        assert res.mimetype == "application/x-ndjson"
+        records = [json.loads(line) for line in res.get_data(as_text=True).splitlines()]
+        assert len(records) == len(scored_group["players"])
+        assert {r["tournament_name"] for r in records} == {"Spring Cup"}
+        assert all(r["games_played"] == 1 for r in records)
+
+    def test_group_summary_requires_group_key(self, client, export_env, scored_group):
+        res = client.post(
+            "/api/exports",
+            json={"kind": "group_summary", "key": scored_group["tournament_keys"][0]},
+        )
+        assert res.status_code == 404
+
+        res = client.post("/api/exports", json={"kind": "unknown", "key": "x"})
+        assert res.status_code == 422
+        export_env.assert_not_called()
+
+    def test_pending_job_cannot_be_downloaded(
+        self, client, db_session, export_env, scored_group
+    ):
+        export_env.side_effect = None  # ワーカー未処理の状態
+        res = client.post(
+            "/api/exports",
+            json={"kind": "group_summary", "key": scored_group["group_key"]},
+        )
+        job_key = res.get_json()["job_key"]
+
+        assert client.get(f"/api/exports/{job_key}").get_json()["status"] == "pending"
+        assert client.get(f"/api/exports/{job_key}/download").status_code == 409
+        assert client.get("/api/exports/unknown-job").status_code == 404
+
+        # 同じジョブが二重に配送されても1回だけ処理される
+        assert run_export_job_task(job_key)["status"] == "succeeded"
+        assert run_export_job_task(job_key)["status"] == "skipped"
+
+    def test_expired_job_is_gone_and_purged(
+        self, client, db_session, export_env, scored_group
+    ):
+        res = client.post(
+            "/api/exports",
+            json={"kind": "group_summary", "key": scored_group["group_key"]},
+        )
+        job_key = res.get_json()["job_key"]
+        file_path = ExportJob.query.filter_by(job_key=job_key).one().file_path
+
+        ExportJob.query.filter_by(job_key=job_key).update(
+            {"expires_at": datetime.now(timezone.utc) - timedelta(minutes=1)}
+        )
+        db_session.commit()
+        assert client.get(f"/api/exports/{job_key}/download").status_code == 410
+
+        assert purge_expired_export_jobs() == 1
+        assert ExportJob.query.filter_by(job_key=job_key).first() is None
+        assert not os.path.exists(file_path)
+
+    def test_stale_running_job_is_failed_and_tmp_file_purged(
+        self, client, db_session, export_env, tmp_path, scored_group
+    ):
+        export_env.side_effect = None  # ワーカーが生成途中で停止した状態を作る
+        res = client.post(
+            "/api/exports",
+            json={"kind": "group_summary", "key": scored_group["group_key"]},
+        )
+        job_key = res.get_json()["job_key"]
+        tmp_file = tmp_path / f"{job_key}.csv.tmp"
+        tmp_file.write_text("player_id\n")
+        ExportJob.query.filter_by(job_key=job_key).update(
+            {
+                "status": ExportJobStatus.RUNNING,
+                "started_at": datetime.now(timezone.utc) - timedelta(minutes=5),
+            }
+        )
+        db_session.commit()
+
+        # 閾値内なら生成中とみなして触らない
+        assert fail_stale_export_jobs() == 0
+        assert tmp_file.exists()
+
+        ExportJob.query.filter_by(job_key=job_key).update(
+            {"started_at": datetime.now(timezone.utc) - timedelta(hours=2)}
+        )
+        db_session.commit()
+        assert fail_stale_export_jobs() == 1
+        status = client.get(f"/api/exports/{job_key}").get_json()
+        assert status["status"] == "failed"
+        assert status["error"]
+        assert not tmp_file.exists()
+
+        # 期限切れの削除では生成途中のファイルも残さない
+        tmp_file.write_text("player_id\n")
+        ExportJob.query.filter_by(job_key=job_key).update(
+            {"expires_at": datetime.now(timezone.utc) - timedelta(minutes=1)}
+        )
+        db_session.commit()
+        assert purge_expired_export_jobs() == 1
+        assert not tmp_file.exists()
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("fmt", [ExportFormat.CSV, ExportFormat.NDJSON])
+def test_decimal_values_are_written_as_numbers(fmt):
+    """MySQL の集計値（Decimal）も数値として書き出せる"""
+    rows = [{"total_score": Decimal(1200), "average_rank": Decimal("2.25")}]
+    lines = list(format_lines(fmt, rows, ["total_score", "average_rank"]))
+
+    if fmt == ExportFormat.CSV:
+        assert lines[1] == "1200,2.25\r\n"
+    else:
+        assert json.loads(lines[0]) == {"total_score": 1200, "average_rank": 2.25}
@@ -1,6 +1,7 @@
 import pytest
+from sqlalchemy.exc import IntegrityError
 
-from app.models import AccessLevel, Game
+from app.models import AccessLevel, Game, Table
 
 
 @pytest.mark.api
@@ -47,6 +48,28 @@ class TestGameEndpoints:
         )
         assert res.status_code == 403
 
+    def test_games_with_non_table_key_are_not_found(
+        self, client, db_session, setup_full_tournament
+    ):
+        """卓以外（大会など）の共有キーは 403 ではなく 404"""
+        data = setup_full_tournament(client)
+        tournament_edit = data["tournament_links"][AccessLevel.EDIT.value]
+        players = data["players"]
+        scores = [
+            {"player_id": players[0]["id"], "score": 25000},
+            {"player_id": players[1]["id"], "score": -8000},
+            {"player_id": players[2]["id"], "score": -8000},
+            {"player_id": players[3]["id"], "score": -9000},
+        ]
+        res = client.post(
+            f"/api/tables/{tournament_edit}/games",
+            json={"memo": "wrong key", "scores": scores},
+        )
+        assert res.status_code == 404
+
+        res = client.get(f"/api/tables/{tournament_edit}/games")
+        assert res.status_code == 404
+
     def test_get_game_requires_view(self, client, db_session, setup_full_tournament):
         data = setup_full_tournament(client)
         table_links = data["table_links"]
@@ -104,3 +127,60 @@ class TestGameEndpoints:
         assert allowed.status_code == 200
         assert allowed.get_json()["message"] == "Game deleted"
         assert db_session.get(Game, game["id"]) is None
+
+    def test_game_index_is_allocated_from_table_counter(
+        self, client, db_session, setup_full_tournament, create_game
+    ):
+        data = setup_full_tournament(client)
+        table_key = data["table_links"][AccessLevel.EDIT.value]
+        second = create_game(table_key, data["players"])
+
+        assert data["game"]["game_index"] == 1
+        assert second["game_index"] == 2
+        assert db_session.get(Table, data["table_data"]["id"]).last_game_index == 2
+
+    def test_stale_counter_is_resynced_on_conflict(
+        self, client, db_session, setup_full_tournament, create_game
+    ):
+        data = setup_full_tournament(client)
+        table = db_session.get(Table, data["table_data"]["id"])
+        table.last_game_index = 0
+        db_session.commit()
+
+        game = create_game(data["table_links"][AccessLevel.EDIT.value], data["players"])
+
+        assert game["game_index"] == 2
+        db_session.refresh(table)
+        assert table.last_game_index == 2
+
+    def test_duplicate_game_index_is_rejected(
+        self, client, db_session, setup_full_tournament, create_game
+    ):
+        data = setup_full_tournament(client)
+        table_key = data["table_links"][AccessLevel.EDIT.value]
+        second = create_game(table_key, data["players"])
+
+        res = client.put(
+            f"/api/tables/{table_key}/games/{second['id']}", json={"game_index": 1}
+        )
+        assert res.status_code == 409
+
+        db_session.add(
+            Game(table_id=data["table_data"]["id"], game_index=1, created_by="test")
+        )
+        with pytest.raises(IntegrityError):
+            db_session.flush()
+        db_session.rollback()
+
+    def test_moved_game_index_advances_counter(
+        self, client, db_session, setup_full_tournament, create_game
+    ):
+        data = setup_full_tournament(client)
+        table_key = data["table_links"][AccessLevel.EDIT.value]
+        res = client.put(
+            f"/api/tables/{table_key}/games/{data['game']['id']}",
+            json={"game_index": 5},
+        )
+        assert res.status_code == 200
+
+        assert create_game(table_key, data["players"])["game_index"] == 6
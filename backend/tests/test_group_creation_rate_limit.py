@@ -0,0 +1,95 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.api.services.group_service import (
+    check_group_creation_rate_limit,
+    record_group_creation_request,
+)
+from app.models import GroupCreationToken
+from app.service_errors import ServicePermissionError
+from app.utils.rate_counter import group_creation_counter
+from tests.utils.query_counter import count_queries
+
+
+def _issue(email, ip_address):
+    """サービスと同じ順序（全ウィンドウの確認 → 発行後に記録）"""
+    check_group_creation_rate_limit(email, ip_address)
+    assert record_group_creation_request(email, ip_address) is None
+
+
+def test_counter_blocks_without_querying_tokens(db_session):
+    for _ in range(3):
+        _issue("a@example.com", "10.0.0.1")
+
+    with count_queries() as statements, pytest.raises(ServicePermissionError):
+        check_group_creation_rate_limit("a@example.com", "10.0.0.2")
+    assert statements == []
+
+    # 別のメールアドレス・IPは影響を受けない
+    check_group_creation_rate_limit("b@example.com", "10.0.0.2")
+
+
+def test_counter_limits_requests_per_ip(db_session):
+    for i in range(5):
+        _issue(f"user{i}@example.com", "10.0.0.1")
+
+    with pytest.raises(ServicePermissionError, match="同一IP"):
+        check_group_creation_rate_limit("new@example.com", "10.0.0.1")
+
+
+def test_rejected_request_does_not_consume_other_windows(db_session):
+    """1日の上限で拒否されたリクエストは IP のウィンドウを消費しない"""
+    for _ in range(10):
+        group_creation_counter.hit("10 per day", "group-creation", "email", "d@x.jp")
+
+    for _ in range(3):
+        with pytest.raises(ServicePermissionError, match="本日"):
+            check_group_creation_rate_limit("d@x.jp", "10.0.0.1")
+
+    # 同じ IP からの別メールアドレスは 5 回まで発行できる
+    for i in range(5):
+        _issue(f"user{i}@example.com", "10.0.0.1")
+    with pytest.raises(ServicePermissionError, match="同一IP"):
+        check_group_creation_rate_limit("new@example.com", "10.0.0.1")
+
+
+def test_record_reports_window_filled_after_check(db_session):
+    """確認後に同時リクエストで上限に達した場合は記録時に検出する"""
+    check_group_creation_rate_limit("race@example.com", "10.0.0.1")
+    for i in range(5):
+        _issue(f"user{i}@example.com", "10.0.0.1")
+
+    message = record_group_creation_request("race@example.com", "10.0.0.1")
+    assert message and "同一IP" in message
+
+
+def test_counter_check_and_record_are_one_hit():
+    """確認と記録は1回の hit で行い、上限を超えた分は記録しない"""
+    assert all(
+        group_creation_counter.hit("2 per hour", "test", "ip", "10.0.0.9")
+        for _ in range(2)
+    )
+    assert not group_creation_counter.hit("2 per hour", "test", "ip", "10.0.0.9")
+    assert group_creation_counter.hit("2 per hour", "test", "ip", "10.0.0.8")
+
+
+def test_db_fallback_counts_recent_tokens(db_session, monkeypatch):
+    monkeypatch.setattr(group_creation_counter, "_limiter", None)
+    now = datetime.now(timezone.utc)
+    for i in range(5):
+        db_session.add(
+            GroupCreationToken(
+                email=f"user{i}@example.com",
+                group_name="g",
+                token=f"token-{i}",
+                expires_at=now + timedelta(minutes=30),
+                ip_address="10.0.0.1",
+                created_at=now - timedelta(minutes=10),
+            )
+        )
+    db_session.commit()
+
+    with pytest.raises(ServicePermissionError, match="同一IP"):
+        check_group_creation_rate_limit("new@example.com", "10.0.0.1")
+    check_group_creation_rate_limit("new@example.com", "10.0.0.2")
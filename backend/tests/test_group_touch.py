@@ -0,0 +1,132 @@
+"""Group.last_updated_at / revision の一括更新（commit 直前に1回）"""
+
+from datetime import datetime, timezone
+
+from app.models import (
+    AccessLevel,
+    Game,
+    Group,
+    Player,
+    Score,
+    ShareLink,
+    Table,
+    Tournament,
+)
+from tests.utils.query_counter import count_queries
+
+
+def _group_updates(statements):
+    return [s for s in statements if s.lstrip().upper().startswith("UPDATE TBL_GROUPS")]
+
+
+def _revision(db_session, group_id):
+    db_session.expire_all()
+    return db_session.get(Group, group_id).revision
+
+
+def _make_group(db_session):
+    group = Group(name="touch", created_by="test")
+    db_session.add(group)
+    db_session.flush()
+    db_session.add(
+        ShareLink(
+            short_key="touch-edit",
+            resource_type="group",
+            resource_id=group.id,
+            access_level=AccessLevel.EDIT,
+            created_by="test",
+        )
+    )
+    db_session.commit()
+    return group.id
+
+
+def test_bulk_writes_issue_single_group_update(client, db_session):
+    group_id = _make_group(db_session)
+    before = _revision(db_session, group_id)
+
+    with count_queries() as statements:
+        res = client.post(
+            "/api/v2/groups/touch-edit/tournaments",
+            json={
+                "name": "大会",
+                "initial_tables": [
+                    {"client_id": str(i), "name": f"{i}卓"} for i in range(5)
+                ],
+            },
+        )
+    assert res.status_code == 201
+    assert len(_group_updates(statements)) == 1
+    assert _revision(db_session, group_id) == before + 1
+
+
+def test_cascaded_deletes_resolve_to_surviving_group(db_session):
+    group_id = _make_group(db_session)
+    player = Player(group_id=group_id, name="P")
+    tournament = Tournament(group_id=group_id, name="t", created_by="test")
+    db_session.add_all([player, tournament])
+    db_session.flush()
+    table = Table(tournament_id=tournament.id, name="卓", created_by="test")
+    db_session.add(table)
+    db_session.flush()
+    game = Game(table_id=table.id, game_index=1, created_by="test")
+    db_session.add(game)
+    db_session.flush()
+    db_session.add(Score(game_id=game.id, player_id=player.id, score=0))
+    db_session.commit()
+    before = _revision(db_session, group_id)
+
+    db_session.delete(db_session.get(Game, game.id))
+    db_session.delete(db_session.get(Table, table.id))
+    with count_queries() as statements:
+        db_session.commit()
+    assert len(_group_updates(statements)) == 1
+    assert _revision(db_session, group_id) == before + 1
+
+
+def test_savepoint_commit_defers_touch_to_outer_commit(db_session):
+    group_id = _make_group(db_session)
+    before = _revision(db_session, group_id)
+
+    with count_queries() as statements:
+        with db_session.begin_nested():
+            db_session.add(Player(group_id=group_id, name="nested"))
+        db_session.add(Player(group_id=group_id, name="outer"))
+        db_session.commit()
+    assert len(_group_updates(statements)) == 1
+    assert _revision(db_session, group_id) == before + 1
+
+
+def test_rollback_discards_pending_touches(db_session):
+    group_id = _make_group(db_session)
+    before = _revision(db_session, group_id)
+
+    db_session.add(Player(group_id=group_id, name="rolled back"))
+    db_session.flush()
+    db_session.rollback()
+    db_session.commit()
+
+    assert _revision(db_session, group_id) == before
+
+
+def test_min_interval_coalesces_rapid_writes(client, db_session, test_app, monkeypatch):
+    monkeypatch.setitem(test_app.config, "GROUP_TOUCH_MIN_INTERVAL", 60)
+    group_id = _make_group(db_session)
+    db_session.execute(
+        Group.__table__.update()
+        .where(Group.id == group_id)
+        .values(last_updated_at=datetime(2000, 1, 1, tzinfo=timezone.utc))
+    )
+    db_session.commit()
+    before = _revision(db_session, group_id)
+
+    for name in ("A", "B", "C"):
+        db_session.add(Player(group_id=group_id, name=name))
+        db_session.commit()
+
+    assert _revision(db_session, group_id) == before + 1
+    # 間引き期間中は ETag を出さず、常に最新の本文を返す
+    res = client.get("/api/v2/groups/touch-edit/dashboard")
+    assert res.status_code == 200
+    assert "ETag" not in res.headers
+    assert len(res.get_json()["players"]) == 3
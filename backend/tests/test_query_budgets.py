@@ -0,0 +1,49 @@
+"""主要な参照エンドポイントの SQL 発行回数の予算（N+1 の再発を検知する）"""
+
+import pytest
+
+from app.models import AccessLevel
+from tests.utils.query_counter import query_budget
+
+VIEW = AccessLevel.VIEW.value
+
+# (エンドポイント, URL テンプレート, 予算)。対局数を増やしても変わらないこと
+BUDGETS = [
+    ("group dashboard", "/api/v2/groups/{group}/dashboard", 8),
+    ("tournament dashboard", "/api/v2/tournaments/{tournament}/dashboard", 19),
+    ("table dashboard", "/api/v2/tables/{table}/dashboard", 13),
+    ("tournament export", "/api/tournaments/{tournament}/export", 3),
+    ("tournament score map", "/api/tournaments/{tournament}/score_map", 7),
+    ("group summary", "/api/groups/{group}/summary", 2),
+    ("group player stats", "/api/groups/{group}/player_stats", 2),
+    ("group game history", "/api/groups/{group}/games/export", 2),
+]
+
+
+@pytest.fixture()
+def keys(client, setup_full_tournament, create_game):
+    """対局を複数持つ大会を作り、各リソースの VIEW キーを返す"""
+
+    def _build(extra_games):
+        data = setup_full_tournament(client)
+        for _ in range(extra_games):
+            create_game(data["table_links"]["EDIT"], data["players"])
+        return {
+            "group": data["group_links"][VIEW],
+            "tournament": data["tournament_links"][VIEW],
+            "table": data["table_links"][VIEW],
+        }
+
+    return _build
+
+
+@pytest.mark.parametrize(
+    ("name", "url", "budget"), BUDGETS, ids=[b[0] for b in BUDGETS]
+)
+def test_endpoint_query_budget(client, keys, name, url, budget):
+    for extra_games in (0, 5):
+        resource_keys = keys(extra_games)
+        with query_budget(budget, f"{name} ({extra_games} extra games)"):
+            res = client.get(url.format(**resource_keys))
+            res.get_data()  # ストリーミング出力の SQL も含める
+        assert res.status_code == 200
@@ -0,0 +1,60 @@
+import pytest
+
+from app import create_app, db
+from app.extensions import limiter, read_limiter
+from app.models import AccessLevel, Group, ShareLink
+
+
+@pytest.fixture
+def limited_client(test_app):
+    """レート制限を有効にした別アプリ（ストレージはプロセス内）"""
+    app = create_app(
+        "testing",
+        {
+            "RATELIMIT_ENABLED": True,
+            "RATELIMIT_READ_LIMIT": "2 per minute",
+        },
+    )
+    with app.app_context():
+        db.create_all()
+        group = Group(name="g", created_by="test")
+        db.session.add(group)
+        db.session.flush()
+        db.session.add(
+            ShareLink(
+                short_key="limited-view",
+                resource_type="group",
+                resource_id=group.id,
+                access_level=AccessLevel.VIEW,
+                created_by="test",
+            )
+        )
+        db.session.commit()
+        yield app.test_client()
+        db.session.remove()
+        db.drop_all()
+    limiter.reset()
+    read_limiter.reset()
+    # 共有の Limiter をテスト用アプリの設定（無効）に戻す
+    limiter.init_app(test_app)
+    read_limiter.init_app(test_app)
+
+
+def test_limiters_use_configured_storage_and_strategies(limited_client):
+    assert limiter._strategy == "moving-window"
+    assert read_limiter._strategy == "fixed-window"
+    assert type(limiter._storage).__name__ == "MemoryStorage"
+
+
+def test_v2_reads_use_the_read_limit(limited_client):
+    url = "/api/v2/groups/limited-view/dashboard"
+    assert limited_client.get(url).status_code == 200
+    assert limited_client.get(url).status_code == 200
+
+    blocked = limited_client.get(url)
+    assert blocked.status_code == 429
+    assert "Retry-After" in blocked.headers
+
+    # 更新系は参照系の上限の影響を受けない
+    res = limited_client.post("/api/v2/groups:batch-get", json={"groups": []})
+    assert res.status_code != 429
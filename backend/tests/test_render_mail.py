@@ -0,0 +1,78 @@
+"""メールテンプレート描画のキャッシュ確認とベンチマーク"""
+
+import logging
+import time
+
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+from app.tasks import render_mail
+
+CONTEXT = {
+    "email": "user@example.com",
+    "url": "http://localhost/group/create?token=x",
+    "group_name": "麻雀仲間",
+    "expires_at": "2026-01-01 00:00",
+}
+
+
+def _render_with_fresh_environment():
+    """従来実装（呼び出しごとに Environment を作り直してパース）"""
+    env = Environment(
+        loader=FileSystemLoader(render_mail.TEMPLATE_DIR),
+        autoescape=select_autoescape(["html", "xml"]),
+    )
+    return (
+        env.get_template("group_creation.txt").render(**CONTEXT),
+        env.get_template("group_creation.html").render(**CONTEXT),
+    )
+
+
+def test_precompiled_templates_render_without_loader(monkeypatch):
+    assert render_mail.precompile_mail_templates() == 2
+
+    def fail(*args, **kwargs):
+        raise AssertionError("template source was loaded again")
+
+    monkeypatch.setattr(render_mail.env.loader, "get_source", fail)
+    text_body, html_body = render_mail.render_mail_template("group_creation", **CONTEXT)
+
+    assert (text_body, html_body) == _render_with_fresh_environment()
+    assert "麻雀仲間" in text_body
+
+
+def test_render_benchmark_reuses_cached_templates(monkeypatch):
+    """
+    描画時間を計測してログに出す。
+    時間の大小は環境に左右されるため、検証はテンプレートの使い回しで行う。
+    """
+    render_mail.precompile_mail_templates()
+    cached_templates = (
+        render_mail.env.get_template("group_creation.txt"),
+        render_mail.env.get_template("group_creation.html"),
+    )
+    rounds = 50
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        _render_with_fresh_environment()
+    fresh = time.perf_counter() - started
+
+    def fail(*args, **kwargs):
+        raise AssertionError("template source was loaded again")
+
+    monkeypatch.setattr(render_mail.env.loader, "get_source", fail)
+    started = time.perf_counter()
+    for _ in range(rounds):
+        render_mail.render_mail_template("group_creation", **CONTEXT)
+    cached = time.perf_counter() - started
+
+    logging.getLogger(__name__).info(
+        "render x%d: fresh=%.2fms cached=%.2fms",
+        rounds,
+        fresh * 1000,
+        cached * 1000,
+    )
+    assert (
+        render_mail.env.get_template("group_creation.txt"),
+        render_mail.env.get_template("group_creation.html"),
+    ) == cached_templates
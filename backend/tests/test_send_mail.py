@@ -1,8 +1,14 @@
 from email import message_from_string
 from email.header import decode_header, make_header
 from email.utils import parseaddr
+from smtplib import SMTPRecipientsRefused
+
+import pytest
+from celery.exceptions import Retry
 
 from app.mailer import send_mail
+from app.tasks import email_tasks
+from tests.utils.smtp_stub import smtp_stub_server
 
 
 class DummySMTP:
@@ -37,3 +43,141 @@ def test_send_email_sets_sender_display_name(monkeypatch):
     assert sender_address == "noreply@example.com"
     assert result == "smtp:ok"
     assert smtp.quit_called is True
+
+
+# ------------------------------------------------------
+# 接続プール・一括送信（ローカル SMTP スタブ）
+# ------------------------------------------------------
+@pytest.fixture
+def smtp_server(monkeypatch):
+    with smtp_stub_server() as server:
+        monkeypatch.setenv("SMTP_HOST", "127.0.0.1")
+        monkeypatch.setenv("SMTP_PORT", str(server.port))
+        monkeypatch.setenv("MAIL_FROM", "noreply@example.com")
+        monkeypatch.delenv("SMTP_USERNAME", raising=False)
+        yield server
+
+
+def _messages(count):
+    return [
+        send_mail.MailMessage(
+            to=[f"user{i}@example.com"],
+            subject=f"件名{i}",
+            sender_name="麻雀",
+            text="x",
+        )
+        for i in range(count)
+    ]
+
+
+def test_send_emails_delivers_batch_over_one_connection(smtp_server):
+    pool = send_mail.SMTPConnectionPool(size=1)
+
+    assert send_mail.send_emails(_messages(5), pool) == ["smtp:ok"] * 5
+    assert send_mail.send_emails(_messages(2), pool) == ["smtp:ok"] * 2
+    pool.close_all()
+
+    assert smtp_server.connections == 1
+    assert [m[1] for m in smtp_server.messages[:2]] == [
+        ["user0@example.com"],
+        ["user1@example.com"],
+    ]
+    assert len(smtp_server.messages) == 7
+
+
+def test_pool_checks_idle_connection_with_noop(smtp_server):
+    pool = send_mail.SMTPConnectionPool(size=1, noop_after=0)
+    send_mail.send_emails(_messages(1), pool)
+    send_mail.send_emails(_messages(1), pool)
+    pool.close_all()
+
+    assert "NOOP" in smtp_server.commands
+    assert smtp_server.connections == 1
+
+
+def test_pool_reconnects_after_server_disconnect(smtp_server):
+    smtp_server.drop_after_messages = 2
+    pool = send_mail.SMTPConnectionPool(size=1, noop_after=0)
+
+    # 2通目の後に切断 → 3通目は再接続して送信
+    assert send_mail.send_emails(_messages(3), pool) == ["smtp:ok"] * 3
+    assert smtp_server.connections == 2
+    # 4通目の後に切断 → 次回は NOOP で検知して作り直す
+    assert send_mail.send_emails(_messages(1), pool) == ["smtp:ok"]
+    assert send_mail.send_emails(_messages(1), pool) == ["smtp:ok"]
+    pool.close_all()
+
+    assert len(smtp_server.messages) == 5
+    assert smtp_server.connections == 3
+
+
+def test_group_creation_email_task_retries_with_backoff(monkeypatch):
+    def fail(messages):
+        raise send_mail.MailSendError("down")
+
+    monkeypatch.setattr(email_tasks, "send_emails", fail)
+    monkeypatch.setattr(email_tasks, "render_mail_template", lambda *a, **k: ("", ""))
+
+    with pytest.raises(Retry) as exc_info:
+        email_tasks.send_group_creation_email_task.apply(
+            args=("user@example.com", "http://x", "g", "2026-01-01 00:00"),
+            throw=True,
+        )
+    assert exc_info.value.when == email_tasks.retry_countdown(0) == 30
+    assert email_tasks.retry_countdown(10) == email_tasks.MAIL_RETRY_MAX_DELAY
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        SMTPRecipientsRefused({"user@example.com": (550, b"No such user")}),
+        UnicodeEncodeError("ascii", "麻", 0, 1, "x"),
+    ],
+)
+def test_send_emails_marks_permanent_failures(smtp_server, monkeypatch, error):
+    pool = send_mail.SMTPConnectionPool(size=1)
+
+    def fail(self, *args):
+        raise error
+
+    monkeypatch.setattr(send_mail.smtplib.SMTP, "sendmail", fail)
+    with pytest.raises(send_mail.MailPermanentError):
+        send_mail.send_emails(_messages(1), pool)
+    pool.close_all()
+
+
+def test_send_emails_rejects_empty_recipients_as_permanent():
+    message = send_mail.MailMessage(to=[], subject="x", sender_name="麻雀")
+    with pytest.raises(send_mail.MailPermanentError):
+        send_mail.send_emails([message])
+
+
+def test_send_emails_keeps_temporary_refusal_retryable(smtp_server, monkeypatch):
+    pool = send_mail.SMTPConnectionPool(size=1)
+
+    def fail(self, *args):
+        raise SMTPRecipientsRefused({"user@example.com": (450, b"Mailbox busy")})
+
+    monkeypatch.setattr(send_mail.smtplib.SMTP, "sendmail", fail)
+    with pytest.raises(send_mail.MailSendError) as exc_info:
+        send_mail.send_emails(_messages(1), pool)
+    assert not isinstance(exc_info.value, send_mail.MailPermanentError)
+    pool.close_all()
+
+
+def test_group_creation_email_task_does_not_retry_permanent_failure(monkeypatch):
+    def fail(messages):
+        raise send_mail.MailPermanentError("550 No such user")
+
+    def retry(*args, **kwargs):
+        raise AssertionError("permanent failures must not be retried")
+
+    monkeypatch.setattr(email_tasks, "send_emails", fail)
+    monkeypatch.setattr(email_tasks, "render_mail_template", lambda *a, **k: ("", ""))
+    monkeypatch.setattr(email_tasks.send_group_creation_email_task, "retry", retry)
+
+    with pytest.raises(send_mail.MailPermanentError):
+        email_tasks.send_group_creation_email_task.apply(
+            args=("user@example.com", "http://x", "g", "2026-01-01 00:00"),
+            throw=True,
+        )
@@ -0,0 +1,167 @@
+from app.models import AccessLevel, Group, ShareLink, Table, Tournament
+from app.utils.share_link_utils import (
+    ResolvedShareLink,
+    ShareLinkCache,
+    delete_share_links,
+    get_share_link_by_key,
+    share_link_cache,
+)
+
+
+def _resolved(key, resource_id=1):
+    return ResolvedShareLink(
+        short_key=key,
+        resource_type="group",
+        resource_id=resource_id,
+        access_level=AccessLevel.VIEW,
+    )
+
+
+def _add_link(db_session, key, resource_type, resource_id, level=AccessLevel.EDIT):
+    db_session.add(
+        ShareLink(
+            short_key=key,
+            resource_type=resource_type,
+            resource_id=resource_id,
+            access_level=level,
+            created_by="test",
+        )
+    )
+    db_session.commit()
+
+
+# ------------------------------------------------------
+# LRU / TTL の単体動作
+# ------------------------------------------------------
+def test_cache_evicts_least_recently_used():
+    cache = ShareLinkCache(maxsize=2, ttl=60)
+    cache.set(_resolved("a"))
+    cache.set(_resolved("b"))
+    assert cache.get("a") is not None  # a を最近利用にする
+    cache.set(_resolved("c"))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_cache_expires_entries_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("app.utils.share_link_utils.time.monotonic", lambda: now[0])
+    cache = ShareLinkCache(maxsize=10, ttl=5)
+    cache.set(_resolved("a"))
+    assert cache.get("a") is not None
+
+    now[0] += 6
+    assert cache.get("a") is None
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["size"] == 0
+
+
+def test_cache_disabled_when_maxsize_zero():
+    cache = ShareLinkCache(maxsize=0, ttl=60)
+    cache.set(_resolved("a"))
+    assert cache.get("a") is None
+
+
+# ------------------------------------------------------
+# get_share_link_by_key 経由のヒット/ミス
+# ------------------------------------------------------
+def test_repeated_lookup_hits_cache(db_session, sample_group):
+    _add_link(db_session, "cache-view", "group", sample_group.id, AccessLevel.VIEW)
+    first = get_share_link_by_key("cache-view")
+    second = get_share_link_by_key("cache-view")
+
+    assert first == second
+    assert first.resource_type == "group"
+    assert first.resource_id == sample_group.id
+    assert first.access_level == AccessLevel.VIEW
+    stats = share_link_cache.stats()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 1
+
+
+def test_edit_granting_links_are_rechecked_in_db(
+    db_session, sample_group, sample_sharelink
+):
+    """EDIT 以上のリンクはキャッシュせず、別プロセスでの削除も即座に反映する"""
+    key = sample_sharelink.short_key
+    assert get_share_link_by_key(key).access_level == AccessLevel.OWNER
+    assert share_link_cache.stats()["size"] == 0
+
+    # キャッシュ破棄を通さない削除（別プロセスでの削除を想定）
+    db_session.execute(ShareLink.__table__.delete().where(ShareLink.short_key == key))
+    db_session.commit()
+    assert get_share_link_by_key(key) is None
+
+
+def test_unknown_key_is_not_cached(db_session):
+    assert get_share_link_by_key("missing") is None
+    assert get_share_link_by_key("missing") is None
+    assert share_link_cache.stats()["size"] == 0
+
+
+# ------------------------------------------------------
+# 削除経路でのキャッシュ破棄
+# ------------------------------------------------------
+def test_cascade_delete_table_invalidates_cache(client, db_session):
+    group = Group(name="g", created_by="test")
+    db_session.add(group)
+    db_session.flush()
+    tournament = Tournament(group_id=group.id, name="t", created_by="test")
+    db_session.add(tournament)
+    db_session.flush()
+    table = Table(tournament_id=tournament.id, name="卓", created_by="test")
+    db_session.add(table)
+    db_session.flush()
+    _add_link(db_session, "cache-table", "table", table.id)
+    _add_link(db_session, "cache-table-view", "table", table.id, AccessLevel.VIEW)
+
+    assert client.get("/api/v2/tables/cache-table-view/dashboard").status_code == 200
+    assert share_link_cache.get("cache-table-view") is not None
+
+    assert client.delete("/api/v2/tables/cache-table").status_code == 200
+    assert share_link_cache.get("cache-table-view") is None
+    assert client.get("/api/v2/tables/cache-table-view/dashboard").status_code == 404
+
+
+def test_delete_share_links_invalidates_cache_after_commit(db_session):
+    _add_link(db_session, "cache-commit", "group", 1, AccessLevel.VIEW)
+    _add_link(db_session, "cache-rollback", "group", 2, AccessLevel.VIEW)
+    assert get_share_link_by_key("cache-commit") is not None
+    assert get_share_link_by_key("cache-rollback") is not None
+
+    # rollback された削除ではキャッシュを破棄しない
+    delete_share_links("group", [2])
+    db_session.rollback()
+    assert share_link_cache.get("cache-rollback") is not None
+
+    # commit までは破棄せず、commit 後に破棄する
+    delete_share_links("group", [1])
+    assert share_link_cache.get("cache-commit") is not None
+    db_session.commit()
+    assert share_link_cache.get("cache-commit") is None
+    assert share_link_cache.get("cache-rollback") is not None
+
+
+def test_admin_group_delete_invalidates_cache(client, db_session):
+    group = Group(name="g", created_by="test")
+    db_session.add(group)
+    db_session.flush()
+    _add_link(db_session, "cache-owner", "group", group.id, AccessLevel.OWNER)
+    assert get_share_link_by_key("cache-owner") is not None
+
+    res = client.post(
+        "/api/admin/login", json={"username": "admin", "password": "testpassword"}
+    )
+    assert res.status_code == 200
+    assert client.delete("/api/admin/groups/cache-owner").status_code == 200
+
+    assert share_link_cache.get("cache-owner") is None
+    assert get_share_link_by_key("cache-owner") is None
+
+    stats = client.get("/api/admin/cache/share-links").get_json()
+    assert {"hits", "misses", "evictions", "size", "maxsize", "ttl"} <= set(stats)
@@ -0,0 +1,115 @@
+import pytest
+
+from app.models import AccessLevel, Group, ShareLink, Table, Tournament
+from app.service_errors import ServiceNotFoundError, ServicePermissionError
+from app.utils.share_link_utils import (
+    create_share_links,
+    require_resource,
+    share_link_cache,
+)
+from tests.utils.query_counter import count_queries
+
+
+@pytest.fixture
+def linked_group(db_session):
+    group = Group(name="g", created_by="test")
+    db_session.add(group)
+    db_session.flush()
+    for level in (AccessLevel.EDIT, AccessLevel.VIEW):
+        db_session.add(
+            ShareLink(
+                short_key=f"resolver-{level.value.lower()}",
+                resource_type="group",
+                resource_id=group.id,
+                access_level=level,
+                created_by="test",
+            )
+        )
+    db_session.commit()
+    group_id = group.id
+    db_session.expunge_all()
+    return group_id
+
+
+def test_link_and_resource_are_loaded_in_one_statement(db_session, linked_group):
+    with count_queries() as statements:
+        link, group = require_resource(
+            "resolver-edit", "group", Group, AccessLevel.EDIT
+        )
+
+    assert len(statements) == 1
+    assert link.access_level == AccessLevel.EDIT
+    assert group.id == linked_group
+    assert {link.short_key for link in group.group_links} == {
+        "resolver-edit",
+        "resolver-view",
+    }
+
+
+def test_cached_link_only_loads_resource(db_session, linked_group):
+    require_resource("resolver-view", "group", Group)
+    db_session.expunge_all()
+
+    with count_queries() as statements:
+        _, group = require_resource("resolver-view", "group", Group)
+
+    assert len(statements) == 1
+    assert group.id == linked_group
+    assert share_link_cache.stats()["hits"] == 1
+
+
+def test_resolver_errors(db_session, linked_group):
+    with pytest.raises(ServiceNotFoundError):
+        require_resource("missing", "group", Group)
+    with pytest.raises(ServicePermissionError):
+        require_resource("resolver-edit", "tournament", Tournament)
+    with pytest.raises(ServicePermissionError, match="権限"):
+        require_resource(
+            "resolver-view",
+            "group",
+            Group,
+            AccessLevel.EDIT,
+            forbidden_message="グループを更新する権限がありません。",
+        )
+
+
+def test_deleted_resource_is_not_found(db_session, linked_group):
+    db_session.execute(Group.__table__.delete())
+    db_session.commit()
+    with pytest.raises(ServiceNotFoundError, match="グループ"):
+        require_resource("resolver-view", "group", Group)
+
+    db_session.add(
+        ShareLink(
+            short_key="resolver-table",
+            resource_type="table",
+            resource_id=999,
+            access_level=AccessLevel.VIEW,
+            created_by="test",
+        )
+    )
+    db_session.commit()
+    with pytest.raises(ServiceNotFoundError, match="卓"):
+        require_resource("resolver-table", "table", Table)
+
+
+def test_bulk_share_links_regenerate_only_colliding_keys(
+    db_session, linked_group, monkeypatch
+):
+    keys = iter(["resolver-edit", "fresh-1", "fresh-2", "fresh-3"])
+    monkeypatch.setattr(
+        "app.utils.share_link_utils.generate_short_key", lambda length: next(keys)
+    )
+
+    created = create_share_links(
+        [("tournament", 1, "test")], [AccessLevel.EDIT, AccessLevel.VIEW]
+    )
+    db_session.commit()
+
+    assert created == {
+        ("tournament", 1): {
+            AccessLevel.EDIT: "fresh-2",
+            AccessLevel.VIEW: "fresh-1",
+        }
+    }
+    assert ShareLink.query.filter_by(resource_type="tournament").count() == 2
@@ -0,0 +1,57 @@
+import json
+import logging
+
+import pytest
+
+from app.models import AccessLevel
+
+
+@pytest.fixture()
+def profiling(test_app, monkeypatch):
+    monkeypatch.setitem(test_app.config, "SQL_PROFILING_ENABLED", True)
+    monkeypatch.setitem(test_app.config, "SQL_PROFILING_SLOWEST_COUNT", 2)
+
+
+def _profile_records(caplog):
+    return [
+        json.loads(r.getMessage().split(" ", 1)[1])
+        for r in caplog.records
+        if r.getMessage().startswith("[SQLProfile]")
+    ]
+
+
+def test_reports_statements_in_server_timing_and_logs(
+    client, profiling, setup_full_tournament, caplog
+):
+    data = setup_full_tournament(client)
+    caplog.clear()
+
+    with caplog.at_level(logging.INFO):
+        res = client.get(
+            f"/api/v2/tables/{data['table_links'][AccessLevel.VIEW.value]}/dashboard"
+        )
+    assert res.status_code == 200
+
+    timing = res.headers["Server-Timing"]
+    assert timing.startswith("db;dur=")
+    assert "app;dur=" in timing
+
+    (record,) = _profile_records(caplog)
+    assert record["method"] == "GET"
+    assert record["endpoint"] == "tables_v2.table_dashboard_v2"
+    assert record["status"] == 200
+    assert record["statements"] > 0
+    assert f'desc="{record["statements"]} queries"' in timing
+    assert record["db_ms"] <= record["total_ms"]
+    # 遅い順に上位 SQL_PROFILING_SLOWEST_COUNT 件
+    assert len(record["slowest"]) == 2
+    assert record["slowest"][0]["ms"] >= record["slowest"][1]["ms"]
+    assert record["slowest"][0]["statement"].lstrip().upper().startswith("SELECT")
+
+
+def test_disabled_by_default(client, caplog):
+    with caplog.at_level(logging.INFO):
+        res = client.get("/api/groups/xxxxxx/summary")
+    assert res.status_code == 404
+    assert "Server-Timing" not in res.headers
+    assert _profile_records(caplog) == []
@@ -1,6 +1,18 @@
 import pytest
 
-from app.models import AccessLevel, Table, Tournament
+from app.models import (
+    AccessLevel,
+    Game,
+    Group,
+    Player,
+    Score,
+    ShareLink,
+    Table,
+    TableTypeEnum,
+    Tournament,
+    TournamentPlayer,
+)
+from tests.utils.query_counter import count_queries
 
 
 def _create_tournament(client, group_key, name="Main Tournament"):
@@ -188,6 +200,99 @@ class TestTournamentEndpoints:
         assert db_session.get(Table, table_id) is None
         assert db_session.get(Tournament, tournament["id"]) is None
 
+    def test_delete_tournament_in_constant_queries(self, client, db_session):
+        """空のCHIP卓の判定と削除は、対局数に関係なく一定回数のSQLで行う"""
+
+        def _tournament_with_chip_games(key, game_count):
+            group = Group(name=key, created_by="test")
+            db_session.add(group)
+            db_session.flush()
+            players = [Player(group_id=group.id, name=f"P{i}") for i in range(4)]
+            tournament = Tournament(group_id=group.id, name=key, created_by="test")
+            db_session.add_all([*players, tournament])
+            db_session.flush()
+            table = Table(
+                tournament_id=tournament.id,
+                name="chip",
+                type=TableTypeEnum.CHIP,
+                created_by="test",
+            )
+            db_session.add(table)
+            db_session.flush()
+            for index in range(1, game_count + 1):
+                game = Game(table_id=table.id, game_index=index, created_by="test")
+                db_session.add(game)
+                db_session.flush()
+                db_session.add_all(
+                    Score(game_id=game.id, player_id=p.id, score=0) for p in players
+                )
+            db_session.add_all(
+                TournamentPlayer(tournament_id=tournament.id, player_id=p.id)
+                for p in players
+            )
+            db_session.add(
+                ShareLink(
+                    short_key=key,
+                    resource_type="tournament",
+                    resource_id=tournament.id,
+                    access_level=AccessLevel.EDIT,
+                    created_by="test",
+                )
+            )
+            db_session.commit()
+            return tournament.id, table.id
+
+        _tournament_with_chip_games("few-games", 1)
+        tournament_id, table_id = _tournament_with_chip_games("many-games", 12)
+
+        with count_queries() as few:
+            assert client.delete("/api/tournaments/few-games").status_code == 200
+        with count_queries() as many:
+            assert client.delete("/api/tournaments/many-games").status_code == 200
+        assert len(many) == len(few)
+
+        db_session.expire_all()
+        assert db_session.get(Tournament, tournament_id) is None
+        assert db_session.get(Table, table_id) is None
+        assert Game.query.count() == 0
+        assert Score.query.count() == 0
+        assert TournamentPlayer.query.count() == 0
+        assert ShareLink.query.filter_by(resource_type="tournament").count() == 0
+
+    def test_delete_tournament_keeps_scored_chip_table(
+        self,
+        client,
+        db_session,
+        create_group,
+        create_players,
+        create_tournament,
+        register_tournament_participants,
+        register_table_players,
+        create_game,
+    ):
+        """0以外のスコアがあるCHIP卓を含む大会は削除しない"""
+        _, group_links = create_group()
+        players = create_players(group_links[AccessLevel.EDIT.value])
+        tournament, t_links = create_tournament(group_links[AccessLevel.EDIT.value])
+        register_tournament_participants(t_links[AccessLevel.EDIT.value], players)
+        table_response = client.post(
+            f"/api/tournaments/{t_links[AccessLevel.EDIT.value]}/tables",
+            json={"name": "chip", "type": "CHIP"},
+        )
+        table = table_response.get_json()
+        table_edit_key = next(
+            link["short_key"]
+            for link in table["table_links"]
+            if link["access_level"] == AccessLevel.EDIT.value
+        )
+        register_table_players(table_edit_key, players)
+        create_game(table_edit_key, players)
+
+        res = client.delete(f"/api/tournaments/{t_links[AccessLevel.EDIT.value]}")
+        assert res.status_code == 400
+        assert db_session.get(Tournament, tournament["id"]) is not None
+        assert db_session.get(Table, table["id"]) is not None
+
     def test_get_tournaments_by_group(self, client, db_session, create_group):
         """GET: /api/groups/<group_key>/tournaments - グループ内大会一覧取得"""
         _group_data, links = create_group()
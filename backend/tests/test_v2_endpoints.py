@@ -3,11 +3,13 @@ from datetime import datetime, timedelta, timezone
 import pytest
 
 from app.api.schemas import v2_schema
+from app.api.services.v2_service import purge_idempotency_records
 from app.models import (
     AccessLevel,
     Game,
     Group,
     GroupCreationToken,
+    IdempotencyRecord,
     Player,
     Score,
     ShareLink,
@@ -17,6 +19,8 @@ from app.models import (
     Tournament,
     TournamentPlayer,
 )
+from tests.utils.decimal_sum import DecimalSumFunc
+from tests.utils.query_counter import count_queries
 
 
 def add_links(db_session, resource_type, resource_id, prefix):
@@ -94,6 +98,64 @@ def test_create_tournament_with_initial_tables_is_atomic_and_idempotent(
     assert conflict.get_json()["code"] == "IDEMPOTENCY_KEY_REUSED"
 
 
+def test_large_idempotent_responses_are_stored_compressed(
+    client, db_session, test_app, v2_group, monkeypatch
+):
+    _, links = v2_group
+    monkeypatch.setitem(test_app.config, "IDEMPOTENCY_COMPRESS_THRESHOLD", 64)
+    payload = {
+        "name": "大会",
+        "initial_tables": [{"client_id": f"t{i}", "name": f"{i}卓"} for i in range(5)],
+    }
+    headers = {"Idempotency-Key": "compressed-1"}
+    first = create_tournament(client, links["EDIT"], payload, headers)
+    second = create_tournament(client, links["EDIT"], payload, headers)
+
+    assert first.status_code == second.status_code == 201
+    assert first.get_json() == second.get_json()
+    record = IdempotencyRecord.query.one()
+    assert record.response_body is None
+    assert record.response_body_compressed is not None
+
+
+def test_expired_idempotency_record_is_not_replayed(client, db_session, v2_group):
+    _, links = v2_group
+    headers = {"Idempotency-Key": "expired-1"}
+    assert create_tournament(client, links["EDIT"], None, headers).status_code == 201
+    IdempotencyRecord.query.update(
+        {IdempotencyRecord.created_at: datetime.now(timezone.utc) - timedelta(days=30)}
+    )
+    db_session.commit()
+
+    res = create_tournament(client, links["EDIT"], {"name": "別大会"}, headers)
+
+    assert res.status_code == 201
+    assert res.get_json()["tournament"]["name"] == "別大会"
+    assert Tournament.query.count() == 2
+
+
+def test_purge_idempotency_records_deletes_expired_rows_in_chunks(db_session):
+    old = datetime.now(timezone.utc) - timedelta(days=30)
+    for i in range(5):
+        db_session.add(
+            IdempotencyRecord(
+                scope="purge",
+                idempotency_key=f"key-{i}",
+                request_hash="x",
+                status_code=201,
+                response_body={},
+                created_at=old if i < 3 else datetime.now(timezone.utc),
+            )
+        )
+    db_session.commit()
+
+    assert purge_idempotency_records(batch_size=2) == 3
+    assert sorted(r.idempotency_key for r in IdempotencyRecord.query) == [
+        "key-3",
+        "key-4",
+    ]
+
+
 def test_create_tournament_rolls_back_everything_on_invalid_table(
     client, db_session, v2_group
 ):
@@ -271,6 +333,113 @@ def test_cascade_delete_table_reports_and_removes_children(
     assert Game.query.count() == Score.query.count() == TablePlayer.query.count() == 0
 
 
+def _seat_players(db_session, table, players):
+    db_session.add_all(TablePlayer(table_id=table.id, player_id=p.id) for p in players)
+    db_session.commit()
+
+
+def _game_items(players, count, start=0):
+    return [
+        {
+            "client_id": f"g{start + i}",
+            "memo": f"第{start + i + 1}回戦",
+            "scores": [
+                {"player_id": players[0].id, "score": 300},
+                {"player_id": players[1].id, "score": -100},
+                {"player_id": players[2].id, "score": -200},
+            ],
+        }
+        for i in range(count)
+    ]
+
+
+def test_batch_create_games_is_atomic_and_idempotent(client, db_session, v2_tournament):
+    normal, normal_links, players = (
+        v2_tournament[6],
+        v2_tournament[7],
+        v2_tournament[-1],
+    )
+    _seat_players(db_session, normal, players)
+    url = f"/api/v2/tables/{normal_links['EDIT']}/games:batch-create"
+    headers = {"Idempotency-Key": "evening-1"}
+    payload = {"games": _game_items(players, 3)}
+
+    first = client.post(url, json=payload, headers=headers)
+    replay = client.post(url, json=payload, headers=headers)
+    assert first.status_code == replay.status_code == 201
+    assert first.get_json() == replay.get_json()
+    created = first.get_json()["created_games"]
+    assert [item["client_id"] for item in created] == ["g0", "g1", "g2"]
+    assert [item["game"]["game_index"] for item in created] == [1, 2, 3]
+    assert Game.query.filter_by(table_id=normal.id).count() == 3
+    ranks = {
+        s.player_id: s.rank
+        for s in Score.query.filter_by(game_id=created[0]["game"]["id"]).all()
+    }
+    assert ranks == {players[0].id: 1, players[1].id: 2, players[2].id: 3}
+
+    # 続けて作成すると game_index は連番で続く
+    more = client.post(url, json={"games": _game_items(players, 2, start=3)})
+    assert [
+        item["game"]["game_index"] for item in more.get_json()["created_games"]
+    ] == [
+        4,
+        5,
+    ]
+
+    reused = client.post(url, json={"games": _game_items(players, 1)}, headers=headers)
+    assert reused.status_code == 409
+
+
+def test_batch_create_games_rejects_whole_batch(client, db_session, v2_tournament):
+    normal, normal_links, players = (
+        v2_tournament[6],
+        v2_tournament[7],
+        v2_tournament[-1],
+    )
+    _seat_players(db_session, normal, players[:2])
+    items = _game_items(players, 3)
+    items[0]["scores"] = items[0]["scores"][:2]
+    items[0]["scores"][1]["score"] = -300
+    items[2]["scores"][0]["score"] = 301
+
+    response = client.post(
+        f"/api/v2/tables/{normal_links['EDIT']}/games:batch-create",
+        json={"games": items},
+    )
+    assert response.status_code == 400
+    body = response.get_json()
+    assert body["code"] == "INVALID_GAMES"
+    assert [item["client_id"] for item in body["details"]["games"]] == ["g1", "g2"]
+    assert Game.query.count() == Score.query.count() == 0
+
+    view = client.post(
+        f"/api/v2/tables/{normal_links['VIEW']}/games:batch-create",
+        json={"games": items[:1]},
+    )
+    assert view.status_code == 403
+
+
+def test_batch_create_games_query_count_is_constant(client, db_session, v2_tournament):
+    normal, normal_links, players = (
+        v2_tournament[6],
+        v2_tournament[7],
+        v2_tournament[-1],
+    )
+    _seat_players(db_session, normal, players)
+    url = f"/api/v2/tables/{normal_links['EDIT']}/games:batch-create"
+    client.post(url, json={"games": _game_items(players, 1, start=100)})
+
+    with count_queries() as few:
+        assert (
+            client.post(url, json={"games": _game_items(players, 2)}).status_code == 201
+        )
+    with count_queries() as many:
+        response = client.post(url, json={"games": _game_items(players, 40, start=2)})
+    assert response.status_code == 201
+    assert len(many) == len(few)
+
+
 def test_batch_get_groups_is_partial_and_does_not_echo_keys(client, v2_group):
     _, links = v2_group
     response = client.post(
@@ -396,6 +565,75 @@ def test_dashboards_return_available_players_and_games(
     assert datetime.fromisoformat(table_body["games"][0]["played_at"])
 
 
+def test_score_map_totals_are_integers_when_sum_returns_decimal(
+    client, db_session, monkeypatch, v2_tournament
+):
+    """MySQL の SUM() は Decimal を返すが、合計と換算値は数値として返す"""
+    tournament, tournament_links = v2_tournament[2], v2_tournament[3]
+    normal, players = v2_tournament[6], v2_tournament[-1]
+    db_session.add(
+        TournamentPlayer(tournament_id=tournament.id, player_id=players[0].id)
+    )
+    game = Game(table_id=normal.id, game_index=1, created_by="test")
+    db_session.add(game)
+    db_session.flush()
+    db_session.add(Score(game_id=game.id, player_id=players[0].id, score=30))
+    db_session.commit()
+    monkeypatch.setattr("app.api.services.v2_service.func", DecimalSumFunc())
+
+    res = client.get(f"/api/v2/tournaments/{tournament_links['VIEW']}/dashboard")
+
+    assert res.status_code == 200
+    player = res.get_json()["score_map"]["players"][0]
+    assert player["scores"] == {str(normal.id): 30}
+    assert player["total"] == 30
+    assert player["converted_total"] == 1500
+
+
+def test_dashboards_support_conditional_get(client, db_session, v2_tournament):
+    group_links, tournament_links, normal, normal_links, players = (
+        v2_tournament[1],
+        v2_tournament[3],
+        v2_tournament[6],
+        v2_tournament[7],
+        v2_tournament[-1],
+    )
+    urls = [
+        f"/api/v2/groups/{group_links['VIEW']}/dashboard",
+        f"/api/v2/tournaments/{tournament_links['VIEW']}/dashboard",
+        f"/api/v2/tables/{normal_links['VIEW']}/dashboard",
+    ]
+    etags = {}
+    for url in urls:
+        res = client.get(url)
+        assert res.status_code == 200
+        assert res.headers["ETag"].startswith('W/"')
+        etags[url] = res.headers["ETag"]
+
+        with count_queries() as statements:
+            cached = client.get(url, headers={"If-None-Match": etags[url]})
+        assert cached.status_code == 304
+        assert cached.data == b""
+        assert cached.headers["ETag"] == etags[url]
+        assert len(statements) == 1
+
+    # アクセスレベルが異なるリンクは別の検証子になる
+    edit = client.get(f"/api/v2/tables/{normal_links['EDIT']}/dashboard")
+    assert edit.headers["ETag"] != etags[urls[2]]
+
+    # 配下データ（卓参加者）が変わると全ダッシュボードが再取得される
+    db_session.add(TablePlayer(table_id=normal.id, player_id=players[0].id))
+    db_session.commit()
+    for url in urls:
+        res = client.get(url, headers={"If-None-Match": etags[url]})
+        assert res.status_code == 200
+        assert res.headers["ETag"] != etags[url]
+
+    # 無効なキーは従来どおり 404
+    res = client.get("/api/v2/tables/missing/dashboard", headers={"If-None-Match": "*"})
+    assert res.status_code == 404
+
+
 def test_batch_group_creation_status_enum(client, db_session, v2_group):
     group, links = v2_group
     now = datetime.now(timezone.utc)
@@ -518,6 +756,10 @@ def test_v2_openapi_contract_is_complete(client, test_app):
             "TournamentDashboardResponse",
         ),
         ("/api/v2/tables/{table_key}", "delete"): ("200", "TableDeleteResponse"),
+        ("/api/v2/tables/{table_key}/games:batch-create", "post"): (
+            "201",
+            "GameBatchCreateResponse",
+        ),
         ("/api/v2/tables/{table_key}/dashboard", "get"): (
             "200",
             "TableDashboardResponse",
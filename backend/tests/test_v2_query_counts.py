@@ -0,0 +1,221 @@
+"""V2ダッシュボードのSQL発行回数が対局数に比例しないことを確認するベンチマーク"""
+
+import pytest
+from flask import current_app
+
+from app.api.services.v2_service import _score_map
+from app.models import (
+    AccessLevel,
+    Game,
+    Group,
+    Player,
+    Score,
+    ShareLink,
+    Table,
+    TablePlayer,
+    Tournament,
+    TournamentPlayer,
+)
+from tests.utils.query_counter import count_queries
+
+
+@pytest.fixture
+def scored_tournament(db_session):
+    """卓2つ・参加者4名の大会を作り、対局を追加する関数を返す"""
+    group = Group(name="bench", created_by="test")
+    db_session.add(group)
+    db_session.flush()
+    players = [Player(group_id=group.id, name=f"P{i}") for i in range(4)]
+    tournament = Tournament(group_id=group.id, name="大会", rate=1, created_by="test")
+    db_session.add_all([*players, tournament])
+    db_session.flush()
+    tables = [
+        Table(tournament_id=tournament.id, name=f"{i}卓", created_by="test")
+        for i in range(2)
+    ]
+    db_session.add_all(tables)
+    db_session.flush()
+    for table in tables:
+        for level in (AccessLevel.EDIT, AccessLevel.VIEW):
+            db_session.add(
+                ShareLink(
+                    short_key=f"bench-{table.id}-{level.value.lower()}",
+                    resource_type="table",
+                    resource_id=table.id,
+                    access_level=level,
+                    created_by="test",
+                )
+            )
+    for player in players:
+        db_session.add(
+            TournamentPlayer(tournament_id=tournament.id, player_id=player.id)
+        )
+        for table in tables:
+            db_session.add(TablePlayer(table_id=table.id, player_id=player.id))
+    db_session.commit()
+    tournament_id = tournament.id
+    table_ids = [t.id for t in tables]
+    player_ids = [p.id for p in players]
+
+    def add_games(count):
+        for table_id in table_ids:
+            start = Game.query.filter_by(table_id=table_id).count()
+            for index in range(start, start + count):
+                game = Game(table_id=table_id, game_index=index + 1, created_by="test")
+                db_session.add(game)
+                db_session.flush()
+                for player_id, score in zip(player_ids, (300, 100, -100, -300)):
+                    db_session.add(
+                        Score(game_id=game.id, player_id=player_id, score=score)
+                    )
+        db_session.commit()
+        db_session.expunge_all()
+
+    return tournament_id, table_ids, player_ids, add_games
+
+
+def _count_score_map_queries(db_session, tournament_id):
+    tournament = db_session.get(Tournament, tournament_id)
+    with current_app.test_request_context(), count_queries() as statements:
+        result = _score_map(tournament, AccessLevel.VIEW)
+    return len(statements), result
+
+
+def test_score_map_query_count_is_constant(db_session, scored_tournament):
+    tournament_id, table_ids, player_ids, add_games = scored_tournament
+
+    add_games(1)
+    few, _ = _count_score_map_queries(db_session, tournament_id)
+    add_games(29)
+    many, result = _count_score_map_queries(db_session, tournament_id)
+
+    assert many == few
+    top = next(p for p in result["players"] if p["id"] == player_ids[0])
+    assert top["scores"] == {str(table_id): 300 * 30 for table_id in table_ids}
+    assert top["total"] == 300 * 30 * len(table_ids)
+    assert top["converted_total"] == 300 * 30 * len(table_ids)
+    assert sum(p["total"] for p in result["players"]) == 0
+
+
+def _add_table(db_session, tournament_id, name):
+    table = Table(tournament_id=tournament_id, name=name, created_by="test")
+    db_session.add(table)
+    db_session.flush()
+    for level in (AccessLevel.EDIT, AccessLevel.VIEW):
+        db_session.add(
+            ShareLink(
+                short_key=f"bench-{table.id}-{level.value.lower()}",
+                resource_type="table",
+                resource_id=table.id,
+                access_level=level,
+                created_by="test",
+            )
+        )
+    db_session.commit()
+
+
+def _count_share_link_queries(client):
+    with count_queries() as statements:
+        res = client.get("/api/v2/tournaments/bench-tournament/dashboard")
+    assert res.status_code == 200
+    return (
+        sum("tbl_share_links" in statement for statement in statements),
+        res.get_json(),
+    )
+
+
+def test_tournament_dashboard_share_link_queries_are_constant(
+    client, db_session, scored_tournament
+):
+    tournament_id, table_ids, _, _ = scored_tournament
+    db_session.add(
+        ShareLink(
+            short_key="bench-tournament",
+            resource_type="tournament",
+            resource_id=tournament_id,
+            access_level=AccessLevel.EDIT,
+            created_by="test",
+        )
+    )
+    db_session.commit()
+
+    _count_share_link_queries(client)  # 共有リンクキャッシュを温める
+    few, _ = _count_share_link_queries(client)
+    for i in range(6):
+        _add_table(db_session, tournament_id, f"追加{i}卓")
+    many, body = _count_share_link_queries(client)
+
+    assert many == few
+    assert len(body["tables"]) == len(table_ids) + 6
+    for table in body["tables"]:
+        assert [link["access_level"] for link in table["table_links"]] == [
+            "EDIT",
+            "VIEW",
+        ]
+
+
+def _count_table_requests(client, table_id):
+    counts = {}
+    bodies = {}
+    for url in (
+        f"/api/v2/tables/bench-{table_id}-edit/dashboard",
+        f"/api/tables/bench-{table_id}-edit/games",
+    ):
+        with count_queries() as statements:
+            res = client.get(url)
+        assert res.status_code == 200
+        counts[url] = len(statements)
+        bodies[url] = res.get_json()
+    return counts, bodies
+
+
+def test_table_games_query_count_is_constant(client, db_session, scored_tournament):
+    _, table_ids, player_ids, add_games = scored_tournament
+    table_id = table_ids[0]
+
+    add_games(1)
+    _count_table_requests(client, table_id)  # 共有リンクキャッシュを温める
+    few, _ = _count_table_requests(client, table_id)
+    add_games(29)
+    many, bodies = _count_table_requests(client, table_id)
+
+    assert many == few
+    for games in (
+        bodies[f"/api/v2/tables/bench-{table_id}-edit/dashboard"]["games"],
+        bodies[f"/api/tables/bench-{table_id}-edit/games"],
+    ):
+        assert [game["game_index"] for game in games] == list(range(1, 31))
+        assert [s["player_id"] for s in games[-1]["scores"]] == player_ids
+        assert [s["score"] for s in games[-1]["scores"]] == [300, 100, -100, -300]
+
+
+def test_create_tournament_share_links_are_inserted_at_once(client, db_session):
+    group = Group(name="bench", created_by="test")
+    db_session.add(group)
+    db_session.flush()
+    db_session.add(
+        ShareLink(
+            short_key="bench-group-edit",
+            resource_type="group",
+            resource_id=group.id,
+            access_level=AccessLevel.EDIT,
+            created_by="test",
+        )
+    )
+    db_session.commit()
+
+    payload = {
+        "name": "大会",
+        "initial_tables": [{"client_id": f"t{i}", "name": f"{i}卓"} for i in range(30)],
+    }
+    with count_queries() as statements:
+        res = client.post("/api/v2/groups/bench-group-edit/tournaments", json=payload)
+    assert res.status_code == 201
+
+    share_link_inserts = [s for s in statements if "INSERT INTO tbl_share_links" in s]
+    assert len(share_link_inserts) == 1
+    # 共有リンクの SELECT はグループキーの解決1回のみ（キーごとの存在確認なし）
+    assert len([s for s in statements if "FROM tbl_share_links" in s]) == 1
+    assert ShareLink.query.filter_by(resource_type="table").count() == 30 * 3
+    body = res.get_json()
+    assert all(len(t["table"]["table_links"]) == 2 for t in body["created_tables"])
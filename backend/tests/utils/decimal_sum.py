@@ -0,0 +1,15 @@
+from sqlalchemy import Numeric, func
+
+
+class DecimalSumFunc:
+    """
+    MySQL と同様に SUM() の結果を Decimal で返す sqlalchemy.func の代用。
+    SQLite では再現できない型の違いをテストするため、サービスモジュールの
+    func を monkeypatch で差し替えて使う。
+    """
+
+    def __getattr__(self, name):
+        return getattr(func, name)
+
+    def sum(self, *args, **kwargs):
+        return func.sum(*args, type_=Numeric(asdecimal=True))
@@ -0,0 +1,47 @@
+"""SQL発行回数を数えるテスト用ヘルパー"""
+
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from app import db
+
+
+@contextmanager
+def count_queries():
+    """
+    with ブロック内で発行された SQL 文を収集する。
+
+    使い方:
+        with count_queries() as statements:
+            ...
+        assert len(statements) == 1
+    """
+    statements = []
+
+    def _before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    engine = db.engine
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", _before_cursor_execute)
+
+
+@contextmanager
+def query_budget(max_statements: int, label: str = ""):
+    """
+    with ブロック内の SQL 発行回数が予算を超えたらテストを失敗させる。
+
+    使い方:
+        with query_budget(5, "GET /api/v2/tables/<key>/dashboard"):
+            client.get(...)
+    """
+    with count_queries() as statements:
+        yield statements
+    assert len(statements) <= max_statements, (
+        f"{label or 'query budget'}: {len(statements)} SQL statements "
+        f"(budget {max_statements})\n" + "\n---\n".join(statements)
+    )
@@ -0,0 +1,87 @@
+"""テスト用のローカル SMTP スタブサーバー（smtpd 相当の最小実装）"""
+
+import socketserver
+import threading
+from contextlib import contextmanager
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        server = self.server
+        server.connections += 1
+        self._reply("220 stub ESMTP")
+        mail_from, rcpt = None, []
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode().strip()
+            verb = command.split(" ", 1)[0].upper()
+            server.commands.append(verb)
+            if verb in ("EHLO", "HELO"):
+                self._reply("250 stub")
+            elif verb == "MAIL":
+                mail_from, rcpt = command.split(":", 1)[1].strip(" <>"), []
+                self._reply("250 OK")
+            elif verb == "RCPT":
+                rcpt.append(command.split(":", 1)[1].strip(" <>"))
+                self._reply("250 OK")
+            elif verb == "DATA":
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+                data = []
+                while (chunk := self.rfile.readline()) not in (b".\r\n", b""):
+                    data.append(chunk.decode())
+                server.messages.append((mail_from, rcpt, "".join(data)))
+                self._reply("250 OK")
+                if server.drop_after_messages and not (
+                    len(server.messages) % server.drop_after_messages
+                ):
+                    return
+            elif verb in ("NOOP", "RSET"):
+                self._reply("250 OK")
+            elif verb == "QUIT":
+                self._reply("221 Bye")
+                return
+            else:
+                self._reply("502 Command not implemented")
+
+    def _reply(self, line):
+        self.wfile.write(f"{line}\r\n".encode())
+
+
+class SMTPStubServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _SMTPHandler)
+        self.connections = 0
+        self.commands = []
+        self.messages = []
+        # N 通受信するごとに接続を切る（切断からの再接続の確認用）
+        self.drop_after_messages = 0
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+
+@contextmanager
+def smtp_stub_server():
+    """
+    バックグラウンドスレッドで SMTP スタブを起動する。
+
+    使い方:
+        with smtp_stub_server() as server:
+            monkeypatch.setenv("SMTP_PORT", str(server.port))
+            ...
+        assert len(server.messages) == 1
+    """
+    server = SMTPStubServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
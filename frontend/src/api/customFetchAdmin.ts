@@ -5,22 +5,31 @@ interface CustomFetchAdminConfig {
   url: string;
   method: string;
   data?: any;
-  params?: Record<string, string | number | null>;
+  params?: Record<string, string | number | null | undefined>;
   headers?: Record<string, string>;
   signal?: AbortSignal;
 }
-export const customFetchAdmin = async <T>(
+
+// 管理 API の一覧はレスポンスヘッダー X-Next-Cursor で続きのページを返す
+export interface AdminPage<T> {
+  items: T[];
+  nextCursor: string | null;
+}
+
+const requestAdmin = async (
   config: CustomFetchAdminConfig,
   options?: RequestInit
-): Promise<T> => {
+): Promise<Response> => {
   // ✅ ベースURLを組み込む
   const fullUrl = `${API_BASE_URL}${config.url}`;
 
-  // クエリパラメータ処理
+  // クエリパラメータ処理（未指定の値は送らない）
   let urlWithParams = fullUrl;
   if (config.params) {
     const query = new URLSearchParams(
-      Object.entries(config.params).map(([k, v]) => [k, String(v)])
+      Object.entries(config.params)
+        .filter(([, v]) => v !== undefined)
+        .map(([k, v]) => [k, String(v)])
     );
     urlWithParams += `?${query}`;
   }
@@ -46,6 +55,14 @@ export const customFetchAdmin = async <T>(
       url: urlWithParams,
     };
   }
+  return response;
+};
+
+export const customFetchAdmin = async <T>(
+  config: CustomFetchAdminConfig,
+  options?: RequestInit
+): Promise<T> => {
+  const response = await requestAdmin(config, options);
 
   if (response.status === 204) {
     return null as T;
@@ -57,3 +74,18 @@ export const customFetchAdmin = async <T>(
   }
   return (await response.text()) as T;
 };
+
+/**
+ * カーソルページングの一覧を1ページ取得する
+ * （Orval の生成クライアントはレスポンスヘッダーを返さないため）
+ */
+export const customFetchAdminPage = async <T>(
+  config: CustomFetchAdminConfig,
+  options?: RequestInit
+): Promise<AdminPage<T>> => {
+  const response = await requestAdmin(config, options);
+  return {
+    items: (await response.json()) as T[],
+    nextCursor: response.headers.get('X-Next-Cursor'),
+  };
+};
@@ -4,10 +4,16 @@ import {
   getGetApiAdminMeQueryKey,
   postApiAdminLogin,
   postApiAdminLogout,
-  useGetApiAdminGroups,
   useGetApiAdminMe,
 } from '@/api/generated/adminApi';
-import { useMutation, useQueryClient, type UseQueryOptions } from '@tanstack/react-query';
+import type { AdminGroup, GetApiAdminGroupsParams } from '@/api/generated/adminApi.schemas';
+import { customFetchAdminPage } from '@/api/customFetchAdmin';
+import {
+  useInfiniteQuery,
+  useMutation,
+  useQueryClient,
+  type UseQueryOptions,
+} from '@tanstack/react-query';
 import { data, useNavigate } from 'react-router-dom';
 import { toast } from 'sonner';
 
@@ -52,13 +58,28 @@ export const useAdminLogout = () => {
   });
 };
 
-export const useAdminGetGroups = (opetions?: { enabled: boolean }) => {
-  const {
-    data: groups,
-    isLoading,
-    refetch,
-  } = useGetApiAdminGroups({ query: { enabled: opetions?.enabled } });
-  return { groups, isLoading, refetch };
+// X-Next-Cursor を使って「さらに読み込む」ごとに次のページを取得する
+export const useAdminGetGroups = (
+  params?: Omit<GetApiAdminGroupsParams, 'cursor'>,
+  opetions?: { enabled: boolean }
+) => {
+  const { data, isLoading, refetch, fetchNextPage, hasNextPage, isFetchingNextPage } =
+    useInfiniteQuery({
+      // 削除時の invalidate（getGetApiAdminGroupsQueryKey()）に前方一致させる
+      queryKey: [...getGetApiAdminGroupsQueryKey(params), 'pages'],
+      queryFn: ({ pageParam, signal }) =>
+        customFetchAdminPage<AdminGroup>({
+          url: '/api/admin/groups',
+          method: 'GET',
+          params: { ...params, cursor: pageParam ?? undefined },
+          signal,
+        }),
+      initialPageParam: null as string | null,
+      getNextPageParam: (lastPage) => lastPage.nextCursor,
+      enabled: opetions?.enabled,
+    });
+  const groups = data?.pages.flatMap((page) => page.items);
+  return { groups, isLoading, refetch, fetchNextPage, hasNextPage, isFetchingNextPage };
 };
 
 export const useAdminDeleteGroup = () => {
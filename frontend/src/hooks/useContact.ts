@@ -2,11 +2,12 @@ import {
   deleteApiAdminContactsContactId,
   getGetApiAdminContactsQueryKey,
   patchApiAdminContactsContactId,
-  useGetApiAdminContacts,
 } from '@/api/generated/adminApi';
+import type { ContactListItem, GetApiAdminContactsParams } from '@/api/generated/adminApi.schemas';
+import { customFetchAdminPage } from '@/api/customFetchAdmin';
 import { postApiContacts } from '@/api/generated/mahjongApi';
 import type { ContactCreate, ContactUpdate } from '@/api/generated/mahjongApi.schemas';
-import { useMutation, useQuery, useQueryClient } from '@tanstack/react-query';
+import { useInfiniteQuery, useMutation, useQuery, useQueryClient } from '@tanstack/react-query';
 import { toast } from 'sonner';
 
 export const useCreateContact = () => {
@@ -23,9 +24,24 @@ export const useCreateContact = () => {
   });
 };
 
-export const useGetContactsList = () => {
-  const { data: contactList, isLoading, refetch } = useGetApiAdminContacts();
-  return { contactList, isLoading, refetch };
+// 検索語 q・ステータスで絞り込み、X-Next-Cursor で次のページを取得する
+export const useGetContactsList = (params?: Omit<GetApiAdminContactsParams, 'cursor'>) => {
+  const { data, isLoading, refetch, fetchNextPage, hasNextPage, isFetchingNextPage } =
+    useInfiniteQuery({
+      // 削除時の invalidate（getGetApiAdminContactsQueryKey()）に前方一致させる
+      queryKey: [...getGetApiAdminContactsQueryKey(params), 'pages'],
+      queryFn: ({ pageParam, signal }) =>
+        customFetchAdminPage<ContactListItem>({
+          url: '/api/admin/contacts',
+          method: 'GET',
+          params: { ...params, cursor: pageParam ?? undefined },
+          signal,
+        }),
+      initialPageParam: null as string | null,
+      getNextPageParam: (lastPage) => lastPage.nextCursor,
+    });
+  const contactList = data?.pages.flatMap((page) => page.items);
+  return { contactList, isLoading, refetch, fetchNextPage, hasNextPage, isFetchingNextPage };
 };
 
 export const useUpdateContact = () => {
@@ -1,5 +1,6 @@
-import type { Contact } from '@/api/generated/adminApi.schemas';
+import type { ContactListItem } from '@/api/generated/adminApi.schemas';
 import { Button } from '@/components/ui/button';
+import { Input } from '@/components/ui/input';
 import {
   Table,
   TableBody,
@@ -9,16 +10,35 @@ import {
   TableRow,
 } from '@/components/ui/table';
 import { useDeleteContact, useGetContactsList } from '@/hooks/useContact';
+import { useState } from 'react';
 
 export function AdminContact() {
-  const { contactList, isLoading, refetch } = useGetContactsList();
+  const [keyword, setKeyword] = useState('');
+  const [query, setQuery] = useState('');
+  const { contactList, isLoading, refetch, fetchNextPage, hasNextPage, isFetchingNextPage } =
+    useGetContactsList(query ? { q: query } : undefined);
   const { mutate: deleteContact, isSuccess } = useDeleteContact();
   const handleDelete = (contactId: number) => () => {
     deleteContact({ id: contactId });
   };
+  const handleSearch = (e: React.FormEvent) => {
+    e.preventDefault();
+    setQuery(keyword.trim());
+  };
   return (
     <div className="mahjong-container max-w-1000! ">
       <h1 className="text-2xl font-bold mt-5">Contact Admin</h1>
+      <form className="flex gap-2 mt-5" onSubmit={handleSearch}>
+        <Input
+          type="search"
+          placeholder="Search subject / message"
+          value={keyword}
+          onChange={(e) => setKeyword(e.target.value)}
+        />
+        <Button type="submit" variant="outline">
+          Search
+        </Button>
+      </form>
       <div>
         <Table>
           <TableHeader>
@@ -33,24 +53,22 @@ export function AdminContact() {
               <TableHead>Updated At</TableHead>
               <TableHead>Created At</TableHead>
               <TableHead>IP Address</TableHead>
-              <TableHead>User Agent</TableHead>
               <TableHead>Delete</TableHead>
             </TableRow>
           </TableHeader>
           <TableBody>
-            {contactList?.map((contact: Contact) => (
+            {contactList?.map((contact: ContactListItem) => (
               <TableRow key={contact.id}>
                 <TableCell className="font-medium">{contact.id}</TableCell>
                 <TableCell>{contact.id}</TableCell>
                 <TableCell>{contact.name}</TableCell>
                 <TableCell>{contact.email}</TableCell>
                 <TableCell>{contact.subject}</TableCell>
-                <TableCell>{contact.message}</TableCell>
+                <TableCell>{contact.message_preview}</TableCell>
                 <TableCell>{contact.status}</TableCell>
                 <TableCell>{contact.updated_at?.split('T')[0]}</TableCell>
                 <TableCell>{contact.created_at?.split('T')[0]}</TableCell>
                 <TableCell>{contact.ip_address}</TableCell>
-                <TableCell>{contact.user_agent}</TableCell>
                 <TableCell>
                   <Button size="sm" className="sm" onClick={handleDelete(contact.id!)}>
                     Delete
@@ -60,6 +78,13 @@ export function AdminContact() {
             ))}
           </TableBody>
         </Table>
+        {hasNextPage && (
+          <div className="flex justify-center my-4">
+            <Button variant="outline" disabled={isFetchingNextPage} onClick={() => fetchNextPage()}>
+              {isFetchingNextPage ? 'Loading...' : 'Load more'}
+            </Button>
+          </div>
+        )}
       </div>
     </div>
   );
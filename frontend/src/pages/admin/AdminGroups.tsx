@@ -146,7 +146,7 @@ function ShareGroupButton({
 }
 
 export function AdminGroups() {
-  const { groups } = useAdminGetGroups();
+  const { groups, fetchNextPage, hasNextPage, isFetchingNextPage } = useAdminGetGroups();
   const { mutate: deleteGroup } = useAdminDeleteGroup();
 
   const handleDelete = (GroupKey: string | undefined) => () => {
@@ -193,6 +193,13 @@ export function AdminGroups() {
           ))}
         </TableBody>
       </Table>
+      {hasNextPage && (
+        <div className="flex justify-center my-4">
+          <Button variant="outline" disabled={isFetchingNextPage} onClick={() => fetchNextPage()}>
+            {isFetchingNextPage ? 'Loading...' : 'Load more'}
+          </Button>
+        </div>
+      )}
     </div>
   );
 }